@@ -0,0 +1,227 @@
+"""
+Eye Tracking Session Recording for PeriQuest
+Stores the per-frame EyeData stream of a session as one .npy file per
+field, written in chunks while the session runs:
+
+    recordings/<session_id>.eyerec/
+        meta.json            # session info, columns, row count
+        timestamp.npy        # (n,) float64
+        gaze_point.npy       # (n, 2) float32, NaN where missing
+        ...
+
+Every file is a standard NumPy array, so a recording loads with
+np.load(path, mmap_mode='r') without reading it into memory.
+
+    python eye_recording.py <recording>     # summarize a recording
+    python eye_recording.py --benchmark     # size vs. pickle / JSON
+"""
+
+import os
+import json
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+from tasks_eye_tracker import EyeData
+
+FORMAT_VERSION = 1
+
+# (field, dtype, columns per row); pairs are NaN when the EyeData field is None
+COLUMNS = [
+    ("timestamp", np.float64, 1),
+    ("gaze_point", np.float32, 2),
+    ("raw_gaze_point", np.float32, 2),
+    ("gaze_vector", np.float32, 2),
+    ("left_eye_center", np.float32, 2),
+    ("right_eye_center", np.float32, 2),
+    ("head_position", np.float32, 2),
+    ("left_pupil_size", np.float32, 1),
+    ("right_pupil_size", np.float32, 1),
+    ("pupil_change", np.float32, 1),
+    ("cognitive_load", np.float32, 1),
+    ("head_yaw", np.float32, 1),
+    ("head_pitch", np.float32, 1),
+    ("head_roll", np.float32, 1),
+    ("blink_count", np.uint32, 1),
+    ("head_movement_count", np.uint32, 1),
+    ("faces_detected", np.uint8, 1),
+    ("is_fixating", np.bool_, 1),
+    ("blink_detected", np.bool_, 1),
+    ("head_turn_detected", np.bool_, 1),
+    ("is_saccade", np.bool_, 1),
+    ("eyes_closed", np.bool_, 1),
+]
+
+# Fixed .npy header size, so the row count can be rewritten in place
+_HEADER_SIZE = 128
+
+def _npy_header(dtype, shape) -> bytes:
+    header = repr({"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                   "fortran_order": False, "shape": tuple(shape)})
+    header = header.encode("latin1")
+    padding = _HEADER_SIZE - 10 - len(header) - 1
+    if padding < 0:
+        raise ValueError("npy header does not fit")
+    return (b"\x93NUMPY\x01\x00" + (_HEADER_SIZE - 10).to_bytes(2, "little")
+            + header + b" " * padding + b"\n")
+
+class EyeDataRecorder:
+    """Appends EyeData to a recording in chunks of `chunk_size` frames
+
+    Frames are copied into preallocated column buffers; every full chunk
+    is appended to the column files and the headers and meta.json are
+    updated, so a crash loses at most one chunk. Call close() at the end
+    of the session to write the last partial chunk.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1800, metadata: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.metadata = dict(metadata or {})
+        self.rows = 0
+        self.closed = False
+        self._buffers = {
+            name: np.empty((chunk_size, width) if width > 1 else chunk_size, dtype=dtype)
+            for name, dtype, width in COLUMNS
+        }
+        self._pending = 0
+
+        os.makedirs(path, exist_ok=True)
+        for name, dtype, width in COLUMNS:
+            with open(self._column_path(name), "wb") as f:
+                f.write(_npy_header(dtype, self._shape(0, width)))
+        self._write_meta()
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.npy")
+
+    @staticmethod
+    def _shape(rows: int, width: int):
+        return (rows, width) if width > 1 else (rows,)
+
+    def append(self, eye_data: EyeData):
+        if self.closed:
+            return
+        i = self._pending
+        for name, _, width in COLUMNS:
+            value = getattr(eye_data, name)
+            if width > 1:
+                self._buffers[name][i] = value if value is not None else (math.nan, math.nan)
+            else:
+                self._buffers[name][i] = value
+        self._pending += 1
+        if self._pending == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Append buffered frames to the column files"""
+        if not self._pending:
+            return
+        rows = self.rows + self._pending
+        for name, dtype, width in COLUMNS:
+            with open(self._column_path(name), "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                f.write(self._buffers[name][:self._pending].tobytes())
+                f.seek(0)
+                f.write(_npy_header(dtype, self._shape(rows, width)))
+        self.rows = rows
+        self._pending = 0
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": {name: {"dtype": np.dtype(dtype).str, "width": width}
+                        for name, dtype, width in COLUMNS},
+            "updated": datetime.now().isoformat(),
+        }
+        meta.update(self.metadata)
+        tmp_path = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, "meta.json"))
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ==================== READING ====================
+def load_recording(path: str, mmap: bool = True) -> Dict[str, np.ndarray]:
+    """Column name -> array (memory-mapped unless mmap=False), plus meta under '_meta'"""
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    columns = {}
+    for name in meta["columns"]:
+        array = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+        # Rows written after the last meta update belong to an unfinished chunk
+        columns[name] = array[:meta["rows"]]
+    columns["_meta"] = meta
+    return columns
+
+def to_eye_data(columns: Dict[str, np.ndarray]) -> List[EyeData]:
+    """Rebuild EyeData objects, e.g. to feed ReportGenerator"""
+    names = [name for name in columns if name != "_meta"]
+    rows = len(columns["timestamp"])
+    records = []
+    for i in range(rows):
+        fields = {}
+        for name in names:
+            value = columns[name][i]
+            if value.ndim:
+                fields[name] = None if np.isnan(value[0]) else (float(value[0]), float(value[1]))
+            else:
+                fields[name] = value.item()
+        records.append(EyeData(**fields))
+    return records
+
+def recording_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+if __name__ == "__main__":
+    import sys
+    import pickle
+    import tempfile
+    from dataclasses import asdict
+
+    if len(sys.argv) > 1 and sys.argv[1] != "--benchmark":
+        columns = load_recording(sys.argv[1])
+        meta = columns["_meta"]
+        t = columns["timestamp"]
+        duration = float(t[-1] - t[0]) if len(t) > 1 else 0.0
+        print(f"{sys.argv[1]}: {meta['rows']} frames over {duration:.1f}s, "
+              f"{recording_size(sys.argv[1]) / 1024:.0f} KiB")
+        print(f"  fixating {columns['is_fixating'].mean() * 100:.0f}%  "
+              f"blinks {int(columns['blink_count'][-1]) if len(t) else 0}  "
+              f"head movements {int(columns['head_movement_count'][-1]) if len(t) else 0}")
+    else:
+        from synthetic_tracker import SyntheticEyeTracker
+
+        tracker = SyntheticEyeTracker(realtime=False)
+        tracker.initialize_camera()
+        frames = [tracker.get_eye_data() for _ in range(30 * 60 * 10)]  # 10 minutes at 30 fps
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.eyerec")
+            with EyeDataRecorder(path) as recorder:
+                for eye_data in frames:
+                    recorder.append(eye_data)
+            size = recording_size(path)
+            restored = to_eye_data(load_recording(path))
+            assert len(restored) == len(frames)
+
+        pickled = len(pickle.dumps(frames))
+        as_json = len(json.dumps([asdict(e) for e in frames]))
+        print(f"{len(frames)} frames: recording {size / 1024:.0f} KiB ({size / len(frames):.0f} B/frame), "
+              f"pickle {pickled / 1024:.0f} KiB ({pickled / size:.1f}x), JSON {as_json / 1024:.0f} KiB "
+              f"({as_json / size:.1f}x)")
@@ -0,0 +1,253 @@
+"""
+Gaze Smoothing Filters for PeriQuest
+Pluggable per-sample filters applied to gaze points after estimation.
+Each filter keeps O(1) state per axis.
+
+Run directly to benchmark the filters on a replayed gaze trace:
+    python gaze_filters.py [trace.csv]
+where trace.csv has timestamp,x,y rows (a synthetic trace is used otherwise).
+"""
+
+import math
+import time
+import random
+from typing import Tuple, Optional, List, Dict
+
+
+class GazeFilter:
+    """Base class for gaze smoothing filters"""
+
+    # Samples further apart than this (seconds) restart the filter,
+    # e.g. after the face was lost for a moment
+    max_gap: float = 0.25
+
+    def __init__(self):
+        self._last_time = None
+
+    def reset(self):
+        self._last_time = None
+
+    def filter(self, point: Tuple[float, float], timestamp: float) -> Tuple[float, float]:
+        """Filter one gaze sample, returns the smoothed point"""
+        if self._last_time is None or timestamp - self._last_time > self.max_gap:
+            self._init(point)
+            self._last_time = timestamp
+            return point
+
+        dt = timestamp - self._last_time
+        if dt <= 0:
+            return self._current()
+        self._last_time = timestamp
+        return self._step(point, dt)
+
+    def _init(self, point: Tuple[float, float]):
+        raise NotImplementedError
+
+    def _step(self, point: Tuple[float, float], dt: float) -> Tuple[float, float]:
+        raise NotImplementedError
+
+    def _current(self) -> Tuple[float, float]:
+        raise NotImplementedError
+
+
+class OneEuroFilter(GazeFilter):
+    """One-Euro filter (Casiez et al., 2012)
+
+    A low-pass filter whose cutoff rises with speed: heavy smoothing while
+    the gaze is still, little lag during saccades.
+    min_cutoff (Hz) sets jitter at rest, beta how fast the cutoff opens up
+    with speed (in normalized screen units per second).
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, d_cutoff: float = 1.0):
+        super().__init__()
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x = [0.0, 0.0]
+        self._dx = [0.0, 0.0]
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def _init(self, point):
+        self._x = [point[0], point[1]]
+        self._dx = [0.0, 0.0]
+
+    def _step(self, point, dt):
+        a_d = self._alpha(self.d_cutoff, dt)
+        for i in (0, 1):
+            dx = (point[i] - self._x[i]) / dt
+            self._dx[i] += a_d * (dx - self._dx[i])
+            cutoff = self.min_cutoff + self.beta * abs(self._dx[i])
+            self._x[i] += self._alpha(cutoff, dt) * (point[i] - self._x[i])
+        return (self._x[0], self._x[1])
+
+    def _current(self):
+        return (self._x[0], self._x[1])
+
+
+class KalmanGazeFilter(GazeFilter):
+    """Constant-velocity Kalman filter, independent per axis
+
+    State per axis is [position, velocity] with a 2x2 covariance, so each
+    update is a handful of scalar operations.
+    process_noise is the acceleration variance (how quickly gaze may change
+    speed), measurement_noise the variance of the raw gaze estimate.
+    """
+
+    def __init__(self, process_noise: float = 50.0, measurement_noise: float = 1e-3):
+        super().__init__()
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self._state = [[0.0, 0.0], [0.0, 0.0]]          # per axis: [p, v]
+        self._cov = [[1.0, 0.0, 1.0], [1.0, 0.0, 1.0]]  # per axis: [P00, P01, P11]
+
+    def _init(self, point):
+        self._state = [[point[0], 0.0], [point[1], 0.0]]
+        self._cov = [[self.measurement_noise, 0.0, 1.0],
+                     [self.measurement_noise, 0.0, 1.0]]
+
+    def _step(self, point, dt):
+        q = self.process_noise
+        q00, q01, q11 = q * dt ** 4 / 4, q * dt ** 3 / 2, q * dt * dt
+        r = self.measurement_noise
+
+        for i in (0, 1):
+            p, v = self._state[i]
+            p00, p01, p11 = self._cov[i]
+
+            # Predict
+            p = p + v * dt
+            p00 = p00 + 2 * dt * p01 + dt * dt * p11 + q00
+            p01 = p01 + dt * p11 + q01
+            p11 = p11 + q11
+
+            # Update with the measured position
+            s = p00 + r
+            k0, k1 = p00 / s, p01 / s
+            innovation = point[i] - p
+            p += k0 * innovation
+            v += k1 * innovation
+            p11 = p11 - k1 * p01
+            p01 = (1 - k0) * p01
+            p00 = (1 - k0) * p00
+
+            self._state[i] = [p, v]
+            self._cov[i] = [p00, p01, p11]
+
+        return (self._state[0][0], self._state[1][0])
+
+    def _current(self):
+        return (self._state[0][0], self._state[1][0])
+
+
+GAZE_FILTERS = {
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanGazeFilter,
+}
+
+
+def create_gaze_filter(name: Optional[str], **params) -> Optional[GazeFilter]:
+    """Create a gaze filter by name ('one_euro', 'kalman'); None/'none' disables filtering"""
+    if not name or name == "none":
+        return None
+    if name not in GAZE_FILTERS:
+        raise ValueError(f"Unknown gaze filter '{name}', expected one of {sorted(GAZE_FILTERS)}")
+    return GAZE_FILTERS[name](**params)
+
+
+# ==================== BENCHMARK ====================
+def load_trace(path: str) -> List[Tuple[float, float, float]]:
+    """Load a timestamp,x,y CSV gaze trace (header row optional)"""
+    trace = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.strip().split(',')
+            if len(parts) < 3:
+                continue
+            try:
+                trace.append((float(parts[0]), float(parts[1]), float(parts[2])))
+            except ValueError:
+                continue  # Header
+    return trace
+
+
+def synthetic_trace(duration: float = 60.0, fps: float = 30.0, noise: float = 0.01,
+                    seed: int = 0) -> List[Tuple[float, float, float]]:
+    """Fixations at random points joined by saccades, plus white measurement noise"""
+    rng = random.Random(seed)
+    trace = []
+    t = 0.0
+    x, y = 0.5, 0.5
+    next_saccade = rng.uniform(0.3, 1.5)
+    while t < duration:
+        if t >= next_saccade:
+            x, y = rng.uniform(0.1, 0.9), rng.uniform(0.1, 0.9)
+            next_saccade = t + rng.uniform(0.3, 1.5)
+        trace.append((t, x + rng.gauss(0, noise), y + rng.gauss(0, noise)))
+        t += 1.0 / fps
+    return trace
+
+
+def _jitter(points: List[Tuple[float, float]]) -> float:
+    """RMS of sample-to-sample movement, ignoring saccade-sized jumps"""
+    steps = [math.dist(a, b) for a, b in zip(points, points[1:])]
+    steps = [d for d in steps if d < 0.05]
+    if not steps:
+        return 0.0
+    return math.sqrt(sum(d * d for d in steps) / len(steps))
+
+
+def _settle_ms(raw: List[Tuple[float, float]], filtered: List[Tuple[float, float]],
+               timestamps: List[float], min_jump: float = 0.1) -> float:
+    """Mean time for the filtered gaze to land within 10% of each saccade-sized raw jump"""
+    delays = []
+    for i in range(1, len(raw)):
+        jump = math.dist(raw[i], raw[i - 1])
+        if jump < min_jump:
+            continue
+        for k in range(i, len(raw)):
+            if math.dist(filtered[k], raw[k]) < 0.1 * jump:
+                delays.append(timestamps[k] - timestamps[i])
+                break
+    return sum(delays) / len(delays) * 1000 if delays else 0.0
+
+
+def benchmark_filters(trace: List[Tuple[float, float, float]],
+                      filters: Optional[Dict[str, GazeFilter]] = None) -> Dict[str, Dict[str, float]]:
+    """Replay a gaze trace through each filter and report jitter, lag and cost"""
+    if filters is None:
+        filters = {"one_euro": OneEuroFilter(), "kalman": KalmanGazeFilter()}
+
+    timestamps = [t for t, _, _ in trace]
+    raw = [(x, y) for _, x, y in trace]
+    raw_jitter = _jitter(raw)
+
+    results = {}
+    for name, gaze_filter in filters.items():
+        gaze_filter.reset()
+        start = time.perf_counter()
+        filtered = [gaze_filter.filter(p, t) for p, t in zip(raw, timestamps)]
+        elapsed = time.perf_counter() - start
+
+        jitter = _jitter(filtered)
+        results[name] = {
+            "jitter": jitter,
+            "jitter_reduction_pct": (1 - jitter / raw_jitter) * 100 if raw_jitter else 0.0,
+            "lag_ms": _settle_ms(raw, filtered, timestamps),
+            "us_per_sample": elapsed / max(1, len(trace)) * 1e6,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    trace = load_trace(sys.argv[1]) if len(sys.argv) > 1 else synthetic_trace()
+    print(f"Replaying {len(trace)} gaze samples")
+    for name, stats in benchmark_filters(trace).items():
+        print(f"  {name:10s} jitter -{stats['jitter_reduction_pct']:5.1f}%  "
+              f"lag {stats['lag_ms']:5.1f}ms  {stats['us_per_sample']:.2f}us/sample")
@@ -3,36 +3,85 @@ PeriQuest - Enhanced Peripheral Vision Therapy Game
 Improved version with advanced eye tracking and comprehensive reporting
 """
 
-import pygame
 import time
+_import_start = time.perf_counter()
+
+import os
+import sys
+import pygame
 import random
 import math
+import json
+import heapq
+import importlib
+import threading
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+# Cost of the game module's own imports, for --startup-profile
+BASE_IMPORT_TIME = time.perf_counter() - _import_start
+
 class GameState(Enum):
     INSTRUCTIONS = "instructions"
+    CALIBRATING = "calibrating"
     PLAYING = "playing"
     RESULTS = "results"
-from collections import deque
-
-try:
-    from tasks_eye_tracker import EnhancedEyeTracker, EyeData
-    EYE_TRACKING_AVAILABLE = True
-    print("✓ Using MediaPipe Tasks API Eye Tracker")
-except ImportError:
-    print("⚠ Eye tracking not available (tasks_eye_tracker.py missing)")
-    EYE_TRACKING_AVAILABLE = False
-
-try:
-    from report_generator import ReportGenerator
-    REPORTING_AVAILABLE = True
-except ImportError:
-    print("⚠ Report generation not available")
-    REPORTING_AVAILABLE = False
+from collections import deque, OrderedDict
+
+# ==================== OPTIONAL MODULES ====================
+class LazyModule:
+    """Optional module imported on first use
+
+    The eye tracking (cv2, mediapipe) and reporting (matplotlib, seaborn)
+    stacks take seconds to import, so they are not loaded with the game
+    module. preload() imports on a background thread, e.g. while the setup
+    screen is up; get() waits for that or imports directly, and returns
+    None if the module is unavailable.
+    """
+    
+    def __init__(self, name: str, unavailable_message: str):
+        self.name = name
+        self.unavailable_message = unavailable_message
+        self.module = None
+        self.loaded = False
+        self.import_time = 0.0
+        self._lock = threading.Lock()
+    
+    def preload(self):
+        threading.Thread(target=self.get, name=f"preload-{self.name}", daemon=True).start()
+    
+    def get(self):
+        with self._lock:
+            if not self.loaded:
+                start = time.perf_counter()
+                try:
+                    self.module = importlib.import_module(self.name)
+                except ImportError as e:
+                    print(f"⚠ {self.unavailable_message} ({e})")
+                self.import_time = time.perf_counter() - start
+                self.loaded = True
+            return self.module
+    
+    @property
+    def available(self) -> bool:
+        return self.get() is not None
+
+EYE_TRACKING = LazyModule("tasks_eye_tracker", "Eye tracking not available")
+GAZE_FILTERS = LazyModule("gaze_filters", "Gaze filters not available")
+TRACKER_SERVICE = LazyModule("tracker_service", "Tracker service client not available")
+SYNTHETIC_TRACKER = LazyModule("synthetic_tracker", "Synthetic eye tracker not available")
+EYE_RECORDING = LazyModule("eye_recording", "Eye data recording not available")
+REPORTING = LazyModule("report_generator", "Report generation not available")
+OPTIONAL_MODULES = [GAZE_FILTERS, EYE_TRACKING, TRACKER_SERVICE, SYNTHETIC_TRACKER,
+                    EYE_RECORDING, REPORTING]
+
+def preload_optional_modules():
+    """Start importing the heavy optional stacks in the background"""
+    for lazy_module in OPTIONAL_MODULES:
+        lazy_module.preload()
 
 # Initialize pygame
 pygame.init()
@@ -46,6 +95,10 @@ class GameConfig:
     SCREEN_HEIGHT: int = 720
     FPS: int = 60
     
+    # Render off-screen (SDL dummy video driver) without presenting frames or
+    # waiting for the frame rate, e.g. for simulation.py
+    HEADLESS: bool = False
+    
     # Session
     SESSION_DURATION: int = 300  # 5 minutes
     
@@ -68,7 +121,15 @@ class GameConfig:
     # Stimulus
     MIN_STIM_SIZE: int = 30
     MAX_STIM_SIZE: int = 120
-    STIMULUS_DURATIONS: Dict[int, int] = None
+    
+    # Levels: JSON file in DEFAULT_LEVELS' format, or None for DEFAULT_LEVELS
+    LEVELS_FILE: Optional[str] = None
+    
+    # "rules": level-up/down thresholds from the level table every 20 s at most;
+    # "staircase": weighted up/down staircase on a continuous difficulty after
+    # every target, converging on STAIRCASE_HIT_RATE detection
+    DIFFICULTY_MODE: str = "rules"
+    STAIRCASE_HIT_RATE: float = 0.75
     
     # Scoring
     PERFECT_RT: int = 500
@@ -79,10 +140,61 @@ class GameConfig:
     SLOW_SCORE: int = 25
     MISS_PENALTY: int = -5
     
+    # Gaze calibration
+    CALIBRATION_POINTS: List[Tuple[float, float]] = None
+    CALIBRATION_SETTLE_MS: int = 600   # Time for the eyes to land on a target
+    CALIBRATION_SAMPLE_MS: int = 1200  # Time spent collecting samples per target
+    
+    # Gaze smoothing: "one_euro", "kalman" or "none"
+    GAZE_FILTER: str = "one_euro"
+    
+    # Landmarker input: "full", "downsample" or "roi" (face crop) for slower CPUs
+    TRACKER_INFERENCE_MODE: str = "full"
+    
+    # The tracker runs on the game thread: keep its per-frame cost within this
+    # budget by lowering inference resolution, then rate (0 disables the governor)
+    TRACKER_TARGET_FPS: float = 30.0
+    TRACKER_BUDGET_MS: float = 12.0
+    
+    # Game loop profiling: per-phase timings of the last FRAME_PROFILE_WINDOW
+    # frames, exported with a frame-time histogram and the worst frames at
+    # session end; F toggles the overlay during play
+    FRAME_PROFILING: bool = True
+    FRAME_PROFILE_WINDOW: int = 600
+    SHOW_FRAME_STATS: bool = False
+    
+    # Time each tracker stage (read, convert, detect, ...) from the start;
+    # T toggles the timing overlay during play either way
+    TRACKER_STAGE_TIMING: bool = False
+    
+    # Read eye data from a running tracker_service.py instead of opening the camera
+    # (e.g. "tcp:127.0.0.1:5577"); None tracks in-process
+    TRACKER_ADDRESS: Optional[str] = None
+    
+    # "camera", "synthetic" for generated eye data (no camera or model needed),
+    # or "none" to play without eye tracking
+    TRACKER_BACKEND: str = "camera"
+    TRACKER_SYNTHETIC_SEED: int = 0
+    
+    # Stimulus onsets: the level's spawn interval plus exponential jitter with
+    # this mean (s), on the session clock. None seeds randomly; the seed used is
+    # saved with the session so its schedule and stimuli can be replayed
+    STIMULUS_SEED: Optional[int] = None
+    STIMULUS_JITTER_S: float = 0.8
+    
+    # Save the raw per-frame eye data of each session (see eye_recording.py)
+    RECORD_EYE_DATA: bool = True
+    RECORDINGS_DIR: str = "recordings"
+    
+    # During play, repaint and present only the regions drawn this frame or the
+    # last one instead of the whole window (False: full redraw every frame)
+    DIRTY_RECTS: bool = True
+    
     def __post_init__(self):
-        self.STIMULUS_DURATIONS = {
-            1: 3000, 2: 2500, 3: 2000, 4: 1500, 5: 1000
-        }
+        # 3x3 grid of normalized screen targets
+        self.CALIBRATION_POINTS = [
+            (x, y) for y in (0.1, 0.5, 0.9) for x in (0.1, 0.5, 0.9)
+        ]
 
 # ==================== ENUMS ====================
 class StimulusType(Enum):
@@ -118,6 +230,8 @@ class Stimulus:
     is_target: bool = True
     reacted: bool = False
     reaction_time: Optional[float] = None
+    # Game time of the display flip that first showed the stimulus
+    onset_time: Optional[float] = None
     
     def is_expired(self, current_time: float) -> bool:
         elapsed = (current_time - self.appear_time) * 1000
@@ -127,6 +241,127 @@ class Stimulus:
         elapsed = (current_time - self.appear_time) * 1000
         return max(0, self.duration_ms - elapsed)
 
+class StreamingQuantile:
+    """P² estimate of one quantile: five markers, O(1) per sample (Jain & Chlamtac, 1985)
+
+    The markers only approximate the quantile once they have spread out, so
+    the first SAMPLES samples are also kept and value() is exact (nearest
+    rank) up to there.
+    """
+
+    SAMPLES = 20
+
+    def __init__(self, q: float):
+        self.q = q
+        self.samples: Optional[List[float]] = []
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x: float):
+        if self.samples is not None:
+            self.samples.append(x)
+            if len(self.samples) > self.SAMPLES:
+                self.samples = None
+        h = self.heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        # Cell holding x, stretching the outer markers when it falls outside
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers toward their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = candidate
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        if self.samples is not None:
+            if not self.samples:
+                return 0.0
+            # Nearest rank on the samples seen so far
+            samples = sorted(self.samples)
+            return samples[round(self.q * (len(samples) - 1))]
+        return self.heights[2]
+
+class RunningStats:
+    """Count, sum, sum of squares, min/max and streaming quantiles of a sample stream"""
+
+    QUANTILES = (0.5, 0.9)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.minimum = 0.0
+        self.maximum = 0.0
+        self.quantiles = {q: StreamingQuantile(q) for q in self.QUANTILES}
+
+    def add(self, x: float):
+        if self.count == 0:
+            self.minimum = self.maximum = x
+        else:
+            self.minimum = min(self.minimum, x)
+            self.maximum = max(self.maximum, x)
+        self.count += 1
+        self.total += x
+        self.total_sq += x * x
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation"""
+        if not self.count:
+            return 0.0
+        mean = self.mean
+        return math.sqrt(max(0.0, self.total_sq / self.count - mean * mean))
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles[q].value()
+
+    def to_dict(self) -> Dict:
+        stats = {"count": self.count, "mean": self.mean, "std": self.std,
+                 "min": self.minimum, "max": self.maximum}
+        for q in self.QUANTILES:
+            stats[f"p{int(q * 100)}"] = self.quantile(q)
+        return stats
+
 @dataclass
 class SessionMetrics:
     """Session performance metrics"""
@@ -145,6 +380,8 @@ class SessionMetrics:
     fixation_breaks: int = 0
     score: int = 0
     eye_tracking_data: List = None
+    stimulus_seed: Optional[int] = None
+    stimulus_onsets: List[float] = None
     
     def __post_init__(self):
         if self.reaction_times is None:
@@ -156,20 +393,28 @@ class SessionMetrics:
             }
         if self.eye_tracking_data is None:
             self.eye_tracking_data = []
+        if self.stimulus_onsets is None:
+            self.stimulus_onsets = []
+        
+        # Running aggregates so HUD and difficulty reads never rescan the lists (ms)
+        self.rt_stats = RunningStats()
+        for rt_ms in self.reaction_times:
+            self.rt_stats.add(rt_ms)
+        self.field_rt_stats = {field: RunningStats() for field in self.field_performance}
     
     def add_reaction(self, stimulus: Stimulus, reaction_time: float):
+        rt_ms = reaction_time * 1000
         self.correct_reactions += 1
         self.total_reaction_time += reaction_time
-        self.reaction_times.append(reaction_time * 1000)  # Convert to ms
+        self.reaction_times.append(rt_ms)
+        self.rt_stats.add(rt_ms)
         
         field_stats = self.field_performance[stimulus.field.value]
         field_stats["correct"] += 1
         field_stats["total"] += 1
-        if field_stats["correct"] > 0:
-            field_stats["avg_rt"] = (
-                (field_stats["avg_rt"] * (field_stats["correct"] - 1)) + 
-                (reaction_time * 1000)
-            ) / field_stats["correct"]
+        field_rt = self.field_rt_stats[stimulus.field.value]
+        field_rt.add(rt_ms)
+        field_stats["avg_rt"] = field_rt.mean
     
     def add_miss(self, stimulus: Stimulus):
         self.missed_stimuli += 1
@@ -177,9 +422,7 @@ class SessionMetrics:
         field_stats["total"] += 1
     
     def calculate_average_rt(self) -> float:
-        if not self.reaction_times:
-            return 0.0
-        return sum(self.reaction_times) / len(self.reaction_times)
+        return self.rt_stats.mean
     
     def calculate_accuracy(self) -> float:
         if self.total_stimuli == 0:
@@ -216,22 +459,97 @@ class SessionMetrics:
             "missed_stimuli": self.missed_stimuli,
             "false_positives": self.false_positives,
             "average_reaction_time_ms": self.calculate_average_rt(),
+            "reaction_time_stats": self.rt_stats.to_dict(),
             "accuracy_percentage": self.calculate_accuracy(),
             "head_movements": self.head_movements,
             "fixation_breaks": self.fixation_breaks,
             "score": self.score,
             "field_performance": self.field_performance,
             "side_bias": self.get_side_bias(),
-            "reaction_times": self.reaction_times
+            "reaction_times": self.reaction_times,
+            "stimulus_seed": self.stimulus_seed,
+            "stimulus_onsets": self.stimulus_onsets
         }
 
+# ==================== LEVELS ====================
+# One entry per level, in order. Stimuli of `types` and `size` (px, inclusive)
+# stay up for `duration_ms`, spawning every `spawn_interval` s plus jitter.
+# A stimulus is a target if its type is in `targets`, or with probability
+# `target_probability`. The rules mode moves up when every `promote` threshold
+# is met and down when `demote` is.
+DEFAULT_LEVELS = [
+    {"description": "Only circles (all targets)",
+     "duration_ms": 3000, "spawn_interval": 2.5,
+     "types": ["circle"], "size": [80, 120], "targets": ["circle"],
+     "promote": {"accuracy": 75, "avg_rt_ms": 1500, "min_stimuli": 5}},
+    {"description": "Circles (targets) + Squares (distractors)",
+     "duration_ms": 2500, "spawn_interval": 2.0,
+     "types": ["circle", "square"], "size": [60, 90], "targets": ["circle"],
+     "level_up_message": "Squares added as distractors",
+     "promote": {"accuracy": 70, "avg_rt_ms": 1200, "min_stimuli": 10},
+     "demote": {"accuracy": 40, "min_stimuli": 8}},
+    {"description": "Multiple shapes, circles & stars are targets",
+     "duration_ms": 2000, "spawn_interval": 1.7,
+     "types": ["circle", "square", "triangle", "star"], "size": [50, 80], "targets": ["circle", "star"],
+     "level_up_message": "More shapes added",
+     "promote": {"accuracy": 65, "avg_rt_ms": 1000, "min_stimuli": 15},
+     "demote": {"accuracy": 40, "min_stimuli": 8}},
+    {"description": "All shapes, 70% targets, 30% distractors",
+     "duration_ms": 1500, "spawn_interval": 1.4,
+     "types": ["circle", "square", "triangle", "star"], "size": [40, 70], "target_probability": 0.7,
+     "level_up_message": "Distractors increased",
+     "promote": {"accuracy": 60, "avg_rt_ms": 800, "min_stimuli": 20},
+     "demote": {"accuracy": 40, "min_stimuli": 8}},
+    {"description": "Expert mode",
+     "duration_ms": 1000, "spawn_interval": 1.0,
+     "types": ["circle", "square", "triangle", "star"], "size": [40, 70], "target_probability": 0.7,
+     "level_up_message": "Expert mode!",
+     "demote": {"accuracy": 40, "min_stimuli": 8}},
+]
+
+class LevelTable:
+    """Level definitions compiled into per-level lookup tuples
+
+    Built once at startup; every per-frame or per-stimulus read is a tuple
+    index. Levels past either end clamp to the first or last.
+    """
+    
+    def __init__(self, levels: List[Dict]):
+        if not levels:
+            raise ValueError("Level table is empty")
+        self.definitions = levels
+        self.max_level = len(levels)
+        self.descriptions = tuple(level.get("description", "") for level in levels)
+        self.level_up_messages = tuple(level.get("level_up_message") for level in levels)
+        self.durations_ms = tuple(int(level["duration_ms"]) for level in levels)
+        self.spawn_intervals = tuple(float(level["spawn_interval"]) for level in levels)
+        self.types = tuple([StimulusType(name) for name in level["types"]] for level in levels)
+        self.size_ranges = tuple((int(level["size"][0]), int(level["size"][1])) for level in levels)
+        # Either a fixed set of target types or a probability per stimulus
+        self.target_types = tuple(frozenset(StimulusType(name) for name in level["targets"])
+                                  if "targets" in level else None for level in levels)
+        self.target_probabilities = tuple(float(level.get("target_probability", 1.0)) for level in levels)
+        # Rules mode thresholds; None where a level has no such rule
+        self.promote = tuple(level.get("promote") for level in levels)
+        self.demote = tuple(level.get("demote") for level in levels)
+    
+    @classmethod
+    def load(cls, path: str) -> "LevelTable":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+    
+    def index(self, level: int) -> int:
+        return min(max(level, 1), self.max_level) - 1
+
 # ==================== ADAPTIVE DIFFICULTY ====================
 class AdaptiveDifficulty:
     """Manages adaptive difficulty and level progression"""
     
-    def __init__(self):
+    def __init__(self, levels: Optional[LevelTable] = None, clock=time.time):
+        self.levels = levels or LevelTable(DEFAULT_LEVELS)
+        self.clock = clock
         self.current_level = 1
-        self.last_level_change = time.time()
+        self.last_level_change = clock()
         self.level_change_cooldown = 20  # Minimum 20 seconds between level changes
         
     def update(self, metrics: SessionMetrics, session_duration: float) -> int:
@@ -239,7 +557,7 @@ class AdaptiveDifficulty:
         if session_duration < 10:  # Don't change level in first 10 seconds
             return self.current_level
         
-        current_time = time.time()
+        current_time = self.clock()
         if current_time - self.last_level_change < self.level_change_cooldown:
             return self.current_level
         
@@ -247,26 +565,19 @@ class AdaptiveDifficulty:
         avg_rt = metrics.calculate_average_rt()
         
         old_level = self.current_level
+        i = self.levels.index(self.current_level)
+        promote, demote = self.levels.promote[i], self.levels.demote[i]
         
         # Level progression rules
-        if self.current_level == 1 and accuracy > 75 and avg_rt < 1500 and metrics.total_stimuli >= 5:
-            self.current_level = 2
-            print("\n🎉 Level Up! Now at Level 2 - Squares added as distractors")
-            
-        elif self.current_level == 2 and accuracy > 70 and avg_rt < 1200 and metrics.total_stimuli >= 10:
-            self.current_level = 3
-            print("\n🎉 Level Up! Now at Level 3 - More shapes added")
-            
-        elif self.current_level == 3 and accuracy > 65 and avg_rt < 1000 and metrics.total_stimuli >= 15:
-            self.current_level = 4
-            print("\n🎉 Level Up! Now at Level 4 - Distractors increased")
-            
-        elif self.current_level == 4 and accuracy > 60 and avg_rt < 800 and metrics.total_stimuli >= 20:
-            self.current_level = 5
-            print("\n🎉 Level Up! Now at Level 5 - Expert mode!")
+        if (promote and self.current_level < self.levels.max_level and accuracy > promote["accuracy"]
+                and avg_rt < promote["avg_rt_ms"] and metrics.total_stimuli >= promote["min_stimuli"]):
+            self.current_level += 1
+            message = self.levels.level_up_messages[i + 1]
+            print(f"\n🎉 Level Up! Now at Level {self.current_level}" + (f" - {message}" if message else ""))
         
         # Level regression if performance is poor
-        elif self.current_level > 1 and accuracy < 40 and metrics.total_stimuli >= 8:
+        elif (demote and self.current_level > 1 and accuracy < demote["accuracy"]
+                and metrics.total_stimuli >= demote["min_stimuli"]):
             self.current_level -= 1
             print(f"\n⚠ Level Down to Level {self.current_level} - Keep practicing!")
         
@@ -275,33 +586,212 @@ class AdaptiveDifficulty:
         
         return self.current_level
     
+    def record_trial(self, hit: bool):
+        """Outcome of one target; the rules only look at session aggregates"""
+    
     def get_spawn_interval(self) -> float:
         """Get stimulus spawn interval based on level"""
-        intervals = {1: 2.5, 2: 2.0, 3: 1.7, 4: 1.4, 5: 1.0}
-        return intervals.get(self.current_level, 2.0)
+        return self.levels.spawn_intervals[self.levels.index(self.current_level)]
+    
+    def get_duration_ms(self) -> int:
+        """Display time of new stimuli"""
+        return self.levels.durations_ms[self.levels.index(self.current_level)]
+
+class StaircaseDifficulty:
+    """Weighted up/down staircase (Kaernbach, 1991) on a continuous difficulty
+
+    `position` runs from 1.0 to the last level: its integer part is the
+    level (stimulus set), and duration and spawn interval are interpolated
+    between that level's and the next one's. A hit moves it up by
+    step * (1 - target) and a miss down by step * target, which settles
+    where the patient detects `target` of the targets. The step halves at
+    each reversal down to `min_step`, and the mean position at reversals
+    (after the first two) is the threshold estimate. All O(1) per trial.
+    """
+    
+    def __init__(self, levels: Optional[LevelTable] = None, target: float = 0.75,
+                 step: float = 1.0, min_step: float = 0.1, start: float = 1.0):
+        self.levels = levels or LevelTable(DEFAULT_LEVELS)
+        self.target = target
+        self.step = step
+        self.min_step = min_step
+        self.position = start
+        self.current_level = int(start)
+        self.trials = 0
+        self.reversals = 0
+        self._direction = 0
+        self._reversal_sum = 0.0
+        self._reversal_count = 0
+    
+    def record_trial(self, hit: bool):
+        direction = 1 if hit else -1
+        if self._direction and direction != self._direction:
+            self.reversals += 1
+            if self.reversals > 2:
+                self._reversal_sum += self.position
+                self._reversal_count += 1
+            self.step = max(self.min_step, self.step / 2)
+        self._direction = direction
+        delta = self.step * (1 - self.target) if hit else -self.step * self.target
+        self.position = min(max(self.position + delta, 1.0), float(self.levels.max_level))
+        self.trials += 1
+    
+    @property
+    def threshold(self) -> Optional[float]:
+        """Estimated position of `target` detection, once there are reversals to average"""
+        return self._reversal_sum / self._reversal_count if self._reversal_count else None
+    
+    def update(self, metrics: SessionMetrics, session_duration: float) -> int:
+        old_level = self.current_level
+        self.current_level = int(self.position)
+        if self.current_level > old_level:
+            message = self.levels.level_up_messages[self.levels.index(self.current_level)]
+            print(f"\n🎉 Level Up! Now at Level {self.current_level}" + (f" - {message}" if message else ""))
+        elif self.current_level < old_level:
+            print(f"\n⚠ Level Down to Level {self.current_level} - Keep practicing!")
+        return self.current_level
+    
+    def _interpolate(self, values: Tuple) -> float:
+        i = self.levels.index(int(self.position))
+        if i + 1 >= self.levels.max_level:
+            return values[i]
+        frac = self.position - int(self.position)
+        return values[i] + (values[i + 1] - values[i]) * frac
+    
+    def get_spawn_interval(self) -> float:
+        return self._interpolate(self.levels.spawn_intervals)
+    
+    def get_duration_ms(self) -> int:
+        return int(self._interpolate(self.levels.durations_ms))
 
 # ==================== STIMULUS MANAGER ====================
+class StimulusScheduler:
+    """Stimulus onset times on a pausable monotonic session clock
+
+    Each gap is the current spawn interval plus an exponential jitter drawn
+    from an RNG seeded with `seed`, so the onsets depend only on the seed and
+    the interval, never on the frame rate. due() returns every onset passed
+    since the last call: a stalled frame delays stimuli instead of dropping them.
+    """
+    
+    def __init__(self, seed: int, mean_jitter: float = 0.8, clock=time.monotonic):
+        self.seed = seed
+        self.mean_jitter = mean_jitter
+        self.clock = clock
+        self.start(2.0)
+    
+    def start(self, interval: float):
+        """Restart the session clock and the schedule at 0"""
+        self.rng = random.Random(self.seed)
+        self.origin = self.clock()
+        self.paused_at: Optional[float] = None
+        self.next_onset = self._gap(interval)
+    
+    def _gap(self, interval: float) -> float:
+        return interval + self.rng.expovariate(1.0 / self.mean_jitter)
+    
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = self.clock()
+    
+    def resume(self):
+        if self.paused_at is not None:
+            self.origin += self.clock() - self.paused_at
+            self.paused_at = None
+    
+    def elapsed(self) -> float:
+        """Session seconds, excluding pauses"""
+        now = self.paused_at if self.paused_at is not None else self.clock()
+        return now - self.origin
+    
+    def due(self, interval: float) -> List[float]:
+        """Onsets (session seconds) reached since the last call"""
+        now = self.elapsed()
+        onsets = []
+        while self.next_onset <= now:
+            onsets.append(self.next_onset)
+            self.next_onset += self._gap(interval)
+        return onsets
+    
+    def schedule(self, duration: float, interval: float) -> List[float]:
+        """Every onset of a session at a fixed interval, as due() would produce them"""
+        rng, self.rng = self.rng, random.Random(self.seed)
+        try:
+            onsets = []
+            onset = self._gap(interval)
+            while onset < duration:
+                onsets.append(onset)
+                onset += self._gap(interval)
+            return onsets
+        finally:
+            self.rng = rng
+
+def _subtract_rects(rects: List[Tuple[int, int, int, int]],
+                    cut: Tuple[int, int, int, int]) -> List[Tuple[int, int, int, int]]:
+    """Inclusive (x0, x1, y0, y1) rects minus `cut`, as at most four pieces per rect"""
+    cx0, cx1, cy0, cy1 = cut
+    pieces = []
+    for x0, x1, y0, y1 in rects:
+        if cx0 > x1 or cx1 < x0 or cy0 > y1 or cy1 < y0:
+            pieces.append((x0, x1, y0, y1))
+            continue
+        if y0 < cy0:
+            pieces.append((x0, x1, y0, cy0 - 1))
+        if cy1 < y1:
+            pieces.append((x0, x1, cy1 + 1, y1))
+        top, bottom = max(y0, cy0), min(y1, cy1)
+        if x0 < cx0:
+            pieces.append((x0, cx0 - 1, top, bottom))
+        if cx1 < x1:
+            pieces.append((cx1 + 1, x1, top, bottom))
+    return pieces
+
 class StimulusManager:
     """Manages stimulus generation and display"""
     
-    def __init__(self, config: GameConfig):
+    # Minimum clearance (px) between the edges of two active stimuli,
+    # and between a stimulus and the UI
+    STIMULUS_GAP = 20
+    UI_GAP = 10
+    
+    def __init__(self, config: GameConfig, levels: Optional[LevelTable] = None, clock=None):
+        """clock: game time source for stimulus appear times and the schedule
+        (default: time.time and time.monotonic respectively)"""
         self.config = config
+        self.levels = levels or LevelTable(DEFAULT_LEVELS)
+        self.clock = clock or time.time
         self.stimuli = []
         self.next_id = 1
-        self.last_spawn_time = 0
-        self.spawn_interval = 2.0
+        # Set by the game from the difficulty every update
+        self.spawn_interval = self.levels.spawn_intervals[0]
+        self.duration_ms = self.levels.durations_ms[0]
+        
+        # Onsets and stimulus parameters come from separate streams of one seed
+        self.seed = config.STIMULUS_SEED if config.STIMULUS_SEED is not None else random.randrange(2 ** 32)
+        self.scheduler = StimulusScheduler(self.seed, config.STIMULUS_JITTER_S, clock=clock or time.monotonic)
+        self.rng = random.Random(f"{self.seed}/stimuli")
         
         # Visual field zones (normalized coordinates)
         self.field_zones = {
             VisualField.LEFT: (0.0, 0.4, 0.3, 0.4),
             VisualField.RIGHT: (0.7, 0.4, 0.3, 0.4),
-            VisualField.TOP: (0.4, 0.15, 0.2, 0.2),
+            VisualField.TOP: (0.4, 0.2, 0.2, 0.2),
             VisualField.BOTTOM: (0.3, 0.8, 0.4, 0.2),
-            VisualField.TOP_LEFT: (0.1, 0.15, 0.2, 0.2),
-            VisualField.TOP_RIGHT: (0.7, 0.15, 0.2, 0.2),
+            VisualField.TOP_LEFT: (0.1, 0.2, 0.2, 0.2),
+            VisualField.TOP_RIGHT: (0.7, 0.2, 0.2, 0.2),
             VisualField.BOTTOM_LEFT: (0.1, 0.7, 0.2, 0.2),
             VisualField.BOTTOM_RIGHT: (0.7, 0.7, 0.2, 0.2),
         }
+        # (field, size, width, height) -> valid center rects, see _placement_regions().
+        # Every field must be reachable at every size a level can draw, or the
+        # field would silently drop out of the test
+        self._placement_index: Dict[tuple, List[Tuple[int, int, int, int]]] = {}
+        for min_size, max_size in set(self.levels.size_ranges):
+            for size in range(min_size, max_size + 1):
+                for field in self.field_zones:
+                    if not self._placement_regions(field, size):
+                        raise ValueError(f"No room for {field.value} stimuli of size {size} "
+                                         f"at {self.config.SCREEN_WIDTH}x{self.config.SCREEN_HEIGHT}")
         
         # Modern color palette for stimuli
         self.stimulus_colors = {
@@ -311,46 +801,88 @@ class StimulusManager:
             StimulusType.STAR: (34, 197, 94),       # Green
         }
     
-    def _is_position_valid(self, x, y, size):
-        """Check if position overlaps with UI elements"""
-        # Define UI exclusion zones (rects: x, y, w, h)
-        # 1. Top HUD
-        hud_height = 120 
-        if y < hud_height + size: 
-            return False
-            
-        # 2. Camera Feed & Eye Status (Bottom Left)
-        # Camera is 320x240, Status is 200x240. 
-        # Positioned at bottom left with some padding.
-        # Let's say bottom area starting from SCREEN_HEIGHT - 260
-        bottom_ui_y = self.config.SCREEN_HEIGHT - 260
-        total_ui_width = 20 + 320 + 20 + 200 + 20 # Padding + Cam + Gap + Status + Padding
-        
-        if y > bottom_ui_y - size and x < total_ui_width + size:
-            return False
-            
-        return True
-
+    def _ui_exclusions(self, size: int) -> List[Tuple[int, int, int, int]]:
+        """Centers where a stimulus of this size would overlap UI elements,
+        as inclusive (x0, x1, y0, y1) pixel rects"""
+        big = max(self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT) * 2
+        reach = size // 2 + self.UI_GAP
+        
+        # 1. Top HUD (ends at y = 120)
+        hud_bottom = 120
+        
+        # 2. Camera preview & eye status strip along the bottom left edge,
+        # below the BOTTOM_LEFT field (see ModernRenderer.draw_camera_feed/draw_eye_status)
+        strip_top = self.config.SCREEN_HEIGHT - 72
+        strip_right = 440
+        
+        return [
+            (-big, big, -big, hud_bottom + reach - 1),
+            (-big, strip_right + reach - 1, strip_top - reach + 1, big),
+        ]
+    
+    def _placement_regions(self, field: VisualField, size: int) -> List[Tuple[int, int, int, int]]:
+        """Valid centers for a stimulus in this field: inside the field's zone and
+        outside the UI (built once per field, size and screen size)"""
+        key = (field, size, self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT)
+        regions = self._placement_index.get(key)
+        if regions is None:
+            zone = self.field_zones[field]
+            half = size // 2
+            regions = [(round(zone[0] * self.config.SCREEN_WIDTH) + half,
+                        round((zone[0] + zone[2]) * self.config.SCREEN_WIDTH) - half,
+                        round(zone[1] * self.config.SCREEN_HEIGHT) + half,
+                        round((zone[1] + zone[3]) * self.config.SCREEN_HEIGHT) - half)]
+            regions = [r for r in regions if r[0] <= r[1] and r[2] <= r[3]]
+            for exclusion in self._ui_exclusions(size):
+                regions = _subtract_rects(regions, exclusion)
+            self._placement_index[key] = regions
+        return regions
+    
+    def _free_regions(self, field: VisualField, size: int) -> List[Tuple[int, int, int, int]]:
+        """Placement regions minus the centers that would overlap an active stimulus"""
+        regions = self._placement_regions(field, size)
+        for other in self.stimuli:
+            reach = (other.size + size) // 2 + self.STIMULUS_GAP
+            regions = _subtract_rects(regions, (other.x - reach + 1, other.x + reach - 1,
+                                                other.y - reach + 1, other.y + reach - 1))
+        return regions
+    
+    def _sample_position(self, regions: List[Tuple[int, int, int, int]]) -> Tuple[int, int]:
+        """Uniform draw over the union of the regions"""
+        areas = [(x1 - x0 + 1) * (y1 - y0 + 1) for x0, x1, y0, y1 in regions]
+        pick = self.rng.random() * sum(areas)
+        for (x0, x1, y0, y1), area in zip(regions, areas):
+            if pick < area:
+                break
+            pick -= area
+        return self.rng.randint(x0, x1), self.rng.randint(y0, y1)
+    
+    def start_schedule(self):
+        """Restart onsets and stimulus parameters from the seed"""
+        self.rng = random.Random(f"{self.seed}/stimuli")
+        self.scheduler.start(self.spawn_interval)
+    
+    def spawn_due(self, level: int) -> List[Tuple[float, Optional[Stimulus]]]:
+        """(onset, stimulus) for each scheduled onset reached; stimulus is None
+        when no free position was found for it"""
+        return [(onset, self.generate_stimulus(level))
+                for onset in self.scheduler.due(self.spawn_interval)]
+    
     def generate_stimulus(self, level: int) -> Optional[Stimulus]:
-        current_time = time.time()
+        current_time = self.clock()
         
-        if current_time - self.last_spawn_time < self.spawn_interval:
-            return None
-        
-        # Select field and parameters
-        field = random.choice(list(self.field_zones.keys()))
+        # Select parameters and field (every field has room, see __init__)
         stim_type, size, is_target = self._get_parameters(level)
-        
-        # Get position - Try multiple times to find valid pos
-        for _ in range(10): 
-            zone = self.field_zones[field]
-            x = int(random.uniform(zone[0] + 0.1, zone[0] + zone[2] - 0.1) * self.config.SCREEN_WIDTH)
-            y = int(random.uniform(zone[1] + 0.1, zone[1] + zone[3] - 0.1) * self.config.SCREEN_HEIGHT)
-            
-            if self._is_position_valid(x, y, size):
-                break
-        else:
-            return None # Could not find valid position
+        fields = list(self.field_zones)
+        field = self.rng.choice(fields)
+        regions = self._free_regions(field, size)
+        if not regions:
+            # Field taken by active stimuli: use any field with space left
+            free = [(f, r) for f, r in ((f, self._free_regions(f, size)) for f in fields) if r]
+            if not free:
+                return None
+            field, regions = self.rng.choice(free)
+        x, y = self._sample_position(regions)
         
         # Create stimulus
         stimulus = Stimulus(
@@ -362,30 +894,33 @@ class StimulusManager:
             size=size,
             color=self.stimulus_colors[stim_type],
             appear_time=current_time,
-            duration_ms=self.config.STIMULUS_DURATIONS.get(level, 2000),
+            duration_ms=self.duration_ms,
             level=level,
             is_target=is_target
         )
         
         self.next_id += 1
-        self.last_spawn_time = current_time
         self.stimuli.append(stimulus)
         
         return stimulus
     
     def _get_parameters(self, level: int):
-        if level == 1:
-            return StimulusType.CIRCLE, random.randint(80, 120), True
-        elif level == 2:
-            stim_type = random.choice([StimulusType.CIRCLE, StimulusType.SQUARE])
-            return stim_type, random.randint(60, 90), stim_type == StimulusType.CIRCLE
-        elif level == 3:
-            stim_type = random.choice(list(StimulusType))
-            return stim_type, random.randint(50, 80), stim_type in [StimulusType.CIRCLE, StimulusType.STAR]
+        i = self.levels.index(level)
+        min_size, max_size = self.levels.size_ranges[i]
+        stim_type = self.rng.choice(self.levels.types[i])
+        target_types = self.levels.target_types[i]
+        if target_types is not None:
+            is_target = stim_type in target_types
         else:
-            stim_type = random.choice(list(StimulusType))
-            is_target = random.random() > 0.3
-            return stim_type, random.randint(40, 70), is_target
+            is_target = self.rng.random() < self.levels.target_probabilities[i]
+        return stim_type, self.rng.randint(min_size, max_size), is_target
+    
+    def stimulus_variants(self, level: int) -> List[Tuple[StimulusType, Tuple[int, int, int], int]]:
+        """Every (type, color, size) a stimulus can have at this level"""
+        i = self.levels.index(level)
+        min_size, max_size = self.levels.size_ranges[i]
+        return [(stim_type, self.stimulus_colors[stim_type], size)
+                for stim_type in self.levels.types[i] for size in range(min_size, max_size + 1)]
     
     def update(self, current_time: float) -> List[Stimulus]:
         expired = []
@@ -404,11 +939,60 @@ class StimulusManager:
         self.stimuli.clear()
 
 # ==================== RENDERER ====================
+class SurfaceCache:
+    """Pre-rendered surfaces keyed by what they depict, with LRU eviction
+
+    get() returns the cached surface for a key or builds it once with the
+    given function, so steady-state frames only blit. `misses` counts
+    surfaces built; it should stop growing once a level is running.
+    """
+    
+    def __init__(self, max_items: int = 512):
+        self.max_items = max_items
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: tuple, build) -> pygame.Surface:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        surface = build()
+        self.misses += 1
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+    
+    def __len__(self):
+        return len(self._surfaces)
+    
+    def clear(self):
+        self._surfaces.clear()
+
 class ModernRenderer:
     """Modern, clean renderer with improved visuals"""
     
-    def __init__(self, config: GameConfig):
+    # Past this share of the window, one full fill/flip beats many overlapping rects
+    MAX_DIRTY_FRACTION = 0.5
+    
+    # Eye status strip next to the camera preview; together they end at x = 440
+    # (StimulusManager._ui_exclusions keeps stimuli clear of them)
+    EYE_STATUS_SIZE = (330, 60)
+    
+    def __init__(self, config: GameConfig, clock=time.perf_counter):
+        """clock: game time source, used to pace frames and stamp each flip"""
         self.config = config
+        if config.HEADLESS and os.environ.get("SDL_VIDEODRIVER") != "dummy":
+            # The display was initialized with the real driver at import
+            pygame.display.quit()
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            pygame.display.init()
         self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
         pygame.display.set_caption("PeriQuest - Enhanced Edition")
         
@@ -418,11 +1002,123 @@ class ModernRenderer:
         self.medium_font = pygame.font.SysFont('Segoe UI', config.MEDIUM_SIZE)
         self.small_font = pygame.font.SysFont('Segoe UI', config.SMALL_SIZE)
         
-        self.clock = pygame.time.Clock()
+        self.clock = clock
+        self.next_frame_time = 0.0
+        self.last_flip_time = 0.0
+        
+        # Camera preview: persistent surface and RGB buffer, filled in place each frame
+        # (kept small: the strip sits below the bottom left visual field)
+        self.camera_size = (80, 60)
+        self.camera_surface = None
+        self.camera_preview = None
+        self.camera_preview_bgr = None
+        self.camera_allocations = 0
+        
+        # Glows, panels and stimulus sprites
+        self.surface_cache = SurfaceCache()
+        # Rendered text, kept apart so changing labels do not evict sprites
+        self.text_cache = SurfaceCache(max_items=256)
+        
+        # Dirty rectangles: regions drawn this frame and the previous one
+        self.dirty_rects: List[pygame.Rect] = []
+        self.previous_rects: List[pygame.Rect] = []
+        self.full_redraw = True
+        self.frame_is_full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.last_present_time = 0.0
+        self.last_wait_time = 0.0
     
     def clear_screen(self):
         self.screen.fill(self.config.BG_COLOR)
     
+    # --- Frame presentation ---
+    def begin_frame(self, untracked: bool = False):
+        """Erase for a new frame
+        untracked: the frame draws outside the draw_* methods (menus, results),
+        so it and the frame after it are cleared and presented in full.
+        """
+        self.frame_is_full = (self.full_redraw or untracked or not self.config.DIRTY_RECTS
+                              or self._covers_most(self.previous_rects))
+        self.full_redraw = untracked
+        if self.frame_is_full:
+            self.clear_screen()
+        else:
+            # Everything drawn last frame lies inside these, the rest is still background
+            for rect in self.previous_rects:
+                self.screen.fill(self.config.BG_COLOR, rect)
+        self.dirty_rects = []
+    
+    def invalidate(self):
+        """Redraw the whole window next frame, e.g. after it was exposed"""
+        self.full_redraw = True
+    
+    def _mark(self, rect: pygame.Rect):
+        self.dirty_rects.append(rect)
+    
+    def _covers_most(self, rects: List[pygame.Rect]) -> bool:
+        area = sum(rect.width * rect.height for rect in rects)
+        return area > self.MAX_DIRTY_FRACTION * self.config.SCREEN_WIDTH * self.config.SCREEN_HEIGHT
+    
+    # --- Cached surfaces ---
+    def render_text(self, font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+        """font.render() through the text cache: a label is rasterized once until it changes"""
+        return self.text_cache.get(("text", font, text, antialias, tuple(color)),
+                                   lambda: font.render(text, antialias, color))
+    
+    def panel(self, width: int, height: int, fill=(30, 41, 59, 200), border_color=None,
+              border_width: int = 2, radius: int = 10) -> pygame.Surface:
+        """Translucent rounded panel, optionally with a border"""
+        def build():
+            s = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(s, fill, s.get_rect(), border_radius=radius)
+            if border_color:
+                pygame.draw.rect(s, border_color, s.get_rect(), border_width, border_radius=radius)
+            return s
+        return self.surface_cache.get(("panel", width, height, fill, border_color, border_width, radius), build)
+    
+    def _fixation_glow(self, color, pulse: int) -> pygame.Surface:
+        """Glow rings around the fixation dot, composited into one surface"""
+        def build():
+            outer = 20 + pulse
+            s = pygame.Surface((outer * 2, outer * 2), pygame.SRCALPHA)
+            for r in range(outer, 10 + pulse, -2):
+                val = int(50 * (1 - (r - 10) / 10))
+                alpha = max(0, min(255, val))
+                ring = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+                # Ensure we only use RGB components (first 3) + new alpha
+                pygame.draw.circle(ring, (*color[:3], alpha), (r, r), r)
+                s.blit(ring, (outer - r, outer - r))
+            return s
+        return self.surface_cache.get(("fixation_glow", color, pulse), build)
+    
+    def _stimulus_sprite(self, stim_type: StimulusType, color, size: int) -> pygame.Surface:
+        """Stimulus shape with its glow, centered in a size*3 square"""
+        def build():
+            extent = size * 3
+            c = extent // 2
+            s = pygame.Surface((extent, extent), pygame.SRCALPHA)
+            pygame.draw.circle(s, (*color, 30), (c, c), size * 1.5)
+            if stim_type == StimulusType.CIRCLE:
+                pygame.draw.circle(s, color, (c, c), size // 2)
+                pygame.draw.circle(s, self.config.TEXT_COLOR, (c, c), size // 2, 2)
+            elif stim_type == StimulusType.SQUARE:
+                rect = pygame.Rect(c - size // 2, c - size // 2, size, size)
+                pygame.draw.rect(s, color, rect)
+                pygame.draw.rect(s, self.config.TEXT_COLOR, rect, 2)
+            return s
+        return self.surface_cache.get(("stimulus", stim_type, color, size), build)
+    
+    def prewarm(self, stimulus_variants):
+        """Build the surfaces a level needs up front, e.g. at level start"""
+        for color in (self.config.CENTER_DOT_COLOR, self.config.ERROR_COLOR):
+            for pulse in range(-5, 6):
+                self._fixation_glow(color, pulse)
+        for stim_type, color, size in stimulus_variants:
+            self._stimulus_sprite(stim_type, color, size)
+        self.panel(self.config.SCREEN_WIDTH - 40, 100, self.config.HUD_BG, radius=15)
+        self.panel(*self.EYE_STATUS_SIZE, border_color=self.config.ACCENT_COLOR)
+    
     def draw_center_fixation(self, is_fixating=True):
         """Draw modern center fixation point
         is_fixating: If True, draws normal/active state. If False, draws warning state.
@@ -432,24 +1128,18 @@ class ModernRenderer:
         # Determine colors based on fixation status
         if is_fixating:
             dot_color = self.config.CENTER_DOT_COLOR # Cyan
-            glow_color = (*self.config.CENTER_DOT_COLOR, 50)
         else:
             dot_color = self.config.ERROR_COLOR # Red
-            glow_color = (*self.config.ERROR_COLOR, 50)
 
         # Outer glow (pulsing if not fixating to grab attention)
         pulse = 0
         if not is_fixating:
             pulse = int(math.sin(time.time() * 10) * 5)
-            
-        for r in range(20 + pulse, 10 + pulse, -2):
-            val = int(50 * (1 - (r - 10) / 10))
-            alpha = max(0, min(255, val))
-            s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-            # Ensure we only use RGB components (first 3) + new alpha
-            color_with_alpha = (*dot_color[:3], alpha)
-            pygame.draw.circle(s, color_with_alpha, (r, r), r)
-            self.screen.blit(s, (cx - r, cy - r))
+        
+        glow = self._fixation_glow(dot_color, pulse)
+        outer = 20 + pulse
+        self._mark(self.screen.blit(glow, (cx - outer, cy - outer)).union(
+            pygame.Rect(cx - 11, cy - 11, 22, 22)))
         
         # Center dot
         pygame.draw.circle(self.screen, dot_color, (cx, cy), 10)
@@ -465,7 +1155,7 @@ class ModernRenderer:
         
         # Draw translucent target cursor
         # 1. Outer Ring
-        pygame.draw.circle(self.screen, (255, 255, 255), (x, y), 30, 2)
+        ring_rect = pygame.draw.circle(self.screen, (255, 255, 255), (x, y), 30, 2)
         
         # 2. Crosshair lines
         pygame.draw.line(self.screen, (255, 255, 255), (x - 10, y), (x - 4, y), 2)
@@ -474,72 +1164,59 @@ class ModernRenderer:
         pygame.draw.line(self.screen, (255, 255, 255), (x, y + 4), (x, y + 10), 2)
         
         # 3. Label
-        label = self.small_font.render("GAZE", True, (255, 255, 255))
-        self.screen.blit(label, (x + 35, y - 10))
+        label = self.render_text(self.small_font, "GAZE", True, (255, 255, 255))
+        self._mark(ring_rect.union(self.screen.blit(label, (x + 35, y - 10))))
     
     def draw_stimulus(self, stimulus: Stimulus):
         """Draw stimulus with modern styling"""
-        # Add glow effect
-        glow_surface = pygame.Surface((stimulus.size * 3, stimulus.size * 3), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (*stimulus.color, 30), 
-                         (stimulus.size * 1.5, stimulus.size * 1.5), stimulus.size * 1.5)
-        self.screen.blit(glow_surface, (stimulus.x - stimulus.size * 1.5, stimulus.y - stimulus.size * 1.5))
-        
-        # Draw shape
-        if stimulus.type == StimulusType.CIRCLE:
-            pygame.draw.circle(self.screen, stimulus.color, (stimulus.x, stimulus.y), stimulus.size // 2)
-            pygame.draw.circle(self.screen, self.config.TEXT_COLOR, (stimulus.x, stimulus.y), stimulus.size // 2, 2)
-        elif stimulus.type == StimulusType.SQUARE:
-            rect = pygame.Rect(stimulus.x - stimulus.size // 2, stimulus.y - stimulus.size // 2, 
-                             stimulus.size, stimulus.size)
-            pygame.draw.rect(self.screen, stimulus.color, rect)
-            pygame.draw.rect(self.screen, self.config.TEXT_COLOR, rect, 2)
+        # Shape and glow are pre-rendered together
+        sprite = self._stimulus_sprite(stimulus.type, stimulus.color, stimulus.size)
+        c = sprite.get_width() // 2
+        self._mark(self.screen.blit(sprite, (stimulus.x - c, stimulus.y - c)))
     
     def draw_hud(self, metrics: SessionMetrics, time_remaining: float, level: int):
         """Draw modern HUD"""
         # Top bar
         hud_rect = pygame.Rect(20, 20, self.config.SCREEN_WIDTH - 40, 100)
-        s = pygame.Surface((hud_rect.width, hud_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(s, self.config.HUD_BG, s.get_rect(), border_radius=15)
-        self.screen.blit(s, hud_rect)
+        self.screen.blit(self.panel(hud_rect.width, hud_rect.height, self.config.HUD_BG, radius=15), hud_rect)
+        self._mark(hud_rect)
         
         # Level
-        level_text = self.large_font.render(f"Level {level}", True, self.config.ACCENT_COLOR)
+        level_text = self.render_text(self.large_font, f"Level {level}", True, self.config.ACCENT_COLOR)
         self.screen.blit(level_text, (40, 35))
         
         # Time
-        time_text = self.medium_font.render(f"Time: {int(time_remaining)}s", True, self.config.TEXT_COLOR)
+        time_text = self.render_text(self.medium_font, f"Time: {int(time_remaining)}s", True, self.config.TEXT_COLOR)
         self.screen.blit(time_text, (40, 75))
         
         # Score
-        score_text = self.large_font.render(f"Score: {metrics.score}", True, self.config.SUCCESS_COLOR)
+        score_text = self.render_text(self.large_font, f"Score: {metrics.score}", True, self.config.SUCCESS_COLOR)
         score_rect = score_text.get_rect(right=self.config.SCREEN_WIDTH - 40, centery=60)
         self.screen.blit(score_text, score_rect)
         
         # Accuracy
         accuracy = metrics.calculate_accuracy()
         acc_color = self.config.SUCCESS_COLOR if accuracy >= 75 else self.config.WARNING_COLOR if accuracy >= 50 else self.config.ERROR_COLOR
-        acc_text = self.medium_font.render(f"Accuracy: {accuracy:.1f}%", True, acc_color)
+        acc_text = self.render_text(self.medium_font, f"Accuracy: {accuracy:.1f}%", True, acc_color)
         acc_rect = acc_text.get_rect(centerx=self.config.SCREEN_WIDTH // 2, y=40)
         self.screen.blit(acc_text, acc_rect)
         
         # Avg RT
         avg_rt = metrics.calculate_average_rt()
-        rt_text = self.small_font.render(f"Avg RT: {avg_rt:.0f}ms", True, self.config.TEXT_COLOR)
+        rt_text = self.render_text(self.small_font, f"Avg RT: {avg_rt:.0f}ms", True, self.config.TEXT_COLOR)
         rt_rect = rt_text.get_rect(centerx=self.config.SCREEN_WIDTH // 2, y=75)
         self.screen.blit(rt_text, rt_rect)
     
     def draw_feedback(self, message: str, color: Tuple[int, int, int]):
         """Draw feedback message"""
-        text = self.title_font.render(message, True, color)
+        text = self.render_text(self.title_font, message, True, color)
         rect = text.get_rect(center=(self.config.SCREEN_WIDTH // 2, self.config.SCREEN_HEIGHT // 2))
         
         # Background
         bg_rect = rect.inflate(60, 40)
-        s = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(s, (0, 0, 0, 200), s.get_rect(), border_radius=20)
-        pygame.draw.rect(s, color, s.get_rect(), 3, border_radius=20)
-        self.screen.blit(s, bg_rect)
+        self.screen.blit(self.panel(bg_rect.width, bg_rect.height, (0, 0, 0, 200), color,
+                                    border_width=3, radius=20), bg_rect)
+        self._mark(bg_rect)
         
         self.screen.blit(text, rect)
     
@@ -547,9 +1224,9 @@ class ModernRenderer:
         """Draw camera feed with eye tracking overlay"""
         import cv2
         
-        # Default position: Bottom Left
+        # Default position: Bottom Left, start of the tracker strip
         if position is None:
-            position = (20, self.config.SCREEN_HEIGHT - 260)
+            position = (20, self.config.SCREEN_HEIGHT - 70)
             
         if not eye_tracker:
             self._draw_cam_placeholder(position, "Tracker Not Init")
@@ -569,8 +1246,12 @@ class ModernRenderer:
              return
         
         try:
-            # Resize frame
-            frame_resized = cv2.resize(frame, (320, 240))
+            if self.camera_surface is None:
+                width, height = self.camera_size
+                self.camera_surface = pygame.Surface(self.camera_size)
+                self.camera_preview = np.empty((height, width, 3), dtype=np.uint8)
+                self.camera_preview_bgr = np.empty((height, width, 3), dtype=np.uint8)
+                self.camera_allocations += 3
             
             # --- Draw Landmarks on display frame (if available) ---
             # We don't have access to landmarks directly on the raw frame passed here 
@@ -579,136 +1260,331 @@ class ModernRenderer:
             # For visualization, we can just show the raw feed or try to re-draw if we had data.
             # Simplest for now: Show the raw feed. Eye Status panel shows the data.
             
-            # Convert to pygame surface
-            frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
+            # Reuse the tracker's RGB conversion when it has one for this frame,
+            # otherwise shrink first so only the small preview is converted
+            frame_rgb = getattr(eye_tracker, 'current_frame_rgb', None)
+            if frame_rgb is not None:
+                cv2.resize(frame_rgb, self.camera_size, dst=self.camera_preview)
+            else:
+                cv2.resize(frame, self.camera_size, dst=self.camera_preview_bgr)
+                cv2.cvtColor(self.camera_preview_bgr, cv2.COLOR_BGR2RGB, dst=self.camera_preview)
+            
+            # Copy pixels into the persistent surface
+            pygame.surfarray.blit_array(self.camera_surface, self.camera_preview.swapaxes(0, 1))
+            frame_surface = self.camera_surface
             
             # Draw border
-            border_rect = pygame.Rect(position[0] - 2, position[1] - 2, 324, 244)
-            pygame.draw.rect(self.screen, self.config.ACCENT_COLOR, border_rect, 2, border_radius=10)
+            width, height = self.camera_size
+            border_rect = pygame.Rect(position[0] - 2, position[1] - 2, width + 4, height + 4)
+            pygame.draw.rect(self.screen, self.config.ACCENT_COLOR, border_rect, 2, border_radius=6)
             
             # Blit to screen
             self.screen.blit(frame_surface, position)
-            
-            # Add label
-            label = self.small_font.render("Camera Feed", True, self.config.TEXT_COLOR)
-            self.screen.blit(label, (position[0], position[1] - 20))
+            self._mark(border_rect)
             
         except Exception as e:
             # print(f"Draw error: {e}")
             self._draw_cam_placeholder(position, "Error")
 
     def _draw_cam_placeholder(self, position, text):
-        placeholder = pygame.Rect(position[0], position[1], 320, 240)
-        s = pygame.Surface((320, 240), pygame.SRCALPHA)
-        pygame.draw.rect(s, (30, 41, 59, 200), s.get_rect(), border_radius=10)
-        pygame.draw.rect(s, self.config.ACCENT_COLOR, s.get_rect(), 2, border_radius=10)
-        self.screen.blit(s, position)
-        
-        msg = self.small_font.render(text, True, self.config.TEXT_COLOR)
-        text_rect = msg.get_rect(center=(position[0] + 160, position[1] + 120))
+        width, height = self.camera_size
+        placeholder = pygame.Rect(position[0], position[1], width, height)
+        self.screen.blit(self.panel(width, height, border_color=self.config.ACCENT_COLOR), position)
+        self._mark(placeholder)
+        
+        msg = self.render_text(self.small_font, text, True, self.config.TEXT_COLOR)
+        text_rect = msg.get_rect(center=placeholder.center)
         self.screen.blit(msg, text_rect)
     
-    def draw_eye_status(self, eye_data, position=None):
-        """Draw eye tracking status panel"""
+    def draw_eye_status(self, eye_data, position=None, stage_timings=None):
+        """Draw eye tracking status strip (plus a timing panel above it when stage_timings is given)"""
         # Default position: Next to Camera (Bottom Left + Offset)
         if position is None:
-            position = (360, self.config.SCREEN_HEIGHT - 260)
+            position = (110, self.config.SCREEN_HEIGHT - 70)
             
-        panel_width, panel_height = 200, 240
+        panel_width, panel_height = self.EYE_STATUS_SIZE
         
         # Background
-        s = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-        pygame.draw.rect(s, (30, 41, 59, 200), s.get_rect(), border_radius=10)
-        pygame.draw.rect(s, self.config.ACCENT_COLOR, s.get_rect(), 2, border_radius=10)
-        self.screen.blit(s, position)
-        
-        # Title
-        title = self.small_font.render("Eye Tracking", True, self.config.TEXT_COLOR)
-        self.screen.blit(title, (position[0] + 10, position[1] + 10))
-        
-        y_offset = position[1] + 40
+        self._mark(self.screen.blit(self.panel(panel_width, panel_height, border_color=self.config.ACCENT_COLOR), position))
         
         if eye_data:
             # Status text
             if getattr(eye_data, 'head_turn_detected', False):
-                status_text = "Status: Head Turn!"
+                status_text = "Head Turn!"
                 color = self.config.WARNING_COLOR
             elif eye_data.is_fixating:
-                status_text = "Status: Fixating"
+                status_text = "Fixating"
                 color = self.config.SUCCESS_COLOR
             else:
-                status_text = "Status: Distracted"
+                status_text = "Distracted"
                 color = self.config.ERROR_COLOR
             
-            # Draw stats
+            # Draw stats, two per row
             labels = [
                 status_text,
                 f"Gaze: ({eye_data.gaze_point[0]:.2f}, {eye_data.gaze_point[1]:.2f})" if eye_data.gaze_point else "Gaze: --",
-                f"Pupil: {eye_data.left_pupil_size:.3f}",
-                f"Head Yaw: {getattr(eye_data, 'head_yaw', 0.0):.2f}"
+                f"Pupil: {eye_data.pupil_change:+.1f}%  Load: {eye_data.cognitive_load:+.1f}",
+                f"Yaw/Pitch: {eye_data.head_yaw:+.0f}° / {eye_data.head_pitch:+.0f}°"
             ]
             
             for i, label in enumerate(labels):
                 color_to_use = color if i == 0 else self.config.TEXT_COLOR
-                text = self.small_font.render(label, True, color_to_use)
-                self.screen.blit(text, (position[0] + 10, y_offset))
-                y_offset += 25
-            
-            # Visual indicator for gaze
-            if eye_data.gaze_point:
-                indicator_size = 100
-                indicator_x = position[0] + panel_width // 2
-                indicator_y = position[1] + 150
-                
-                # Draw indicator background
-                pygame.draw.circle(self.screen, (50, 60, 80), (indicator_x, indicator_y), indicator_size // 2, 1)
-                
-                # Draw gaze point
-                gaze_x = int(indicator_x + (eye_data.gaze_point[0] - 0.5) * indicator_size)
-                gaze_y = int(indicator_y + (eye_data.gaze_point[1] - 0.5) * indicator_size)
-                pygame.draw.circle(self.screen, self.config.SUCCESS_COLOR, (gaze_x, gaze_y), 5)
-                
-                # Draw center crosshair
-                pygame.draw.line(self.screen, (100, 110, 130), 
-                               (indicator_x - 10, indicator_y), (indicator_x + 10, indicator_y), 1)
-                pygame.draw.line(self.screen, (100, 110, 130), 
-                               (indicator_x, indicator_y - 10), (indicator_x, indicator_y + 10), 1)
+                text = self.render_text(self.small_font, label, True, color_to_use)
+                self.screen.blit(text, (position[0] + 10 + (i % 2) * 175, position[1] + 8 + (i // 2) * 24))
         else:
-            no_data_text = self.small_font.render("No eye data", True, self.config.TEXT_COLOR)
-            self.screen.blit(no_data_text, (position[0] + 10, y_offset))
+            no_data_text = self.render_text(self.small_font, "No eye data", True, self.config.TEXT_COLOR)
+            self.screen.blit(no_data_text, (position[0] + 10, position[1] + 8))
+        
+        if stage_timings:
+            timings_height = 50 + 22 * len(stage_timings)
+            self._draw_stage_timings(stage_timings, (position[0], position[1] - timings_height - 10))
     
-    def update_display(self):
-        pygame.display.flip()
-        self.clock.tick(self.config.FPS)
+    def _draw_stage_timings(self, stage_timings, position):
+        """Tracker stage timing panel: p50/p95/p99 in ms per stage"""
+        panel_width, panel_height = 260, 50 + 22 * len(stage_timings)
+        self._mark(self.screen.blit(self.panel(panel_width, panel_height, border_color=self.config.ACCENT_COLOR), position))
+        
+        title = self.render_text(self.small_font, "Tracker ms  p50 / p95 / p99", True, self.config.TEXT_COLOR)
+        self.screen.blit(title, (position[0] + 10, position[1] + 10))
+        
+        y_offset = position[1] + 40
+        for stage, stats in stage_timings.items():
+            label = f"{stage:<11} {stats['p50_ms']:5.1f} {stats['p95_ms']:5.1f} {stats['p99_ms']:5.1f}"
+            color = self.config.WARNING_COLOR if stage == "total" else self.config.TEXT_COLOR
+            text = self.render_text(self.small_font, label, True, color)
+            self.screen.blit(text, (position[0] + 10, y_offset))
+            y_offset += 22
+    
+    def draw_frame_stats(self, stats: Dict, position=None):
+        """Frame profiler panel: achieved FPS, frame time and per-phase p50/p95 in ms"""
+        if position is None:
+            position = (self.config.SCREEN_WIDTH - 300, 140)
+        panel_width, panel_height = 280, 80 + 22 * len(stats["phases"])
+        self._mark(self.screen.blit(self.panel(panel_width, panel_height, border_color=self.config.ACCENT_COLOR), position))
+        
+        fps_color = self.config.SUCCESS_COLOR if stats["fps"] >= 0.9 * self.config.FPS else self.config.WARNING_COLOR
+        title = self.render_text(self.small_font, f"{stats['fps']:.1f} fps   frame ms  p50 / p95", True, fps_color)
+        self.screen.blit(title, (position[0] + 10, position[1] + 10))
+        
+        frame = stats["frame"]
+        y_offset = position[1] + 40
+        rows = [("frame", frame)] + list(stats["phases"].items())
+        for name, phase in rows:
+            label = f"{name:<8} {phase['p50_ms']:6.1f} {phase['p95_ms']:6.1f}"
+            color = self.config.WARNING_COLOR if name == "frame" else self.config.TEXT_COLOR
+            self.screen.blit(self.render_text(self.small_font, label, True, color), (position[0] + 10, y_offset))
+            y_offset += 22
+    
+    def update_display(self, wait=None):
+        """Present the frame: the whole window, or only what changed since the last one
+
+        Then waits out the rest of the frame in wait(timeout), which blocks on
+        input so it is timestamped as it arrives (see InputTimestamper.wait).
+        """
+        if self.config.HEADLESS:
+            # Nothing to present, and the caller owns the (virtual) frame timing
+            self.previous_rects = self.dirty_rects
+            self.dirty_rects = []
+            self.last_flip_time = self.clock()
+            return
+        start = time.perf_counter()
+        if self.frame_is_full or self._covers_most(self.previous_rects + self.dirty_rects):
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(self.previous_rects + self.dirty_rects)
+            self.partial_frames += 1
+        self.last_flip_time = self.clock()
+        self.previous_rects = self.dirty_rects
+        self.dirty_rects = []
+        presented = time.perf_counter()
+        self._wait_for_next_frame(wait)
+        # For the frame profiler: flip/update and frame-rate wait of this frame
+        self.last_present_time = presented - start
+        self.last_wait_time = time.perf_counter() - presented
+    
+    def _wait_for_next_frame(self, wait=None):
+        """Hold the frame rate at config.FPS (like Clock.tick, but waiting on input meanwhile)"""
+        deadline = self.next_frame_time
+        while True:
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                break
+            if wait and remaining >= 0.001:
+                wait(remaining)
+            else:
+                time.sleep(remaining)
+        # A late frame starts a new schedule instead of rushing to catch up
+        self.next_frame_time = max(deadline, self.clock()) + 1.0 / self.config.FPS
+
+# ==================== INPUT ====================
+class InputTimestamper:
+    """Pygame events stamped with the game time they were first seen
+
+    The renderer waits out each frame in wait(), which sleeps on the SDL
+    event queue and wakes as soon as a key press reaches it, so presses are
+    stamped on arrival instead of when handle_events() next runs, up to a
+    frame later. Desktop video drivers block in the OS until input arrives;
+    drivers that cannot (e.g. "dummy") make SDL poll every millisecond,
+    measured there at about 2% of a core at 60 FPS against 2.5% for the
+    1 ms sleep/poll loop this replaces and 0.3% for a plain sleep.
+    """
+    
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._events = deque()
+    
+    def poll(self):
+        events = pygame.event.get()
+        if events:
+            now = self.clock()
+            self._events.extend((now, event) for event in events)
+    
+    def wait(self, timeout: float):
+        """Block until an event arrives or `timeout` seconds (at least 1 ms) pass"""
+        event = pygame.event.wait(max(1, int(timeout * 1000)))
+        if event.type != pygame.NOEVENT:
+            now = self.clock()
+            self._events.append((now, event))
+            self._events.extend((now, queued) for queued in pygame.event.get())
+    
+    def drain(self):
+        """(timestamp, event) for everything received so far, oldest first"""
+        self.poll()
+        while self._events:
+            yield self._events.popleft()
+
+# ==================== PROFILING ====================
+class FrameProfiler:
+    """Per-phase timings of the game loop in a fixed-size ring buffer
+
+    Each frame records its events/update/render/present/wait times (ms) into
+    the last `window` rows of a preallocated array; stats() reports achieved
+    FPS and p50/p95/p99 over them. For the whole session it also keeps a
+    frame-time histogram (1 ms bins) and the `worst` slowest frames, which
+    export_json() writes out to catch jank on slow hardware.
+    """
+    
+    PHASES = ("events", "update", "render", "present", "wait")
+    HISTOGRAM_MAX_MS = 250
+    
+    def __init__(self, window: int = 600, worst: int = 20):
+        self.window = window
+        self.worst_count = worst
+        self._ring = np.zeros((window, len(self.PHASES) + 1), dtype=np.float64)  # phases + frame
+        self._next = 0
+        self.frames = 0
+        self.histogram = np.zeros(self.HISTOGRAM_MAX_MS + 1, dtype=np.int64)  # last bin: overflow
+        self.worst: List[Tuple[float, int, Dict[str, float]]] = []  # min-heap on frame ms
+        self._last_frame_start: Optional[float] = None
+    
+    def add(self, frame_start: float, phases: Tuple[float, ...]):
+        """Record one frame: its perf_counter start and PHASES durations in seconds
+        (the frame time is measured start to start, so it includes anything between)"""
+        frame_s = sum(phases) if self._last_frame_start is None else frame_start - self._last_frame_start
+        self._last_frame_start = frame_start
+        row = self._ring[self._next]
+        row[:-1] = phases
+        row[-1] = frame_s
+        row *= 1000
+        self._next = (self._next + 1) % self.window
+        self.frames += 1
+        
+        frame_ms = row[-1]
+        self.histogram[min(int(frame_ms), self.HISTOGRAM_MAX_MS)] += 1
+        if len(self.worst) < self.worst_count or frame_ms > self.worst[0][0]:
+            entry = (float(frame_ms), self.frames,
+                     {phase: float(ms) for phase, ms in zip(self.PHASES, row[:-1])})
+            if len(self.worst) < self.worst_count:
+                heapq.heappush(self.worst, entry)
+            else:
+                heapq.heapreplace(self.worst, entry)
+    
+    def stats(self) -> Optional[Dict]:
+        """{fps, frame: {...}, phases: {phase: {p50_ms, p95_ms, p99_ms, mean_ms}}} over the window"""
+        count = min(self.frames, self.window)
+        if count == 0:
+            return None
+        samples = self._ring[:count]
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99], axis=0)
+        means = samples.mean(axis=0)
+        columns = {name: {"p50_ms": float(p50[i]), "p95_ms": float(p95[i]), "p99_ms": float(p99[i]),
+                          "mean_ms": float(means[i])}
+                   for i, name in enumerate(self.PHASES + ("frame",))}
+        frame = columns.pop("frame")
+        frame["std_ms"] = float(samples[:, -1].std())
+        return {"fps": 1000.0 / frame["mean_ms"] if frame["mean_ms"] > 0 else 0.0,
+                "frame": frame, "phases": columns}
+    
+    def export_json(self, path: str, metadata: Optional[Dict] = None) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        nonzero = np.nonzero(self.histogram)[0]
+        data = {
+            "frames": self.frames,
+            "window": self.window,
+            "recent": self.stats(),
+            # {lower bound ms: count}; the last bin holds everything from HISTOGRAM_MAX_MS up
+            "frame_time_histogram_ms": {int(ms): int(self.histogram[ms]) for ms in nonzero},
+            "worst_frames": [{"frame": index, "frame_ms": frame_ms, "phases_ms": phases}
+                             for frame_ms, index, phases in sorted(self.worst, reverse=True)],
+        }
+        if metadata:
+            data.update(metadata)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return path
 
 # ==================== MAIN GAME ====================
 class EnhancedPeriQuestGame:
     """Enhanced PeriQuest game with advanced features"""
     
-    def __init__(self, patient_id: str = "default"):
-        self.config = GameConfig()
+    def __init__(self, patient_id: str = "default", config: Optional[GameConfig] = None, clock=None):
+        """clock: source of game time in seconds (default time.perf_counter, monotonic
+        and high resolution); simulation.py passes a virtual clock to run sessions
+        faster than real time"""
+        self.config = config or GameConfig()
+        self.clock = clock or time.perf_counter
         self.patient_id = patient_id
         self.session_id = f"{patient_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         # Components
-        self.stimulus_manager = StimulusManager(self.config)
-        self.renderer = ModernRenderer(self.config)
-        self.adaptive_difficulty = AdaptiveDifficulty()
+        self.levels = LevelTable.load(self.config.LEVELS_FILE) if self.config.LEVELS_FILE else LevelTable(DEFAULT_LEVELS)
+        self.stimulus_manager = StimulusManager(self.config, self.levels, clock=self.clock)
+        self.renderer = ModernRenderer(self.config, clock=self.clock)
+        self.input = InputTimestamper(self.clock)
+        if self.config.DIFFICULTY_MODE == "staircase":
+            self.adaptive_difficulty = StaircaseDifficulty(self.levels, target=self.config.STAIRCASE_HIT_RATE)
+        else:
+            self.adaptive_difficulty = AdaptiveDifficulty(self.levels, clock=self.clock)
         
         # Eye tracking
-        if EYE_TRACKING_AVAILABLE:
-            self.eye_tracker = EnhancedEyeTracker()
+        eye_tracking = EYE_TRACKING.get() if self.config.TRACKER_BACKEND != "none" else None
+        if eye_tracking:
+            gaze_filter = GAZE_FILTERS.get().create_gaze_filter(self.config.GAZE_FILTER)
+            if self.config.TRACKER_BACKEND == "synthetic" and SYNTHETIC_TRACKER.available:
+                self.eye_tracker = SYNTHETIC_TRACKER.get().SyntheticEyeTracker(
+                    seed=self.config.TRACKER_SYNTHETIC_SEED, gaze_filter=gaze_filter)
+            elif self.config.TRACKER_ADDRESS and TRACKER_SERVICE.available:
+                self.eye_tracker = TRACKER_SERVICE.get().RemoteEyeTracker(
+                    self.config.TRACKER_ADDRESS, gaze_filter=gaze_filter)
+            else:
+                governor = None
+                if self.config.TRACKER_BUDGET_MS > 0:
+                    governor = eye_tracking.FrameRateGovernor(
+                        target_fps=self.config.TRACKER_TARGET_FPS,
+                        budget_ms=self.config.TRACKER_BUDGET_MS)
+                self.eye_tracker = eye_tracking.EnhancedEyeTracker(
+                    gaze_filter=gaze_filter,
+                    inference_mode=self.config.TRACKER_INFERENCE_MODE,
+                    governor=governor,
+                    stage_timing=self.config.TRACKER_STAGE_TIMING)
             self.eye_tracker_enabled = self.eye_tracker.initialize_camera()
         else:
             self.eye_tracker = None
             self.eye_tracker_enabled = False
         
-        # Reporting
-        if REPORTING_AVAILABLE:
-            self.report_generator = ReportGenerator()
-        else:
-            self.report_generator = None
+        # Reporting (created on first export)
+        self._report_generator = None
         
         # State
         self.running = False
@@ -730,27 +1606,88 @@ class EnhancedPeriQuestGame:
         self.feedback_queue = deque(maxlen=3)
         self.current_feedback = None
         
+        # Raw eye data recording for the current session
+        self.eye_recorder = None
+        
+        # Tracker stage timing overlay (T)
+        self.show_stage_timings = self.config.TRACKER_STAGE_TIMING
+        
+        # Game loop profiling and its overlay (F); the overlay's stats refresh twice a second
+        self.frame_profiler = FrameProfiler(self.config.FRAME_PROFILE_WINDOW) if self.config.FRAME_PROFILING else None
+        self.show_frame_stats = self.config.SHOW_FRAME_STATS and self.frame_profiler is not None
+        self.frame_stats = None
+        self.frame_stats_time = 0.0
+        
+        # Tracker's head movement count when last seen (None until the session's first sample)
+        self.last_head_movement_count = None
+        
+        # Gaze calibration (reuse a saved one for this patient if present)
+        self.calibration_index = 0
+        self.calibration_target_start = 0
+        self.calibration_samples = []
+        if self.eye_tracker_enabled and not self.eye_tracker.load_calibration(patient_id):
+            self.start_calibration()
+        
         print(f"✓ Enhanced PeriQuest initialized for patient: {patient_id}")
         print(f"  Eye Tracking: {'Enabled' if self.eye_tracker_enabled else 'Disabled'}")
-        print(f"  Reporting: {'Enabled' if self.report_generator else 'Disabled'}")
+        print(f"  Reporting: {'Enabled' if REPORTING.loaded and REPORTING.module else 'On demand'}")
     
     def start_session(self):
         """Start therapy session"""
         self.running = True
-        self.session_start_time = time.time()
+        self.session_start_time = self.clock()
         self.metrics = SessionMetrics(
             patient_id=self.patient_id,
             session_id=self.session_id,
-            start_time=datetime.now()
+            start_time=datetime.now(),
+            stimulus_seed=self.stimulus_manager.seed
         )
+        self.last_head_movement_count = None
+        self.renderer.prewarm(self.stimulus_manager.stimulus_variants(self.current_level))
+        if self.eye_tracker_enabled:
+            self.eye_tracker.pupil_processor.reset_baseline()
+            self._start_eye_recording()
         print(f"✓ Session started: {self.session_id}")
     
+    def _begin_play(self):
+        """Leave the instructions: the session clock and stimulus schedule start now"""
+        self.state = GameState.PLAYING
+        self.session_start_time = self.clock()
+        self.stimulus_manager.start_schedule()
+    
+    def _start_eye_recording(self):
+        """Open the session's eye data recording, if enabled"""
+        if not self.config.RECORD_EYE_DATA or not EYE_RECORDING.available:
+            return
+        path = os.path.join(self.config.RECORDINGS_DIR, f"{self.session_id}.eyerec")
+        try:
+            self.eye_recorder = EYE_RECORDING.get().EyeDataRecorder(path, metadata={
+                "patient_id": self.patient_id,
+                "session_id": self.session_id,
+                "start_time": self.metrics.start_time.isoformat(),
+            })
+            print(f"✓ Recording eye data to {path}")
+        except OSError as e:
+            print(f"✗ Could not start eye data recording: {e}")
+    
+    def _stop_eye_recording(self):
+        if self.eye_recorder:
+            try:
+                self.eye_recorder.close()
+                print(f"✓ Eye data saved: {self.eye_recorder.path} ({self.eye_recorder.rows} frames)")
+            except OSError as e:
+                print(f"✗ Could not finish eye data recording: {e}")
+            self.eye_recorder = None
+    
     def handle_events(self):
         """Handle input events"""
-        for event in pygame.event.get():
+        for event_time, event in self.input.drain():
             if event.type == pygame.QUIT:
                 self.running = False
             
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.renderer.invalidate()
+            
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if self.state == GameState.RESULTS:
                     # Check for button clicks on result screen
@@ -767,24 +1704,40 @@ class EnhancedPeriQuestGame:
                          self._generate_report('excel')
                 
                 elif self.state == GameState.INSTRUCTIONS:
-                    self.state = GameState.PLAYING
-                    self.session_start_time = time.time()
+                    self._begin_play()
             
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 
                 elif self.state == GameState.INSTRUCTIONS:
-                    # Any key to start
-                    self.state = GameState.PLAYING
-                    self.session_start_time = time.time()
+                    if event.key == pygame.K_c and self.eye_tracker_enabled:
+                        self.start_calibration()
+                    else:
+                        # Any other key to start
+                        self._begin_play()
                 
                 elif self.state == GameState.PLAYING:
                     if event.key == pygame.K_SPACE:
-                        self._handle_reaction()
+                        self._handle_reaction(event_time)
                     elif event.key == pygame.K_p:
                         self.paused = not self.paused
+                        if self.paused:
+                            self.stimulus_manager.scheduler.pause()
+                        else:
+                            self.stimulus_manager.scheduler.resume()
+                    elif event.key == pygame.K_t and self.eye_tracker_enabled:
+                        self._toggle_stage_timings()
+                    elif event.key == pygame.K_f and self.frame_profiler:
+                        self.show_frame_stats = not self.show_frame_stats
 
+    @property
+    def report_generator(self):
+        """ReportGenerator, created the first time a report is requested"""
+        if self._report_generator is None and REPORTING.available:
+            self._report_generator = REPORTING.get().ReportGenerator()
+        return self._report_generator
+    
     def _generate_report(self, type='pdf'):
         """Generate specific report on demand"""
         if not self.report_generator: return
@@ -819,16 +1772,14 @@ class EnhancedPeriQuestGame:
         WIDTH, HEIGHT = self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT
         
         # 1. Title
-        title = self.renderer.title_font.render("SESSION COMPLETE", True, self.config.SUCCESS_COLOR)
+        title = self.renderer.render_text(self.renderer.title_font, "SESSION COMPLETE", True, self.config.SUCCESS_COLOR)
         screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 50))
         
         # 2. Score & Accuracy Cards
         # Draw dashboard background panel
         panel_rect = pygame.Rect(100, 150, WIDTH - 200, 400)
-        s = pygame.Surface((panel_rect.width, panel_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(s, (30, 41, 59, 200), s.get_rect(), border_radius=20)
-        pygame.draw.rect(s, self.config.ACCENT_COLOR, s.get_rect(), 2, border_radius=20)
-        screen.blit(s, panel_rect)
+        screen.blit(self.renderer.panel(panel_rect.width, panel_rect.height,
+                                        border_color=self.config.ACCENT_COLOR, radius=20), panel_rect)
         
         # Metrics to display
         metrics = [
@@ -845,8 +1796,8 @@ class EnhancedPeriQuestGame:
         
         for i, (label, value, color) in enumerate(metrics[:3]): # Top row
             x = 100 + i * col_width + col_width // 2
-            lbl = self.renderer.medium_font.render(label, True, self.config.TEXT_COLOR)
-            val = self.renderer.large_font.render(value, True, color)
+            lbl = self.renderer.render_text(self.renderer.medium_font, label, True, self.config.TEXT_COLOR)
+            val = self.renderer.render_text(self.renderer.large_font, value, True, color)
             screen.blit(lbl, (x - lbl.get_width()//2, start_y))
             screen.blit(val, (x - val.get_width()//2, start_y + 40))
             
@@ -854,8 +1805,8 @@ class EnhancedPeriQuestGame:
         # Bottom row (Head moves, False alarms)
         for i, (label, value, color) in enumerate(metrics[3:]):
             x = 100 + (len(metrics[:3]) * col_width // len(metrics[3:])) * i + 150
-            lbl = self.renderer.medium_font.render(label, True, self.config.TEXT_COLOR)
-            val = self.renderer.large_font.render(value, True, color)
+            lbl = self.renderer.render_text(self.renderer.medium_font, label, True, self.config.TEXT_COLOR)
+            val = self.renderer.render_text(self.renderer.large_font, value, True, color)
             screen.blit(lbl, (x - lbl.get_width()//2, start_y))
             screen.blit(val, (x - val.get_width()//2, start_y + 40))
 
@@ -866,17 +1817,17 @@ class EnhancedPeriQuestGame:
         # PDF Button
         pdf_rect = pygame.Rect(WIDTH//2 - 210, 600, 200, 60)
         pygame.draw.rect(screen, self.config.ACCENT_COLOR, pdf_rect, border_radius=10)
-        pdf_text = self.renderer.medium_font.render("DOWNLOAD PDF", True, self.config.BG_COLOR)
+        pdf_text = self.renderer.render_text(self.renderer.medium_font, "DOWNLOAD PDF", True, self.config.BG_COLOR)
         screen.blit(pdf_text, (pdf_rect.centerx - pdf_text.get_width()//2, pdf_rect.centery - pdf_text.get_height()//2))
         
         # Excel Button
         excel_rect = pygame.Rect(WIDTH//2 + 10, 600, 200, 60)
         pygame.draw.rect(screen, (34, 197, 94), excel_rect, border_radius=10) # Green for Excel
-        xls_text = self.renderer.medium_font.render("DOWNLOAD EXCEL", True, self.config.BG_COLOR)
+        xls_text = self.renderer.render_text(self.renderer.medium_font, "DOWNLOAD EXCEL", True, self.config.BG_COLOR)
         screen.blit(xls_text, (excel_rect.centerx - xls_text.get_width()//2, excel_rect.centery - xls_text.get_height()//2))
 
         # Quit Hint
-        hint = self.renderer.small_font.render("Press ESC to Exit", True, (100, 116, 139))
+        hint = self.renderer.render_text(self.renderer.small_font, "Press ESC to Exit", True, (100, 116, 139))
         screen.blit(hint, (WIDTH//2 - hint.get_width()//2, 700))
 
     def end_session(self):
@@ -884,15 +1835,100 @@ class EnhancedPeriQuestGame:
         self.game_over = True
         self.state = GameState.RESULTS
         print("\n=== SESSION COMPLETE ===")
+        self._stop_eye_recording()
+        self._export_stage_timings()
+        self._export_frame_timings()
+    
+    def _toggle_stage_timings(self):
+        """Show/hide the tracker timing overlay, starting the timers on first use"""
+        self.show_stage_timings = not self.show_stage_timings
+        if self.show_stage_timings and getattr(self.eye_tracker, 'stage_timer', None) is None:
+            if hasattr(self.eye_tracker, 'enable_stage_timing'):
+                self.eye_tracker.enable_stage_timing()
+    
+    def _export_stage_timings(self):
+        """Write tracker stage timings to reports/ if any were collected"""
+        timer = getattr(self.eye_tracker, 'stage_timer', None)
+        if not timer or not timer.counts:
+            return
+        path = os.path.join("reports", f"tracker_timing_{self.session_id}.json")
+        try:
+            timer.export_json(path, {"session_id": self.session_id,
+                                     "performance": self.eye_tracker.get_performance_stats()})
+            print(f"✓ Tracker timings exported: {path}")
+        except OSError as e:
+            print(f"✗ Could not export tracker timings: {e}")
         # Wait for user interaction in game loop
     
-    def _handle_reaction(self):
-        """Handle player reaction"""
-        current_time = time.time()
+    def _export_frame_timings(self):
+        """Write the game loop's frame-time histogram and worst frames to reports/"""
+        if not self.frame_profiler or not self.frame_profiler.frames:
+            return
+        path = os.path.join("reports", f"frame_timing_{self.session_id}.json")
+        try:
+            self.frame_profiler.export_json(path, {"session_id": self.session_id,
+                                                   "target_fps": self.config.FPS})
+            print(f"✓ Frame timings exported: {path}")
+        except OSError as e:
+            print(f"✗ Could not export frame timings: {e}")
+    
+    def start_calibration(self):
+        """Begin the on-screen gaze calibration sequence"""
+        self.eye_tracker.calibration.clear()
+        self.calibration_index = 0
+        self.calibration_target_start = self.clock()
+        self.calibration_samples = []
+        self.state = GameState.CALIBRATING
+        print("✓ Gaze calibration started")
+    
+    def _update_calibration(self):
+        """Collect gaze samples for the current calibration target"""
+        eye_data = self.eye_tracker.get_eye_data()
+        elapsed_ms = (self.clock() - self.calibration_target_start) * 1000
+        
+        if elapsed_ms < self.config.CALIBRATION_SETTLE_MS:
+            return
+        
+        if eye_data and eye_data.gaze_vector and not eye_data.eyes_closed:
+            self.calibration_samples.append(eye_data.gaze_vector)
+        
+        if elapsed_ms < self.config.CALIBRATION_SETTLE_MS + self.config.CALIBRATION_SAMPLE_MS:
+            return
+        
+        # Median is robust to the odd sample taken mid-saccade
+        if self.calibration_samples:
+            vx, vy = np.median(np.array(self.calibration_samples), axis=0)
+            target = self.config.CALIBRATION_POINTS[self.calibration_index]
+            self.eye_tracker.calibration.add_sample(target, (float(vx), float(vy)))
+        
+        self.calibration_index += 1
+        self.calibration_target_start = self.clock()
+        self.calibration_samples = []
+        
+        if self.calibration_index >= len(self.config.CALIBRATION_POINTS):
+            self._finish_calibration()
+    
+    def _finish_calibration(self):
+        """Fit the gaze mapping and persist it for this patient"""
+        calibration = self.eye_tracker.calibration
+        if calibration.fit():
+            print(f"✓ Gaze calibrated ({len(calibration.calibration_points)} points, "
+                  f"mean error {calibration.mean_error():.3f})")
+            self.eye_tracker.save_calibration(self.patient_id)
+        else:
+            print("⚠ Calibration failed (not enough gaze samples), using default mapping")
+        self.state = GameState.INSTRUCTIONS
+    
+    def _handle_reaction(self, press_time: Optional[float] = None):
+        """Handle player reaction (press_time: when the key went down, default now)"""
+        if press_time is None:
+            press_time = self.clock()
         
         for stimulus in self.stimulus_manager.stimuli:
             if not stimulus.reacted and stimulus.is_target:
-                reaction_time = current_time - stimulus.appear_time
+                # From the flip that showed it; appear_time if it was never drawn
+                onset = stimulus.onset_time if stimulus.onset_time is not None else stimulus.appear_time
+                reaction_time = press_time - onset
                 
                 if reaction_time * 1000 < stimulus.duration_ms:
                     self._process_reaction(stimulus, reaction_time)
@@ -909,6 +1945,7 @@ class EnhancedPeriQuestGame:
         stimulus.reaction_time = reaction_time
         
         self.metrics.add_reaction(stimulus, reaction_time)
+        self.adaptive_difficulty.record_trial(hit=True)
         
         rt_ms = reaction_time * 1000
         if rt_ms < self.config.PERFECT_RT:
@@ -928,15 +1965,19 @@ class EnhancedPeriQuestGame:
         self.feedback_queue.append({
             "message": message,
             "color": color,
-            "end_time": time.time() + 1.0
+            "end_time": self.clock() + 1.0
         })
     
     def update(self):
         """Update game state"""
+        if self.state == GameState.CALIBRATING:
+            self._update_calibration()
+            return
+        
         if self.paused or self.state != GameState.PLAYING:
             return
         
-        current_time = time.time()
+        current_time = self.clock()
         session_duration = current_time - self.session_start_time
         
         # Check session end
@@ -949,11 +1990,13 @@ class EnhancedPeriQuestGame:
         self.current_level = self.adaptive_difficulty.update(self.metrics, session_duration)
         self.metrics.level = self.current_level
         
-        # Update spawn interval based on level
+        # Update spawn interval and display time based on difficulty
         self.stimulus_manager.spawn_interval = self.adaptive_difficulty.get_spawn_interval()
+        self.stimulus_manager.duration_ms = self.adaptive_difficulty.get_duration_ms()
         
         # Show level up animation
         if old_level != self.current_level:
+            self.renderer.prewarm(self.stimulus_manager.stimulus_variants(self.current_level))
             self.level_up_animation_time = current_time
             level_msg = f"LEVEL {self.current_level}!"
             self._show_feedback(level_msg, self.config.ACCENT_COLOR)
@@ -963,13 +2006,23 @@ class EnhancedPeriQuestGame:
             eye_data = self.eye_tracker.get_eye_data()
             if eye_data:
                 self.metrics.eye_tracking_data.append(eye_data)
+                if self.eye_recorder:
+                    self.eye_recorder.append(eye_data)
                 
                 if not eye_data.is_fixating:
                     self.metrics.fixation_breaks += 1
-        
-        # Generate stimuli
-        if random.random() < 0.02:  # 2% chance per frame
-            stimulus = self.stimulus_manager.generate_stimulus(self.current_level)
+                
+                # The tracker debounces head movements; count the ones started since the last sample
+                if self.last_head_movement_count is not None:
+                    new_movements = eye_data.head_movement_count - self.last_head_movement_count
+                    if new_movements > 0:
+                        self.metrics.head_movements += new_movements
+                        self._show_feedback("KEEP HEAD STILL!", self.config.WARNING_COLOR)
+                self.last_head_movement_count = eye_data.head_movement_count
+        
+        # Generate stimuli at their scheduled onsets
+        for onset, stimulus in self.stimulus_manager.spawn_due(self.current_level):
+            self.metrics.stimulus_onsets.append(onset)
             if stimulus:
                 self.metrics.total_stimuli += 1
         
@@ -978,6 +2031,7 @@ class EnhancedPeriQuestGame:
         for stimulus in expired:
             if stimulus.is_target and not stimulus.reacted:
                 self.metrics.add_miss(stimulus)
+                self.adaptive_difficulty.record_trial(hit=False)
                 self.metrics.score += self.config.MISS_PENALTY
                 self._show_feedback("Missed!", self.config.ERROR_COLOR)
         
@@ -994,12 +2048,16 @@ class EnhancedPeriQuestGame:
         if not self.running:
             return
         
-        self.renderer.clear_screen()
+        # Menus, results and the pause screen are not tracked as dirty rectangles;
+        # the first frame after them is redrawn in full, so nothing of them is left
+        self.renderer.begin_frame(untracked=self.state != GameState.PLAYING or self.paused)
         
         if self.state == GameState.RESULTS:
             self._render_game_over()
         elif self.state == GameState.INSTRUCTIONS:
             self._render_instructions()
+        elif self.state == GameState.CALIBRATING:
+            self._render_calibration()
         else:
             # Determine fixation status for feedback
             is_fixating_center = True
@@ -1014,16 +2072,6 @@ class EnhancedPeriQuestGame:
                 if time_since_data < 0.2:
                     is_fixating_center = latest_data.is_fixating
                     current_gaze = latest_data.gaze_point
-                    
-                    # Track head movements (debounce: don't count continuous movement as multiple)
-                    if getattr(latest_data, 'head_turn_detected', False):
-                        if not getattr(self, 'currently_turning_head', False):
-                            self.metrics.head_movements += 1
-                            self.currently_turning_head = True
-                            self._show_feedback("KEEP HEAD STILL!", self.config.WARNING_COLOR)
-                    else:
-                        self.currently_turning_head = False
-                        
                 else:
                     # Tracking lost (face turned away or obscured)
                     is_fixating_center = False
@@ -1034,7 +2082,7 @@ class EnhancedPeriQuestGame:
             for stimulus in self.stimulus_manager.stimuli:
                 self.renderer.draw_stimulus(stimulus)
             
-            time_remaining = max(0, self.config.SESSION_DURATION - (time.time() - self.session_start_time))
+            time_remaining = max(0, self.config.SESSION_DURATION - (self.clock() - self.session_start_time))
             self.renderer.draw_hud(self.metrics, time_remaining, self.current_level)
             
             # Draw camera feed and eye tracking status
@@ -1044,7 +2092,10 @@ class EnhancedPeriQuestGame:
                 
                 # Get current eye data
                 current_eye_data = self.metrics.eye_tracking_data[-1] if self.metrics.eye_tracking_data else None
-                self.renderer.draw_eye_status(current_eye_data)
+                stage_timings = None
+                if self.show_stage_timings and getattr(self.eye_tracker, 'stage_timer', None):
+                    stage_timings = self.eye_tracker.stage_timer.stats()
+                self.renderer.draw_eye_status(current_eye_data, stage_timings=stage_timings)
                 
                 # Draw on-screen gaze cursor for user feedback
                 if current_gaze:
@@ -1059,18 +2110,55 @@ class EnhancedPeriQuestGame:
             if self.paused:
                 self.renderer.draw_feedback("PAUSED", self.config.WARNING_COLOR)
         
-        self.renderer.update_display()
+        if self.show_frame_stats:
+            now = time.perf_counter()
+            if now - self.frame_stats_time >= 0.5:
+                self.frame_stats = self.frame_profiler.stats()
+                self.frame_stats_time = now
+            if self.frame_stats:
+                self.renderer.draw_frame_stats(self.frame_stats)
+        
+        self.renderer.update_display(wait=self.input.wait)
+        
+        if self.state == GameState.PLAYING:
+            for stimulus in self.stimulus_manager.stimuli:
+                if stimulus.onset_time is None:
+                    stimulus.onset_time = self.renderer.last_flip_time
     
     
+    def _render_calibration(self):
+        """Render the current calibration target"""
+        screen = self.renderer.screen
+        WIDTH, HEIGHT = self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT
+        
+        if self.calibration_index >= len(self.config.CALIBRATION_POINTS):
+            return
+        
+        tx, ty = self.config.CALIBRATION_POINTS[self.calibration_index]
+        x, y = int(tx * WIDTH), int(ty * HEIGHT)
+        
+        # Ring shrinks onto the target while it settles, then stays tight during sampling
+        elapsed_ms = (self.clock() - self.calibration_target_start) * 1000
+        settle = min(1.0, elapsed_ms / self.config.CALIBRATION_SETTLE_MS)
+        ring_radius = int(40 - 28 * settle)
+        ring_color = self.config.SUCCESS_COLOR if settle >= 1.0 else self.config.ACCENT_COLOR
+        
+        pygame.draw.circle(screen, ring_color, (x, y), ring_radius, 3)
+        pygame.draw.circle(screen, self.config.CENTER_DOT_COLOR, (x, y), 8)
+        pygame.draw.circle(screen, self.config.TEXT_COLOR, (x, y), 8, 2)
+        
+        hint = self.renderer.render_text(self.renderer.medium_font, 
+            f"Calibration: look at the dot ({self.calibration_index + 1}/{len(self.config.CALIBRATION_POINTS)})",
+            True, self.config.TEXT_COLOR)
+        screen.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT // 2 + 60))
+    
     def _render_instructions(self):
         """Render comprehensive instructions screen"""
         screen = self.renderer.screen
         WIDTH, HEIGHT = self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT
         
-        # Overlay background
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((15, 23, 42, 230)) # Slate 900 with alpha
-        screen.blit(overlay, (0,0))
+        # Overlay background (Slate 900 with alpha), built once by the surface cache
+        screen.blit(self.renderer.panel(WIDTH, HEIGHT, (15, 23, 42, 230), radius=0), (0, 0))
         
         # Panel
         panel_rect = pygame.Rect(100, 50, WIDTH - 200, HEIGHT - 100)
@@ -1079,7 +2167,7 @@ class EnhancedPeriQuestGame:
         
         y = 80
         # Title
-        title = self.renderer.title_font.render("🎯 How to Play", True, self.config.SUCCESS_COLOR)
+        title = self.renderer.render_text(self.renderer.title_font, "🎯 How to Play", True, self.config.SUCCESS_COLOR)
         screen.blit(title, (WIDTH // 2 - title.get_width() // 2, y))
         y += 70
         
@@ -1092,15 +2180,15 @@ class EnhancedPeriQuestGame:
         ]
         
         for main_text, sub_text in instructions:
-            m_surf = self.renderer.medium_font.render(main_text, True, self.config.ACCENT_COLOR)
-            s_surf = self.renderer.small_font.render(sub_text, True, self.config.TEXT_COLOR)
+            m_surf = self.renderer.render_text(self.renderer.medium_font, main_text, True, self.config.ACCENT_COLOR)
+            s_surf = self.renderer.render_text(self.renderer.small_font, sub_text, True, self.config.TEXT_COLOR)
             screen.blit(m_surf, (150, y))
             screen.blit(s_surf, (150, y + 35))
             y += 75
             
         y += 10
         # Controls Section
-        ctrl_title = self.renderer.medium_font.render("Controls", True, self.config.WARNING_COLOR)
+        ctrl_title = self.renderer.render_text(self.renderer.medium_font, "Controls", True, self.config.WARNING_COLOR)
         screen.blit(ctrl_title, (150, y))
         y += 40
         
@@ -1109,36 +2197,36 @@ class EnhancedPeriQuestGame:
             "P - Pause/Resume game",
             "ESC - Quit game"
         ]
+        if self.eye_tracker_enabled:
+            controls.append("C - Recalibrate eye tracking")
+            controls.append("T - Tracker timing overlay")
         
         for ctrl in controls:
-            c_surf = self.renderer.small_font.render(f"• {ctrl}", True, self.config.TEXT_COLOR)
+            c_surf = self.renderer.render_text(self.renderer.small_font, f"• {ctrl}", True, self.config.TEXT_COLOR)
             screen.blit(c_surf, (170, y))
             y += 30
             
         # Level Progression column (Right side)
         level_x = WIDTH // 2 + 50
         level_y = 150
-        lvl_title = self.renderer.medium_font.render("Level Progression", True, self.config.ACCENT_COLOR)
+        lvl_title = self.renderer.render_text(self.renderer.medium_font, "Level Progression", True, self.config.ACCENT_COLOR)
         screen.blit(lvl_title, (level_x, level_y))
         level_y += 50
         
         levels = [
-            ("Level 1: Only circles (all targets)", "3 second display"),
-            ("Level 2: Circles (targets) + Squares (distractors)", "2.5 seconds"),
-            ("Level 3: Multiple shapes, circles & stars are targets", "2 seconds"),
-            ("Level 4+: All shapes, 70% targets, 30% distractors", "1.5 seconds"),
-            ("Level 5: Expert mode", "1 second display")
+            (f"Level {i + 1}: {description}", f"{duration_ms / 1000:g} second display")
+            for i, (description, duration_ms) in enumerate(zip(self.levels.descriptions, self.levels.durations_ms))
         ]
         
         for l_name, l_desc in levels:
-            n_surf = self.renderer.small_font.render(l_name, True, self.config.TEXT_COLOR)
-            d_surf = self.renderer.small_font.render(f"  → {l_desc}", True, (148, 163, 184))
+            n_surf = self.renderer.render_text(self.renderer.small_font, l_name, True, self.config.TEXT_COLOR)
+            d_surf = self.renderer.render_text(self.renderer.small_font, f"  → {l_desc}", True, (148, 163, 184))
             screen.blit(n_surf, (level_x, level_y))
             screen.blit(d_surf, (level_x, level_y + 25))
             level_y += 60
             
         # Press start hint
-        start_hint = self.renderer.medium_font.render("Press ANY KEY or CLICK to Start Therapy", True, self.config.SUCCESS_COLOR)
+        start_hint = self.renderer.render_text(self.renderer.medium_font, "Press ANY KEY or CLICK to Start Therapy", True, self.config.SUCCESS_COLOR)
         screen.blit(start_hint, (WIDTH // 2 - start_hint.get_width() // 2, HEIGHT - 100))
         
     def run(self):
@@ -1146,15 +2234,48 @@ class EnhancedPeriQuestGame:
         self.start_session()
         
         while self.running:
+            frame_start = time.perf_counter()
             self.handle_events()
+            events_done = time.perf_counter()
             self.update()
+            update_done = time.perf_counter()
             self.render()
+            render_done = time.perf_counter()
+            
+            if self.frame_profiler:
+                present, wait = self.renderer.last_present_time, self.renderer.last_wait_time
+                self.frame_profiler.add(frame_start, (
+                    events_done - frame_start, update_done - events_done,
+                    max(0.0, render_done - update_done - present - wait), present, wait))
         
         self.cleanup()
     
     def cleanup(self):
         """Cleanup resources"""
+        self._stop_eye_recording()
+        cache = self.renderer.surface_cache
+        print(f"  Surface cache: {cache.misses} built, {cache.hits} reused, {cache.evictions} evicted")
+        text_cache = self.renderer.text_cache
+        print(f"  Text cache: {text_cache.misses} rendered, {text_cache.hits} reused")
+        frame_stats = self.frame_profiler.stats() if self.frame_profiler else None
+        if frame_stats:
+            print(f"  Frames: {frame_stats['fps']:.1f} fps over the last {min(self.frame_profiler.frames, self.frame_profiler.window)}, "
+                  f"frame p95/p99 {frame_stats['frame']['p95_ms']:.1f}/{frame_stats['frame']['p99_ms']:.1f} ms, "
+                  f"worst {self.frame_profiler.worst and max(self.frame_profiler.worst)[0] or 0:.1f} ms")
+        if self.renderer.partial_frames:
+            print(f"  Display: {self.renderer.partial_frames} dirty-rect frames, "
+                  f"{self.renderer.full_frames} full redraws")
         if self.eye_tracker:
+            frames = self.eye_tracker.frames_captured
+            if frames:
+                allocations = self.eye_tracker.frame_pool.allocations + self.renderer.camera_allocations
+                print(f"  Frame buffers: {allocations} allocations over {frames} frames "
+                      f"({allocations / frames:.3f} per frame)")
+            perf = self.eye_tracker.get_performance_stats()
+            if perf:
+                print(f"  Tracker: {perf['effective_fps']:.1f} fps at {perf['inference_scale']:.2f}x resolution, "
+                      f"processing p50/p95/p99 {perf['latency_p50_ms']:.1f}/{perf['latency_p95_ms']:.1f}/"
+                      f"{perf['latency_p99_ms']:.1f} ms")
             self.eye_tracker.release()
         pygame.quit()
         print("\n✓ Game ended. Thank you!")
@@ -1240,10 +2361,38 @@ def show_setup_screen() -> int:
     except ValueError:
         return 300
 
+def profile_startup():
+    """Print the import cost of the game module and each optional stack"""
+    print("Startup import cost:")
+    print(f"  {'periquest_enhanced (pygame, numpy)':36s} {BASE_IMPORT_TIME * 1000:8.1f} ms")
+    
+    # Third-party stacks first, so the project modules below show only their own cost
+    for name in ("cv2", "mediapipe", "matplotlib.pyplot", "seaborn", "pandas"):
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            status = ""
+        except ImportError:
+            status = "  (not installed)"
+        print(f"  {name:36s} {(time.perf_counter() - start) * 1000:8.1f} ms{status}")
+    
+    for lazy_module in OPTIONAL_MODULES:
+        lazy_module.get()
+        status = "" if lazy_module.module else "  (unavailable)"
+        print(f"  {lazy_module.name:36s} {lazy_module.import_time * 1000:8.1f} ms{status}")
+    
+    if REPORTING.available:
+        start = time.perf_counter()
+        REPORTING.get().ReportGenerator()
+        print(f"  {'ReportGenerator()':36s} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
 def main():
-    import sys
+    if "--startup-profile" in sys.argv:
+        profile_startup()
+        return
     
-    # 1. Show graphical setup screen
+    # 1. Show graphical setup screen while the heavy modules load in the background
+    preload_optional_modules()
     duration_seconds = show_setup_screen()
     
     print("="*60)
@@ -1254,8 +2403,12 @@ def main():
     patient_id = f"patient_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     print(f"\nPatient ID: {patient_id}\n")
     
+    config = GameConfig()
+    if "--synthetic-tracker" in sys.argv:
+        config.TRACKER_BACKEND = "synthetic"
+    
     # Create game instance
-    game = EnhancedPeriQuestGame(patient_id=patient_id)
+    game = EnhancedPeriQuestGame(patient_id=patient_id, config=config)
     
     # Update configuration
     game.config.SESSION_DURATION = duration_seconds
@@ -12,10 +12,24 @@ import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
-import seaborn as sns
 from matplotlib.patches import Rectangle
 from matplotlib.backends.backend_pdf import PdfPages
-import pandas as pd
+
+_plot_style_applied = False
+
+def _apply_plot_style():
+    """Set the global plot style once, on the first report (seaborn is slow to import)"""
+    global _plot_style_applied
+    if _plot_style_applied:
+        return
+    try:
+        import seaborn as sns
+        sns.set_style("darkgrid")
+    except ImportError:
+        plt.style.use('ggplot')
+    plt.rcParams['figure.figsize'] = (12, 8)
+    plt.rcParams['font.size'] = 10
+    _plot_style_applied = True
 
 class ReportGenerator:
     """Generates comprehensive reports for therapy sessions"""
@@ -24,11 +38,6 @@ class ReportGenerator:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
-        # Set style for plots
-        sns.set_style("darkgrid")
-        plt.rcParams['figure.figsize'] = (12, 8)
-        plt.rcParams['font.size'] = 10
-        
     def generate_session_report(self, session_data: Dict[str, Any], 
                                 eye_tracking_data: Optional[List] = None,
                                 format: str = 'pdf') -> str:
@@ -61,6 +70,7 @@ class ReportGenerator:
                             session_id: str, timestamp: str) -> str:
         """Generate PDF report with visualizations"""
         pdf_filename = os.path.join(self.output_dir, f"report_{session_id}_{timestamp}.pdf")
+        _apply_plot_style()
         
         with PdfPages(pdf_filename) as pdf:
             # Page 1: Session Summary
@@ -622,7 +632,11 @@ class ReportGenerator:
         ax.axis('off')
         
         # Calculate statistics
-        blinks = sum(1 for d in eye_data if hasattr(d, 'blink_detected') and d.blink_detected)
+        # blink_count is cumulative per tracker, so the session total is a difference
+        if eye_data and hasattr(eye_data[-1], 'blink_count'):
+            blinks = eye_data[-1].blink_count - eye_data[0].blink_count + int(eye_data[0].blink_detected)
+        else:
+            blinks = sum(1 for d in eye_data if hasattr(d, 'blink_detected') and d.blink_detected)
         total_frames = len(eye_data)
         
         if total_frames > 0:
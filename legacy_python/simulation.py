@@ -0,0 +1,205 @@
+"""
+Headless Session Simulation for PeriQuest
+Runs EnhancedPeriQuestGame without a window or camera on a virtual clock,
+with a simulated (or scripted) player pressing SPACE, so whole sessions -
+stimulus schedule, adaptive difficulty, scoring and misses - complete in a
+fraction of their real duration. Used to tune difficulty across many
+sessions and to measure the cost of the game loop.
+
+    python simulation.py [sessions] [seed] [--duration S] [--render] [--difficulty rules|staircase] [--output FILE]
+"""
+
+import os
+import io
+import math
+import json
+import time
+import random
+import contextlib
+from typing import Dict, List, Optional
+
+# Before pygame is imported and initialized by the game module
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from periquest_enhanced import EnhancedPeriQuestGame, GameConfig, GameState, VisualField
+
+# ==================== CLOCK ====================
+class VirtualClock:
+    """Game time that only moves when advanced; call it for the current time"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+# ==================== PLAYERS ====================
+class SimulatedPlayer:
+    """Seeded stand-in for a patient
+
+    Notices each target with probability `hit_rate` (per visual field via
+    `field_hit_rates`, e.g. a weaker left side) and presses after a
+    lognormal reaction time with median `median_rt` seconds and log-spread
+    `rt_spread`. Presses on a distractor with probability `false_alarm_rate`.
+    presses() returns the times of the presses that fall due by `now`.
+    """
+
+    def __init__(self, seed: int = 0, hit_rate: float = 0.85, median_rt: float = 0.6,
+                 rt_spread: float = 0.3, false_alarm_rate: float = 0.2,
+                 field_hit_rates: Optional[Dict[VisualField, float]] = None):
+        self.rng = random.Random(seed)
+        self.hit_rate = hit_rate
+        self.median_rt = median_rt
+        self.rt_spread = rt_spread
+        self.false_alarm_rate = false_alarm_rate
+        self.field_hit_rates = field_hit_rates or {}
+        self._seen = set()
+        self._pending: List[float] = []
+
+    def presses(self, stimuli, now: float) -> List[float]:
+        for stimulus in stimuli:
+            if stimulus.id in self._seen:
+                continue
+            self._seen.add(stimulus.id)
+            if stimulus.is_target:
+                p = self.field_hit_rates.get(stimulus.field, self.hit_rate)
+            else:
+                p = self.false_alarm_rate
+            if self.rng.random() < p:
+                rt = self.median_rt * math.exp(self.rng.gauss(0.0, self.rt_spread))
+                self._pending.append(stimulus.appear_time + rt)
+
+        due = sorted(t for t in self._pending if t <= now)
+        if due:
+            self._pending = [t for t in self._pending if t > now]
+        return due
+
+class ScriptedPlayer:
+    """Presses at fixed session times (seconds from the start of play)"""
+
+    def __init__(self, press_times: List[float], start: float = 0.0):
+        self.press_times = sorted(start + t for t in press_times)
+        self._next = 0
+
+    def presses(self, stimuli, now: float) -> List[float]:
+        due = []
+        while self._next < len(self.press_times) and self.press_times[self._next] <= now:
+            due.append(self.press_times[self._next])
+            self._next += 1
+        return due
+
+# ==================== SESSIONS ====================
+def simulate_session(player, config: Optional[GameConfig] = None, render: bool = False,
+                     patient_id: str = "simulated") -> Dict:
+    """Play one session at config.FPS virtual frames per second, as fast as possible
+
+    Returns the session's metrics (SessionMetrics.to_dict()) plus the loop
+    cost under "simulation". With render=True each frame is also drawn
+    off-screen, so the cost includes rendering.
+    """
+    config = config or GameConfig()
+    config.HEADLESS = True
+    config.TRACKER_BACKEND = "none"
+    config.RECORD_EYE_DATA = False
+
+    clock = VirtualClock()
+    step = 1.0 / config.FPS
+    game = EnhancedPeriQuestGame(patient_id=patient_id, config=config, clock=clock)
+    game.start_session()
+    game._begin_play()
+
+    frames = 0
+    update_time = render_time = 0.0
+    levels = [(0.0, game.current_level)]
+    while game.state == GameState.PLAYING:
+        clock.advance(step)
+        # Presses keep their exact times, as the input timestamps do in the real loop
+        for press_time in player.presses(game.stimulus_manager.stimuli, clock()):
+            game._handle_reaction(press_time)
+
+        start = time.perf_counter()
+        game.update()
+        update_time += time.perf_counter() - start
+        if render:
+            start = time.perf_counter()
+            game.render()
+            render_time += time.perf_counter() - start
+
+        frames += 1
+        if game.current_level != levels[-1][1]:
+            levels.append((clock() - game.session_start_time, game.current_level))
+
+    result = game.metrics.to_dict()
+    result["simulation"] = {
+        "frames": frames,
+        "simulated_s": frames * step,
+        "update_ms_per_frame": update_time * 1000 / frames,
+        "render_ms_per_frame": render_time * 1000 / frames if render else None,
+        "levels": levels,
+        "threshold": getattr(game.adaptive_difficulty, "threshold", None),
+    }
+    return result
+
+def simulate_sessions(count: int, seed: int = 0, duration: Optional[int] = None, render: bool = False,
+                      player_factory=None, difficulty: str = "rules") -> List[Dict]:
+    """Run `count` seeded sessions quietly; session i uses seed + i for stimuli and player.
+    difficulty: GameConfig.DIFFICULTY_MODE"""
+    player_factory = player_factory or (lambda session_seed: SimulatedPlayer(seed=session_seed))
+    results = []
+    for i in range(count):
+        config = GameConfig()
+        config.STIMULUS_SEED = seed + i
+        config.DIFFICULTY_MODE = difficulty
+        if duration:
+            config.SESSION_DURATION = duration
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append(simulate_session(player_factory(seed + i), config, render=render,
+                                            patient_id=f"simulated_{seed + i}"))
+    return results
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate PeriQuest sessions headlessly")
+    parser.add_argument("sessions", type=int, nargs="?", default=100)
+    parser.add_argument("seed", type=int, nargs="?", default=0)
+    parser.add_argument("--duration", type=int, help="Session length in seconds (default: GameConfig's)")
+    parser.add_argument("--render", action="store_true", help="Also draw every frame off-screen")
+    parser.add_argument("--difficulty", default="rules", choices=("rules", "staircase"))
+    parser.add_argument("--output", help="Write every session's results to this JSON file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate_sessions(args.sessions, args.seed, args.duration, args.render,
+                                difficulty=args.difficulty)
+    elapsed = time.perf_counter() - start
+
+    simulated = sum(r["simulation"]["simulated_s"] for r in results)
+    frames = sum(r["simulation"]["frames"] for r in results)
+    update_ms = sum(r["simulation"]["update_ms_per_frame"] * r["simulation"]["frames"] for r in results)
+    print(f"  {len(results)} sessions ({simulated / 60:.0f} simulated min) in {elapsed:.2f}s "
+          f"-> {simulated / elapsed:.0f}x real time")
+    cost = f"  update {update_ms / frames:.3f} ms/frame"
+    if args.render:
+        render_ms = sum(r["simulation"]["render_ms_per_frame"] * r["simulation"]["frames"] for r in results)
+        cost += f"  render {render_ms / frames:.3f} ms/frame"
+    print(cost)
+    print(f"  accuracy {sum(r['accuracy_percentage'] for r in results) / len(results):.1f}%  "
+          f"avg RT {sum(r['average_reaction_time_ms'] for r in results) / len(results):.0f} ms  "
+          f"stimuli/session {sum(r['total_stimuli'] for r in results) / len(results):.1f}")
+    thresholds = [r["simulation"]["threshold"] for r in results if r["simulation"]["threshold"] is not None]
+    if thresholds:
+        mean = sum(thresholds) / len(thresholds)
+        spread = math.sqrt(sum((t - mean) ** 2 for t in thresholds) / len(thresholds))
+        print(f"  staircase threshold {mean:.2f} ± {spread:.2f} (level scale, {len(thresholds)} sessions)")
+    final_levels = [r["level"] for r in results]
+    print("  final level: " + "  ".join(f"L{level} {final_levels.count(level)}"
+                                        for level in sorted(set(final_levels))))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Results written to {args.output}")
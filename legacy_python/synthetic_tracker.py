@@ -0,0 +1,290 @@
+"""
+Synthetic Eye Tracker for PeriQuest
+Stands in for EnhancedEyeTracker without a camera or face_landmarker.task:
+a seeded model produces fixations, saccades, blinks and head turns, which
+are rendered into face landmarks and run through the tracker's normal
+post-processing (gaze filter, fixation/saccade, blink and head movement
+detection).
+
+    python synthetic_tracker.py [frames] [seed]   # benchmark frames/second
+"""
+
+import math
+import time
+import random
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from tasks_eye_tracker import EnhancedEyeTracker, EyeData, HeadPoseEstimator
+
+# ==================== GAZE MODEL ====================
+class SyntheticGazeModel:
+    """Seeded generator of gaze, blinks and head pose over time
+
+    Gaze alternates between fixations (lognormal durations around
+    `fixation_duration`, on the center fixation point with probability
+    `center_bias`, elsewhere otherwise) and saccades whose duration grows
+    with amplitude and that follow a minimum-jerk profile. Blinks and head
+    turns arrive as Poisson processes at `blink_rate` and `head_turn_rate`
+    per minute. Pupil size drifts slowly (a few percent, time constant
+    `pupil_drift_time` seconds). sample() must be called with
+    non-decreasing times.
+    """
+
+    def __init__(self, seed: int = 0, fixation_duration: float = 0.35, center_bias: float = 0.7,
+                 blink_rate: float = 15.0, head_turn_rate: float = 2.0, gaze_noise: float = 0.004,
+                 pupil_drift_time: float = 8.0):
+        self.rng = random.Random(seed)
+        self.fixation_duration = fixation_duration
+        self.center_bias = center_bias
+        self.blink_rate = blink_rate
+        self.head_turn_rate = head_turn_rate
+        self.gaze_noise = gaze_noise
+        self.pupil_drift_time = pupil_drift_time
+        self._started = False
+
+    def _start(self, t: float):
+        self._started = True
+        self._fixation = (0.5, 0.5)
+        self._fixation_end = t + self._fixation_length()
+        self._saccade = None  # (start, end, from, to)
+        self._blink = (t + self._next_interval(self.blink_rate), 0.0)
+        self._turn = (t + self._next_interval(self.head_turn_rate), 0.0, 0.0, 0.0)
+        self._pupil = 0.0
+        self._pupil_time = t
+
+    def _next_interval(self, rate_per_minute: float) -> float:
+        return self.rng.expovariate(rate_per_minute / 60.0) if rate_per_minute > 0 else math.inf
+
+    def _fixation_length(self) -> float:
+        return self.fixation_duration * self.rng.lognormvariate(0.0, 0.4)
+
+    def _next_target(self) -> Tuple[float, float]:
+        if self.rng.random() < self.center_bias:
+            return (0.5 + self.rng.gauss(0, 0.02), 0.5 + self.rng.gauss(0, 0.02))
+        return (self.rng.uniform(0.1, 0.9), self.rng.uniform(0.1, 0.9))
+
+    def _gaze(self, t: float) -> Tuple[float, float]:
+        while True:
+            if self._saccade:
+                start, end, origin, target = self._saccade
+                if t < end:
+                    u = (t - start) / (end - start)
+                    s = u * u * u * (10 - 15 * u + 6 * u * u)  # Minimum jerk
+                    return (origin[0] + s * (target[0] - origin[0]),
+                            origin[1] + s * (target[1] - origin[1]))
+                self._saccade = None
+                self._fixation = target
+                self._fixation_end = end + self._fixation_length()
+            if t < self._fixation_end:
+                return self._fixation
+            target = self._next_target()
+            # Main sequence: bigger saccades take longer
+            duration = 0.02 + 0.1 * math.dist(self._fixation, target)
+            self._saccade = (self._fixation_end, self._fixation_end + duration, self._fixation, target)
+
+    def _blink_score(self, t: float) -> float:
+        start, duration = self._blink
+        while duration and t >= start + duration:
+            start, duration = start + duration + self._next_interval(self.blink_rate), 0.0
+        if not duration and t >= start:
+            duration = self.rng.uniform(0.1, 0.3)
+        self._blink = (start, duration)
+        if duration and t >= start:
+            return 0.9
+        return 0.05
+
+    def _head_pose(self, t: float) -> Tuple[float, float, float]:
+        start, hold, yaw, pitch = self._turn
+        ramp = 0.2
+        while hold and t >= start + hold + 2 * ramp:
+            start, hold = start + hold + 2 * ramp + self._next_interval(self.head_turn_rate), 0.0
+        if not hold and t >= start:
+            hold = self.rng.uniform(0.4, 1.2)
+            yaw = self.rng.choice((-1, 1)) * self.rng.uniform(20.0, 35.0)
+            pitch = self.rng.uniform(-8.0, 8.0)
+        self._turn = (start, hold, yaw, pitch)
+
+        amount = 0.0
+        if hold and t >= start:
+            elapsed = t - start
+            amount = min(1.0, elapsed / ramp, (hold + 2 * ramp - elapsed) / ramp)
+        return (amount * yaw + self.rng.gauss(0, 0.5),
+                amount * pitch + self.rng.gauss(0, 0.5),
+                self.rng.gauss(0, 0.5))
+
+    def _pupil_scale(self, t: float) -> float:
+        # Ornstein-Uhlenbeck drift around 1.0 with ~3% standard deviation
+        dt = t - self._pupil_time
+        self._pupil_time = t
+        decay = math.exp(-dt / self.pupil_drift_time)
+        self._pupil = self._pupil * decay + 0.03 * math.sqrt(1 - decay * decay) * self.rng.gauss(0, 1)
+        return 1.0 + self._pupil
+
+    def sample(self, t: float):
+        """(gaze_point, blink_score, (yaw, pitch, roll) degrees, pupil_scale) at time t"""
+        if not self._started:
+            self._start(t)
+        gx, gy = self._gaze(t)
+        gaze = (gx + self.rng.gauss(0, self.gaze_noise), gy + self.rng.gauss(0, self.gaze_noise))
+        return gaze, self._blink_score(t), self._head_pose(t), self._pupil_scale(t)
+
+# ==================== TRACKER ====================
+class SyntheticEyeTracker(EnhancedEyeTracker):
+    """EnhancedEyeTracker fed by SyntheticGazeModel instead of a camera
+
+    realtime=True delivers frames at `fps` of wall-clock time (None in
+    between, like a camera); realtime=False returns a new frame on every
+    call with timestamps advancing by 1/fps, for load generation and
+    simulation. Gaze is rendered through the uncalibrated gaze mapping, so
+    no calibration is needed.
+    """
+
+    FRAME_SIZE = (640, 480)
+    CAMERA_DISTANCE = 1800.0  # In face model units: the face spans ~40% of the frame
+
+    def __init__(self, seed: int = 0, fps: float = 30.0, realtime: bool = True,
+                 model: Optional[SyntheticGazeModel] = None, **tracker_kwargs):
+        super().__init__(initialize_landmarker=False, **tracker_kwargs)
+        self.seed = seed
+        self.fps = fps
+        self.realtime = realtime
+        self.model = model or SyntheticGazeModel(seed=seed)
+        self.frame_shape = (self.FRAME_SIZE[1], self.FRAME_SIZE[0], 3)
+        self._template = self._face_template(seed)
+        self._landmarks = None
+        self._clock = None
+        self._next_frame = 0.0
+        self.running = False
+
+    def _face_template(self, seed: int) -> np.ndarray:
+        """(478, 3) face in HeadPoseEstimator.PNP_MODEL units, camera axes"""
+        rng = np.random.default_rng(seed)
+        theta = rng.uniform(0, 2 * math.pi, 478)
+        r = np.sqrt(rng.uniform(0, 1, 478))
+        points = np.stack([300 * r * np.cos(theta), 380 * r * np.sin(theta), 140 * r * r], axis=1)
+
+        # Points the tracker reads, eyes as (outer, upper, upper, inner, lower, lower)
+        points[HeadPoseEstimator.PNP_INDICES] = HeadPoseEstimator.PNP_MODEL
+        for indices, side in ((self.LEFT_EYE_INDICES, -1), (self.RIGHT_EYE_INDICES, 1)):
+            if side > 0:
+                # RIGHT_EYE_INDICES run inner corner first
+                indices = [indices[3], indices[2], indices[1], indices[0], indices[5], indices[4]]
+            outer, up1, up2, inner, low1, low2 = indices
+            points[outer] = (side * 225, -170, 135)
+            points[inner] = (side * 75, -170, 135)
+            points[up1] = (side * 185, -195, 130)
+            points[up2] = (side * 115, -195, 130)
+            points[low1] = (side * 115, -145, 130)
+            points[low2] = (side * 185, -145, 130)
+        points[234] = (-350, -60, 250)
+        points[454] = (350, -60, 250)
+        return points.astype(np.float64)
+
+    @staticmethod
+    def _rotation(yaw: float, pitch: float, roll: float) -> np.ndarray:
+        """Rotation whose HeadPoseEstimator.euler_angles are ~(yaw, pitch, roll)"""
+        ry, _ = cv2.Rodrigues(np.array([0.0, -math.radians(yaw), 0.0]))
+        rx, _ = cv2.Rodrigues(np.array([math.radians(pitch), 0.0, 0.0]))
+        rz, _ = cv2.Rodrigues(np.array([0.0, 0.0, math.radians(roll)]))
+        return ry @ rx @ rz
+
+    def _synthesize_face(self, t: float):
+        """One extract_primary_face()-style result for time t"""
+        gaze, blink_score, (yaw, pitch, roll), pupil_scale = self.model.sample(t)
+        rotation = self._rotation(yaw, pitch, roll)
+
+        w, h = self.FRAME_SIZE
+        camera = (rotation @ self._template.T).T
+        camera[:, 2] += self.CAMERA_DISTANCE
+        points = np.empty((478, 3), dtype=np.float32)
+        points[:, 0] = (w * camera[:, 0] / camera[:, 2] + w / 2) / w
+        points[:, 1] = (w * camera[:, 1] / camera[:, 2] + h / 2) / h
+        points[:, 2] = (camera[:, 2] - self.CAMERA_DISTANCE) / self.CAMERA_DISTANCE
+
+        # Iris offset that the uncalibrated mapping in _estimate_gaze turns back into `gaze`
+        offset = ((gaze[0] - 0.5) / 5, (gaze[1] - 0.5) / 10)
+        # Iris ring radius in normalized x and y (a circle in pixels)
+        rx = 0.012 * pupil_scale
+        ry = rx * w / h
+        for eye, iris in ((self.LEFT_EYE_INDICES, self.LEFT_IRIS_INDICES),
+                          (self.RIGHT_EYE_INDICES, self.RIGHT_IRIS_INDICES)):
+            cx, cy = points[eye, :2].mean(axis=0) + offset
+            points[iris, 0] = (cx, cx + rx, cx, cx - rx, cx)
+            points[iris, 1] = (cy, cy, cy - ry, cy, cy + ry)
+
+        transform = np.eye(4, dtype=np.float32)
+        flip = HeadPoseEstimator._FLIP_YZ
+        transform[:3, :3] = flip @ rotation @ flip
+        self._landmarks = points
+        return points, (blink_score, blink_score), 1, transform
+
+    def initialize_camera(self, probe_fallback: bool = True) -> bool:
+        self._clock = time.time()
+        self._next_frame = self._clock
+        self.running = True
+        mode = "real time" if self.realtime else "as fast as polled"
+        print(f"✓ Synthetic eye tracker (seed {self.seed}, {self.fps:.0f} fps, {mode})")
+        return True
+
+    def get_eye_data(self) -> Optional[EyeData]:
+        if not self.running:
+            return None
+        if self.realtime:
+            now = time.time()
+            if now < self._next_frame:
+                return None
+            # Skip frames rather than catch up after a stall
+            self._next_frame = max(self._next_frame + 1.0 / self.fps, now - 0.5 / self.fps)
+            timestamp = now
+        else:
+            timestamp = self._clock
+            self._clock += 1.0 / self.fps
+
+        self.frames_captured += 1
+        face = self._synthesize_face(timestamp)
+        return self._build_eye_data(face, None, self.frame_shape, timestamp)
+
+    def get_current_frame(self):
+        """Small preview image of the synthetic landmarks (drawn on request)"""
+        if self._landmarks is None:
+            return None
+        frame = self.frame_pool.get("synthetic", (240, 320, 3))
+        frame[:] = 40
+        pixels = (self._landmarks[:, :2] * (320, 240)).astype(np.int32)
+        for x, y in pixels[::4]:
+            cv2.circle(frame, (int(x), int(y)), 1, (120, 120, 120), -1)
+        for index in self.LEFT_IRIS_INDICES[:1] + self.RIGHT_IRIS_INDICES[:1]:
+            x, y = pixels[index]
+            cv2.circle(frame, (int(x), int(y)), 3, (80, 200, 80), -1)
+        return frame
+
+    def load_calibration(self, patient_id: str) -> bool:
+        # Synthetic gaze already matches the uncalibrated mapping
+        return True
+
+    def release(self):
+        self.running = False
+
+if __name__ == "__main__":
+    import sys
+
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    tracker = SyntheticEyeTracker(seed=seed, realtime=False)
+    tracker.initialize_camera()
+    fixating = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        eye_data = tracker.get_eye_data()
+        fixating += eye_data.is_fixating
+    elapsed = time.perf_counter() - start
+
+    minutes = frames / tracker.fps / 60
+    print(f"  {frames} frames ({minutes:.1f} simulated min) in {elapsed:.2f}s "
+          f"-> {frames / elapsed:.0f} frames/s")
+    print(f"  fixating {fixating / frames * 100:.0f}%  saccades {len(tracker.saccades)}  "
+          f"blinks {tracker.total_blinks}  head movements {tracker.head_movement_detector.total_movements}")
@@ -7,15 +7,84 @@ import cv2
 import numpy as np
 import time
 import math
-import mediapipe as mp
 import os
+import json
 from dataclasses import dataclass, field
 from typing import Tuple, Optional, List, Dict, Any
 from collections import deque
 
-# Import MediaPipe Tasks API
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
+from gaze_filters import GazeFilter
+
+MODEL_PATH = 'face_landmarker.task'
+
+_mediapipe = None
+
+def load_mediapipe():
+    """Import MediaPipe (Tasks API) on first use
+
+    Detection, filtering and the synthetic/replay backends only need this
+    module's data types, so MediaPipe is not imported with it. Returns
+    (mp, python, vision); raises ImportError if MediaPipe is not installed.
+    """
+    global _mediapipe
+    if _mediapipe is None:
+        import mediapipe as mp
+        from mediapipe.tasks import python
+        from mediapipe.tasks.python import vision
+        _mediapipe = (mp, python, vision)
+    return _mediapipe
+
+def create_face_landmarker(running_mode: str = "VIDEO", num_faces: int = 1, model_path: str = MODEL_PATH):
+    """Create a FaceLandmarker with the tracker's standard options
+    running_mode: name of a vision.RunningMode ("VIDEO", "IMAGE", ...)"""
+    mp, python, vision = load_mediapipe()
+    base_options = python.BaseOptions(model_asset_path=model_path)
+    options = vision.FaceLandmarkerOptions(
+        base_options=base_options,
+        running_mode=getattr(vision.RunningMode, running_mode),
+        num_faces=num_faces,
+        min_face_detection_confidence=0.5,
+        min_face_presence_confidence=0.5,
+        min_tracking_confidence=0.5,
+        output_face_blendshapes=True,
+        output_facial_transformation_matrixes=True)
+    return vision.FaceLandmarker.create_from_options(options)
+
+def extract_primary_face(result):
+    """Pick the largest (closest) face from a FaceLandmarker result
+
+    Returns (landmarks, blink_scores, face_count, transform) where
+    landmarks is an (N, 3) float32 array normalized to the inference image,
+    blink_scores is (eyeBlinkLeft, eyeBlinkRight) or None without
+    blendshapes and transform is the 4x4 facial transformation matrix or
+    None. Returns None if no face was found. The output is plain data so it can
+    cross process boundaries.
+    """
+    if not result.face_landmarks:
+        return None
+
+    best, best_area, best_points = 0, -1.0, None
+    for i, face in enumerate(result.face_landmarks):
+        points = np.array([(lm.x, lm.y, lm.z) for lm in face], dtype=np.float32)
+        span = points[:, :2].max(axis=0) - points[:, :2].min(axis=0)
+        area = float(span[0] * span[1])
+        if area > best_area:
+            best, best_area, best_points = i, area, points
+
+    blink_scores = None
+    if result.face_blendshapes and len(result.face_blendshapes) > best:
+        # Search for blink scores
+        blendshapes = result.face_blendshapes[best]
+        left_blink = next((c.score for c in blendshapes if c.category_name == 'eyeBlinkLeft'), 0)
+        right_blink = next((c.score for c in blendshapes if c.category_name == 'eyeBlinkRight'), 0)
+        blink_scores = (left_blink, right_blink)
+
+    transform = None
+    matrixes = getattr(result, 'facial_transformation_matrixes', None)
+    if matrixes and len(matrixes) > best:
+        transform = np.asarray(matrixes[best], dtype=np.float32).reshape(4, 4)
+
+    return best_points, blink_scores, len(result.face_landmarks), transform
 
 @dataclass
 class EyeData:
@@ -24,22 +93,689 @@ class EyeData:
     left_eye_center: Optional[Tuple[float, float]] = None
     right_eye_center: Optional[Tuple[float, float]] = None
     gaze_point: Optional[Tuple[float, float]] = None
-    left_pupil_size: float = 0.0
+    raw_gaze_point: Optional[Tuple[float, float]] = None
+    gaze_vector: Optional[Tuple[float, float]] = None
+    left_pupil_size: float = 0.0   # Iris diameter / inter-ocular distance
     right_pupil_size: float = 0.0
+    pupil_change: float = 0.0      # Smoothed size vs. session baseline (%)
+    cognitive_load: float = 0.0    # Windowed z-score of pupil size vs. baseline
     is_fixating: bool = False
     blink_detected: bool = False
     head_turn_detected: bool = False
-    head_yaw: float = 0.0
+    head_yaw: float = 0.0    # Degrees, positive when the nose turns toward image right
+    head_pitch: float = 0.0  # Degrees, positive when the nose turns down
+    head_roll: float = 0.0   # Degrees, positive when the head tilts clockwise in the image
+    head_movement_count: int = 0
     head_position: Optional[Tuple[float, float]] = None
+    is_saccade: bool = False
+    eyes_closed: bool = False
+    blink_count: int = 0
+    faces_detected: int = 1
+
+@dataclass
+class BlinkEvent:
+    """A single completed blink"""
+    start: float
+    duration: float
+    left: bool
+    right: bool
+
+@dataclass
+class HeadMovementEvent:
+    """A single head movement away from the neutral pose"""
+    start: float
+    duration: float
+    peak_yaw: float    # Largest deviation from the neutral pose (degrees)
+    peak_pitch: float
+
+@dataclass
+class SaccadeEvent:
+    """A single saccade classified from the gaze stream"""
+    onset: float
+    offset: float
+    amplitude: float
+    peak_velocity: float
+    start_point: Tuple[float, float]
+    end_point: Tuple[float, float]
+
+    @property
+    def duration(self) -> float:
+        return self.offset - self.onset
     
 @dataclass
 class GazeCalibration:
-    """Stores calibration data for gaze estimation"""
+    """Stores calibration data for gaze estimation
+
+    calibration_points are the normalized on-screen targets and gaze_mappings
+    the raw gaze vectors (mean iris offset from eye center) measured while
+    looking at them. fit() solves a least-squares mapping from one to the
+    other into calibration_matrix: second-order polynomial with 6+ points,
+    affine with 3-5.
+    """
     calibration_points: List[Tuple[float, float]] = field(default_factory=list)
     gaze_mappings: List[Tuple[float, float]] = field(default_factory=list)
     is_calibrated: bool = False
     calibration_matrix: Optional[np.ndarray] = None
 
+    @staticmethod
+    def _features(vx: float, vy: float, n_terms: int) -> np.ndarray:
+        if n_terms == 6:
+            return np.array([1.0, vx, vy, vx * vy, vx * vx, vy * vy])
+        return np.array([1.0, vx, vy])
+
+    def clear(self):
+        self.calibration_points.clear()
+        self.gaze_mappings.clear()
+        self.is_calibrated = False
+        self.calibration_matrix = None
+
+    def add_sample(self, target: Tuple[float, float], gaze_vector: Tuple[float, float]):
+        self.calibration_points.append(tuple(target))
+        self.gaze_mappings.append(tuple(gaze_vector))
+
+    def fit(self) -> bool:
+        """Fit calibration_matrix from the collected samples"""
+        n = len(self.calibration_points)
+        if n < 3:
+            return False
+
+        n_terms = 6 if n >= 6 else 3
+        A = np.array([self._features(vx, vy, n_terms) for vx, vy in self.gaze_mappings])
+        B = np.array(self.calibration_points, dtype=float)
+        coeffs, _, _, _ = np.linalg.lstsq(A, B, rcond=None)
+
+        self.calibration_matrix = coeffs.T  # (2, n_terms)
+        self.is_calibrated = True
+        return True
+
+    def apply(self, gaze_vector: Tuple[float, float]) -> Tuple[float, float]:
+        """Map a raw gaze vector to a normalized screen point"""
+        m = self.calibration_matrix
+        gx, gy = m @ self._features(gaze_vector[0], gaze_vector[1], m.shape[1])
+        return (max(0.0, min(1.0, float(gx))), max(0.0, min(1.0, float(gy))))
+
+    def mean_error(self) -> float:
+        """Mean distance between targets and fitted points (normalized units)"""
+        if not self.is_calibrated or not self.calibration_points:
+            return 0.0
+        errors = [math.dist(self.apply(g), p)
+                  for p, g in zip(self.calibration_points, self.gaze_mappings)]
+        return float(np.mean(errors))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "calibration_points": self.calibration_points,
+                "gaze_mappings": self.gaze_mappings,
+                "calibration_matrix": self.calibration_matrix.tolist() if self.calibration_matrix is not None else None,
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'GazeCalibration':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        calibration = cls(
+            calibration_points=[tuple(p) for p in data.get("calibration_points", [])],
+            gaze_mappings=[tuple(g) for g in data.get("gaze_mappings", [])])
+        if data.get("calibration_matrix") is not None:
+            calibration.calibration_matrix = np.array(data["calibration_matrix"], dtype=float)
+            calibration.is_calibrated = True
+        return calibration
+
+class FixationDetector:
+    """Constant-time fixation and saccade classification over the gaze stream
+
+    Dispersion (I-DT) is the summed x/y variance of the last `window_size`
+    gaze samples, kept as running sums so every update is O(1).
+    Velocity (I-VT) between consecutive samples drives saccade onset/offset;
+    completed saccades are appended to `saccades`.
+    """
+
+    def __init__(self, window_size: int = 5, dispersion_threshold: float = 0.05,
+                 saccade_velocity_threshold: float = 1.0):
+        self.window_size = max(2, window_size)
+        self.dispersion_threshold = dispersion_threshold
+        # Normalized screen units per second
+        self.saccade_velocity_threshold = saccade_velocity_threshold
+        self.saccades: List[SaccadeEvent] = []
+
+        self._window = deque()
+        self._sum_x = 0.0
+        self._sum_y = 0.0
+        self._sum_xx = 0.0
+        self._sum_yy = 0.0
+
+        self._last_point = None
+        self._last_time = None
+        self.in_saccade = False
+        self._saccade_onset = 0.0
+        self._saccade_start = None
+        self._saccade_peak = 0.0
+
+    def reset(self):
+        """Clear the window and any in-progress saccade (keeps recorded saccades)"""
+        self._window.clear()
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_yy = 0.0
+        self._last_point = None
+        self._last_time = None
+        self.in_saccade = False
+
+    def dispersion(self) -> float:
+        """Summed x/y population variance of the current window"""
+        n = len(self._window)
+        if n == 0:
+            return 0.0
+        mean_x = self._sum_x / n
+        mean_y = self._sum_y / n
+        var_x = self._sum_xx / n - mean_x * mean_x
+        var_y = self._sum_yy / n - mean_y * mean_y
+        # Running sums can dip fractionally below zero from rounding
+        return max(0.0, var_x) + max(0.0, var_y)
+
+    def update(self, gaze_point: Tuple[float, float], timestamp: float) -> bool:
+        """Add one gaze sample, returns True if the window is a fixation"""
+        x, y = gaze_point
+
+        # Sliding window sums
+        if len(self._window) == self.window_size:
+            old_x, old_y = self._window.popleft()
+            self._sum_x -= old_x
+            self._sum_y -= old_y
+            self._sum_xx -= old_x * old_x
+            self._sum_yy -= old_y * old_y
+        self._window.append((x, y))
+        self._sum_x += x
+        self._sum_y += y
+        self._sum_xx += x * x
+        self._sum_yy += y * y
+
+        # Velocity between consecutive samples
+        if self._last_point is not None and timestamp > self._last_time:
+            dx = x - self._last_point[0]
+            dy = y - self._last_point[1]
+            velocity = math.hypot(dx, dy) / (timestamp - self._last_time)
+
+            if velocity > self.saccade_velocity_threshold:
+                if not self.in_saccade:
+                    self.in_saccade = True
+                    self._saccade_onset = self._last_time
+                    self._saccade_start = self._last_point
+                    self._saccade_peak = velocity
+                else:
+                    self._saccade_peak = max(self._saccade_peak, velocity)
+            elif self.in_saccade:
+                self.in_saccade = False
+                self.saccades.append(SaccadeEvent(
+                    onset=self._saccade_onset,
+                    offset=self._last_time,
+                    amplitude=math.hypot(self._last_point[0] - self._saccade_start[0],
+                                         self._last_point[1] - self._saccade_start[1]),
+                    peak_velocity=self._saccade_peak,
+                    start_point=self._saccade_start,
+                    end_point=self._last_point))
+
+        self._last_point = (x, y)
+        self._last_time = timestamp
+
+        if self.in_saccade or len(self._window) < self.window_size:
+            return False
+        return self.dispersion() < self.dispersion_threshold
+
+class BlinkDetector:
+    """Blink state machine over the eyeBlinkLeft/eyeBlinkRight blendshape scores
+
+    An eye counts as closed once its score rises above `close_threshold`
+    and as open again only once it falls below `open_threshold`, so noisy
+    scores around a single threshold do not split one blink into several.
+    A closure is recorded as one BlinkEvent when it reopens, provided it
+    lasted between `min_duration` and `max_duration` seconds.
+    """
+
+    def __init__(self, close_threshold: float = 0.5, open_threshold: float = 0.35,
+                 min_duration: float = 0.05, max_duration: float = 0.5):
+        self.close_threshold = close_threshold
+        self.open_threshold = open_threshold
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.blinks: List[BlinkEvent] = []
+        self.total_blinks = 0
+
+        self.is_closed = False
+        self._closed_at = 0.0
+        self._left_closed = False
+        self._right_closed = False
+
+    def update(self, left_score: float, right_score: float, timestamp: float) -> Optional[BlinkEvent]:
+        """Feed one frame of scores, returns the BlinkEvent completed on this frame"""
+        if not self.is_closed:
+            if left_score > self.close_threshold or right_score > self.close_threshold:
+                self.is_closed = True
+                self._closed_at = timestamp
+                self._left_closed = left_score > self.close_threshold
+                self._right_closed = right_score > self.close_threshold
+            return None
+
+        self._left_closed |= left_score > self.close_threshold
+        self._right_closed |= right_score > self.close_threshold
+        if left_score >= self.open_threshold or right_score >= self.open_threshold:
+            return None
+
+        self.is_closed = False
+        duration = timestamp - self._closed_at
+        if not (self.min_duration <= duration <= self.max_duration):
+            return None
+
+        event = BlinkEvent(start=self._closed_at, duration=duration,
+                           left=self._left_closed, right=self._right_closed)
+        self.blinks.append(event)
+        self.total_blinks += 1
+        return event
+
+class HeadPoseEstimator:
+    """Head yaw/pitch/roll in degrees from one face's landmarks
+
+    Uses the landmarker's facial transformation matrix when there is one;
+    otherwise solves PnP for six landmarks against a generic face model,
+    with a camera matrix cached per frame size and the previous pose as the
+    starting guess. Both cost a few microseconds per frame.
+    Angles are in camera axes (x right, y down, z away from the camera),
+    so a frontal face reads (0, 0, 0).
+    """
+
+    # Nose tip, chin, outer eye corners, mouth corners (image left first)
+    PNP_INDICES = [1, 152, 33, 263, 61, 291]
+    PNP_MODEL = np.array([
+        (0.0, 0.0, 0.0),
+        (0.0, 330.0, 65.0),
+        (-225.0, -170.0, 135.0),
+        (225.0, -170.0, 135.0),
+        (-150.0, 150.0, 125.0),
+        (150.0, 150.0, 125.0),
+    ], dtype=np.float64)
+
+    # The transformation matrix is in a y-up, z-toward-camera frame
+    _FLIP_YZ = np.diag([1.0, -1.0, -1.0])
+
+    def __init__(self):
+        self._camera_matrix = None
+        self._camera_shape = None
+        self._rvec = None
+        self._tvec = None
+
+    def reset(self):
+        self._rvec = None
+        self._tvec = None
+
+    @staticmethod
+    def euler_angles(rotation: np.ndarray) -> Tuple[float, float, float]:
+        """(yaw, pitch, roll) in degrees from a rotation matrix in camera axes"""
+        # Nose direction (the face model looks down -z) and the face's x axis
+        fx, fy, fz = -rotation[:, 2]
+        rx, ry = rotation[0, 0], rotation[1, 0]
+        yaw = math.degrees(math.atan2(fx, -fz))
+        pitch = math.degrees(math.atan2(fy, math.hypot(fx, fz)))
+        roll = math.degrees(math.atan2(ry, rx))
+        return yaw, pitch, roll
+
+    def from_transform(self, transform: np.ndarray) -> Tuple[float, float, float]:
+        rotation = self._FLIP_YZ @ transform[:3, :3].astype(np.float64) @ self._FLIP_YZ
+        return self.euler_angles(rotation)
+
+    def from_landmarks(self, landmarks: np.ndarray, frame_shape) -> Optional[Tuple[float, float, float]]:
+        """Solve PnP on landmarks normalized to a frame of frame_shape"""
+        h, w = frame_shape[:2]
+        if self._camera_shape != (h, w):
+            # No intrinsics available: focal length ~ frame width, centered principal point
+            self._camera_matrix = np.array([[w, 0, w / 2], [0, w, h / 2], [0, 0, 1]], dtype=np.float64)
+            self._camera_shape = (h, w)
+            self.reset()
+
+        image_points = landmarks[self.PNP_INDICES, :2].astype(np.float64) * (w, h)
+        use_guess = self._rvec is not None
+        ok, rvec, tvec = cv2.solvePnP(
+            self.PNP_MODEL, image_points, self._camera_matrix, None,
+            self._rvec, self._tvec, useExtrinsicGuess=use_guess, flags=cv2.SOLVEPNP_ITERATIVE)
+        if not ok:
+            self.reset()
+            return None
+        self._rvec, self._tvec = rvec, tvec
+        rotation, _ = cv2.Rodrigues(rvec)
+        return self.euler_angles(rotation)
+
+    def estimate(self, landmarks: np.ndarray, frame_shape,
+                 transform: Optional[np.ndarray] = None) -> Optional[Tuple[float, float, float]]:
+        if transform is not None:
+            return self.from_transform(transform)
+        return self.from_landmarks(landmarks, frame_shape)
+
+class HeadMovementDetector:
+    """Head movement state machine over yaw/pitch
+
+    The neutral pose follows the head slowly (time constant
+    `baseline_time_constant` seconds) while it is still, so a camera set
+    off to one side does not read as a permanent head turn. A movement
+    starts once yaw or pitch stays more than `enter_threshold` degrees off
+    neutral for `min_duration` seconds and ends only once both are back
+    within `exit_threshold`, so jitter around one threshold is counted
+    once. Movements are counted when they start and recorded as a
+    HeadMovementEvent when they end.
+    """
+
+    def __init__(self, enter_threshold: float = 15.0, exit_threshold: float = 8.0,
+                 min_duration: float = 0.1, baseline_time_constant: float = 5.0):
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.min_duration = min_duration
+        self.baseline_time_constant = baseline_time_constant
+        self.movements: List[HeadMovementEvent] = []
+        self.total_movements = 0
+
+        self.is_moving = False
+        self._baseline = None
+        self._last_time = None
+        self._off_since = None
+        self._peak = (0.0, 0.0)
+
+    def reset(self):
+        self._baseline = None
+        self._last_time = None
+        self._off_since = None
+        self.is_moving = False
+
+    def update(self, yaw: float, pitch: float, timestamp: float) -> bool:
+        """Feed one pose, returns True on the frame a movement starts"""
+        if self._baseline is None:
+            self._baseline = [yaw, pitch]
+            self._last_time = timestamp
+            return False
+
+        dt = max(0.0, timestamp - self._last_time)
+        self._last_time = timestamp
+        d_yaw = yaw - self._baseline[0]
+        d_pitch = pitch - self._baseline[1]
+        deviation = max(abs(d_yaw), abs(d_pitch))
+
+        if self.is_moving:
+            self._peak = (max(self._peak[0], abs(d_yaw)), max(self._peak[1], abs(d_pitch)))
+            if deviation < self.exit_threshold:
+                self.is_moving = False
+                self.movements.append(HeadMovementEvent(
+                    start=self._off_since, duration=timestamp - self._off_since,
+                    peak_yaw=self._peak[0], peak_pitch=self._peak[1]))
+                self._off_since = None
+            return False
+
+        if deviation > self.enter_threshold:
+            if self._off_since is None:
+                self._off_since = timestamp
+                self._peak = (abs(d_yaw), abs(d_pitch))
+            if timestamp - self._off_since >= self.min_duration:
+                self.is_moving = True
+                self.total_movements += 1
+                return True
+            return False
+
+        self._off_since = None
+        # Still: let the neutral pose drift toward the current one
+        alpha = 1.0 - math.exp(-dt / self.baseline_time_constant)
+        self._baseline[0] += alpha * d_yaw
+        self._baseline[1] += alpha * d_pitch
+        return False
+
+class FrameRateGovernor:
+    """Adapts how often and at what resolution frames are processed
+
+    Measures the time spent per processed frame over a rolling window and
+    every `adapt_interval` frames compares its 90th percentile with
+    `budget_ms`. Over budget, the inference resolution is lowered first
+    (down to `min_scale`), then the processing rate (down to `min_fps`);
+    well under budget, the rate is restored first, then the resolution.
+    The gap between the two thresholds keeps it from oscillating.
+    """
+
+    def __init__(self, target_fps: float = 30.0, budget_ms: float = 20.0,
+                 min_fps: float = 10.0, min_scale: float = 0.4, window: int = 60,
+                 adapt_interval: int = 15):
+        self.target_fps = target_fps
+        self.budget_ms = budget_ms
+        self.min_fps = min_fps
+        self.min_scale = min_scale
+        self.adapt_interval = adapt_interval
+
+        self.fps = target_fps  # Current processing rate
+        self.scale = 1.0       # Current inference resolution factor
+        self.frames_processed = 0
+        self.adjustments = 0
+        self._latencies = deque(maxlen=window)
+        self._processed_at = deque(maxlen=window)
+        self._last_processed = 0.0
+
+    def frame_due(self, now: float) -> bool:
+        """Whether the next frame should be read and processed"""
+        return now - self._last_processed >= 1.0 / self.fps - 0.002
+
+    def record(self, seconds: float, now: float):
+        """Record the processing time of one frame"""
+        self._last_processed = now
+        self._latencies.append(seconds * 1000)
+        self._processed_at.append(now)
+        self.frames_processed += 1
+        if self.frames_processed % self.adapt_interval == 0:
+            self._adapt()
+
+    def _adapt(self):
+        if len(self._latencies) < self.adapt_interval:
+            return
+        p90 = float(np.percentile(self._latencies, 90))
+        fps, scale = self.fps, self.scale
+        if p90 > self.budget_ms:
+            if self.scale > self.min_scale:
+                self.scale = max(self.min_scale, self.scale * 0.85)
+            else:
+                self.fps = max(self.min_fps, self.fps * 0.8)
+        elif p90 < self.budget_ms * 0.6:
+            if self.fps < self.target_fps:
+                self.fps = min(self.target_fps, self.fps * 1.15)
+            elif self.scale < 1.0:
+                self.scale = min(1.0, self.scale / 0.85)
+        
+        if (fps, scale) != (self.fps, self.scale):
+            # Judge the next step on frames processed with the new settings only
+            self.adjustments += 1
+            self._latencies.clear()
+
+    def effective_fps(self) -> float:
+        if len(self._processed_at) < 2:
+            return 0.0
+        span = self._processed_at[-1] - self._processed_at[0]
+        return (len(self._processed_at) - 1) / span if span > 0 else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        latencies = np.array(self._latencies) if self._latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            "effective_fps": self.effective_fps(),
+            "processing_fps": self.fps,
+            "inference_scale": self.scale,
+            "latency_p50_ms": float(p50),
+            "latency_p95_ms": float(p95),
+            "latency_p99_ms": float(p99),
+            "frames_processed": self.frames_processed,
+            "adjustments": self.adjustments,
+        }
+
+class PupilProcessor:
+    """Streaming pupil signal: blink rejection, smoothing, baseline, load index
+
+    Works on sizes already normalized by inter-ocular distance, so moving
+    toward or away from the camera does not read as dilation. Per sample:
+      1. reject samples while the eyes are closed, for `blink_margin`
+         seconds after they reopen, and jumps above `max_jump` (relative)
+      2. average both eyes and low-pass (time constant `smoothing`)
+      3. the first `baseline_duration` seconds of valid samples give the
+         session baseline mean and standard deviation (Welford)
+      4. after that, pupil_change is the % change from baseline and
+         cognitive_load the mean z-score over the last `load_window` seconds
+    Each update is O(1): running sums over a deque of recent z-scores.
+
+    MediaPipe's iris landmarks outline the iris, whose true size does not
+    change, so with the camera tracker this mostly measures landmark noise;
+    the stage is meant for any source that resolves the pupil itself.
+    """
+
+    def __init__(self, baseline_duration: float = 10.0, load_window: float = 5.0,
+                 smoothing: float = 0.15, blink_margin: float = 0.15, max_jump: float = 0.15):
+        self.baseline_duration = baseline_duration
+        self.load_window = load_window
+        self.smoothing = smoothing
+        self.blink_margin = blink_margin
+        self.max_jump = max_jump
+        self.samples_rejected = 0
+        self.reset_baseline()
+
+    def reset_baseline(self):
+        """Start a new baseline, e.g. at the start of a session"""
+        self.smoothed = None
+        self.baseline_mean = None
+        self.baseline_std = None
+        self.pupil_change = 0.0
+        self.cognitive_load = 0.0
+        self._baseline_start = None
+        self._n, self._mean, self._m2 = 0, 0.0, 0.0
+        self._last_time = None
+        self._reopened_at = None
+        self._window = deque()
+        self._window_sum = 0.0
+
+    @property
+    def has_baseline(self) -> bool:
+        return self.baseline_mean is not None
+
+    def update(self, left_size: float, right_size: float, eyes_closed: bool, timestamp: float) -> bool:
+        """Feed one frame, returns False if the sample was rejected"""
+        if eyes_closed:
+            self._reopened_at = None
+            self._last_time = None
+            return self._reject()
+        if self._reopened_at is None:
+            self._reopened_at = timestamp
+        if timestamp - self._reopened_at < self.blink_margin:
+            return self._reject()
+
+        sizes = [v for v in (left_size, right_size) if v > 0]
+        if not sizes:
+            return self._reject()
+        size = sum(sizes) / len(sizes)
+        if self.smoothed is not None and abs(size - self.smoothed) > self.max_jump * self.smoothed:
+            return self._reject()
+
+        if self.smoothed is None:
+            self.smoothed = size
+        elif self._last_time is not None:
+            alpha = 1.0 - math.exp(-max(0.0, timestamp - self._last_time) / self.smoothing)
+            self.smoothed += alpha * (size - self.smoothed)
+        self._last_time = timestamp
+
+        if self.baseline_mean is None:
+            self._add_baseline_sample(self.smoothed, timestamp)
+            return True
+
+        self.pupil_change = (self.smoothed / self.baseline_mean - 1.0) * 100
+        z = (self.smoothed - self.baseline_mean) / self.baseline_std
+        self._window.append((timestamp, z))
+        self._window_sum += z
+        while self._window[0][0] < timestamp - self.load_window:
+            self._window_sum -= self._window.popleft()[1]
+        self.cognitive_load = self._window_sum / len(self._window)
+        return True
+
+    def _reject(self) -> bool:
+        self.samples_rejected += 1
+        return False
+
+    def _add_baseline_sample(self, value: float, timestamp: float):
+        if self._baseline_start is None:
+            self._baseline_start = timestamp
+        self._n += 1
+        delta = value - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (value - self._mean)
+        if timestamp - self._baseline_start >= self.baseline_duration and self._n > 1:
+            self.baseline_mean = self._mean
+            # Floor keeps a near-constant baseline from inflating every z-score
+            self.baseline_std = max(math.sqrt(self._m2 / (self._n - 1)), 0.005 * self._mean)
+
+class StageTimer:
+    """Rolling per-stage timings for the tracker pipeline
+
+    Keeps the last `window` samples of each stage (in ms) and reports
+    p50/p95/p99. The tracker only calls into it when timing is enabled, so
+    disabled timing costs one attribute check per stage.
+    """
+
+    # Pipeline order, used for display
+    STAGES = ("read", "prepare", "convert", "detect", "postprocess", "total")
+
+    def __init__(self, window: int = 300):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, stage: str, seconds: float):
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.window)
+            self.counts[stage] = 0
+        samples.append(seconds * 1000)
+        self.counts[stage] += 1
+
+    def reset(self):
+        self._samples.clear()
+        self.counts.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {p50_ms, p95_ms, p99_ms, mean_ms, count}} in pipeline order"""
+        ordered = [s for s in self.STAGES if s in self._samples]
+        ordered += [s for s in self._samples if s not in self.STAGES]
+        stats = {}
+        for stage in ordered:
+            samples = np.fromiter(self._samples[stage], dtype=np.float64)
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            stats[stage] = {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                            "mean_ms": float(samples.mean()), "count": self.counts[stage]}
+        return stats
+
+    def export_json(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {"window": self.window, "stages": self.stats()}
+        if metadata:
+            data.update(metadata)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return path
+
+class FrameBufferPool:
+    """Named image buffers reused across frames
+
+    get() hands back the same array for as long as the requested shape is
+    unchanged, so OpenCV calls can write into it via dst= instead of
+    allocating. `allocations` counts every (re)allocation; in steady state
+    it should stop growing.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, np.ndarray] = {}
+        self.allocations = 0
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+            self.allocations += 1
+        return buf
+
 class EnhancedEyeTracker:
     """Advanced eye tracking with MediaPipe Tasks API (FaceLandmarker)"""
     
@@ -50,16 +786,54 @@ class EnhancedEyeTracker:
     LEFT_IRIS_INDICES = [468, 469, 470, 471, 472]
     RIGHT_IRIS_INDICES = [473, 474, 475, 476, 477]
     
-    def __init__(self, camera_id: int = 0):
+    # Inference modes for _process_frame
+    INFERENCE_MODES = ("full", "downsample", "roi")
+    
+    def __init__(self, camera_id: int = 0, fixation_window: int = 5,
+                 gaze_filter: Optional[GazeFilter] = None,
+                 inference_mode: str = "full", inference_scale: float = 0.5,
+                 roi_redetect_interval: int = 30, roi_margin: float = 0.25,
+                 num_faces: int = 1, initialize_landmarker: bool = True,
+                 governor: Optional[FrameRateGovernor] = None, stage_timing: bool = False):
+        if inference_mode not in self.INFERENCE_MODES:
+            raise ValueError(f"inference_mode must be one of {self.INFERENCE_MODES}")
         self.camera_id = camera_id
+        # With several faces in view the largest one is tracked
+        self.num_faces = num_faces
         self.cap = None
         self.landmarker = None
         self.use_mediapipe = False
         self.current_frame = None
+        # RGB copy of the last full (possibly downsampled) frame, shared with the renderer
+        self.current_frame_rgb = None
+        self.frame_pool = FrameBufferPool()
+        self.frames_captured = 0
         self.start_time = time.time() * 1000
         
         # Calibration
         self.calibration = GazeCalibration()
+        self.calibration_dir = "calibrations"
+        
+        # Reduced-cost inference
+        # "downsample": full frame scaled by inference_scale
+        # "roi": crop to the face found in the previous frame, with a
+        #        (downsampled) full-frame pass every roi_redetect_interval frames
+        self.inference_mode = inference_mode
+        self.inference_scale = inference_scale
+        self.roi_redetect_interval = roi_redetect_interval
+        self.roi_margin = roi_margin
+        self._roi = None  # (x0, y0, x1, y1) in frame pixels
+        self._frames_since_full = 0
+        
+        # Adapts processing rate and resolution to the measured inference time
+        # (None processes every frame the caller asks for)
+        self.governor = governor
+        
+        # Per-stage timings of get_eye_data (None when disabled)
+        self.stage_timer = StageTimer() if stage_timing else None
+        
+        # Smoothing applied to gaze points before fixation detection (None = raw)
+        self.gaze_filter = gaze_filter
         
         # Eye movement history
         self.eye_data_history = deque(maxlen=300)
@@ -67,15 +841,28 @@ class EnhancedEyeTracker:
         
         # Fixation detection parameters
         self.fixation_threshold = 0.05
+        self.fixation_detector = FixationDetector(
+            window_size=fixation_window,
+            dispersion_threshold=self.fixation_threshold)
+        self.blink_detector = BlinkDetector()
         self.total_blinks = 0
-        self.saccades = []
+        self.saccades = self.fixation_detector.saccades
+        
+        # Head pose
+        self.head_pose_estimator = HeadPoseEstimator()
+        self.head_movement_detector = HeadMovementDetector()
+        self.head_movements = self.head_movement_detector.movements
+        
+        # Pupil size -> baseline-corrected change and cognitive load index
+        self.pupil_processor = PupilProcessor()
         
-        # Initialize MediaPipe Tasks
-        self._initialize_mediapipe_tasks()
+        # Initialize MediaPipe Tasks (skipped when inference runs elsewhere, e.g. tracker_pool)
+        if initialize_landmarker:
+            self._initialize_mediapipe_tasks()
         
     def _initialize_mediapipe_tasks(self):
         """Initialize MediaPipe Face Landmarker using Tasks API"""
-        model_path = 'face_landmarker.task'
+        model_path = MODEL_PATH
         
         if not os.path.exists(model_path):
             print(f"✗ Model file {model_path} not found.")
@@ -83,17 +870,7 @@ class EnhancedEyeTracker:
             return
 
         try:
-            base_options = python.BaseOptions(model_asset_path=model_path)
-            options = vision.FaceLandmarkerOptions(
-                base_options=base_options,
-                running_mode=vision.RunningMode.VIDEO,
-                num_faces=1,
-                min_face_detection_confidence=0.5,
-                min_face_presence_confidence=0.5,
-                min_tracking_confidence=0.5,
-                output_face_blendshapes=True)
-            
-            self.landmarker = vision.FaceLandmarker.create_from_options(options)
+            self.landmarker = create_face_landmarker(num_faces=self.num_faces, model_path=model_path)
             self.use_mediapipe = True
             print("✓ MediaPipe Face Landmarker (Tasks API) initialized successfully")
             
@@ -101,11 +878,14 @@ class EnhancedEyeTracker:
             print(f"✗ Error initializing MediaPipe Tasks: {e}")
             self.use_mediapipe = False
     
-    def initialize_camera(self) -> bool:
-        """Initialize camera"""
+    def initialize_camera(self, probe_fallback: bool = True) -> bool:
+        """Initialize camera
+        probe_fallback: try ids 1-3 if camera_id fails. Disable when several
+        trackers share a machine so one cannot grab another station's camera.
+        """
         try:
             self.cap = cv2.VideoCapture(self.camera_id)
-            if not self.cap.isOpened():
+            if not self.cap.isOpened() and probe_fallback:
                 for cam_id in [1, 2, 3]:
                     self.cap = cv2.VideoCapture(cam_id)
                     if self.cap.isOpened():
@@ -119,6 +899,8 @@ class EnhancedEyeTracker:
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
+            # Keep only the newest frame queued, so frames the governor skips do not add lag
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             print(f"✓ Camera {self.camera_id} initialized")
             return True
         except Exception as e:
@@ -126,16 +908,42 @@ class EnhancedEyeTracker:
             return False
             
     def get_eye_data(self) -> Optional[EyeData]:
-        """Get current eye tracking data"""
+        """Get current eye tracking data
+
+        With a governor, returns None without touching the camera until the
+        next frame is due, so callers can poll every tick without blocking.
+        """
         if not self.cap:
             return None
+        if self.governor and not self.governor.frame_due(time.time()):
+            return None
+        
+        timer = self.stage_timer
+        if timer:
+            read_start = time.perf_counter()
         
-        ret, frame = self.cap.read()
+        # Read into the previous frame's buffer instead of a new array
+        capture_buffer = self.current_frame
+        ret, frame = self.cap.read(capture_buffer)
         if not ret:
             return None
+        if frame is not capture_buffer:
+            self.frame_pool.allocations += 1
         
+        self.frames_captured += 1
         self.current_frame = frame
-        return self._process_frame(frame)
+        if not self.governor and not timer:
+            return self._process_frame(frame)
+        
+        start = time.perf_counter()
+        eye_data = self._process_frame(frame)
+        end = time.perf_counter()
+        if self.governor:
+            self.governor.record(end - start, time.time())
+        if timer:
+            timer.add("read", start - read_start)
+            timer.add("total", end - read_start)
+        return eye_data
 
     def get_current_frame(self):
         return self.current_frame
@@ -145,9 +953,28 @@ class EnhancedEyeTracker:
         if not self.use_mediapipe or not self.landmarker:
             return None
         
+        timer = self.stage_timer
+        if timer:
+            t0 = time.perf_counter()
+        
         timestamp = time.time()
+        image, roi = self._prepare_inference_image(frame)
+        if timer:
+            t1 = time.perf_counter()
+            timer.add("prepare", t1 - t0)
+        
+        # Convert once into a pooled buffer; mp.Image copies it, and the
+        # renderer reuses it for the camera preview
+        rgb = self.frame_pool.get("roi_rgb" if roi else "rgb", image.shape)
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb)
+        self.current_frame_rgb = rgb if roi is None else None
+        
         # MediaPipe Tasks requires MP Image
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        mp = load_mediapipe()[0]
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        if timer:
+            t2 = time.perf_counter()
+            timer.add("convert", t2 - t1)
         
         # Determine timestamp in ms 
         # (This should be strictly increasing for VIDEO mode)
@@ -160,25 +987,33 @@ class EnhancedEyeTracker:
             # print(f"Detection error: {e}")
             return None
         
-        if not result.face_landmarks:
-            return None
+        if not timer:
+            return self._build_eye_data(extract_primary_face(result), roi, frame.shape, timestamp)
         
-        # We only asked for 1 face
-        landmarks = result.face_landmarks[0]
+        t3 = time.perf_counter()
+        timer.add("detect", t3 - t2)
+        eye_data = self._build_eye_data(extract_primary_face(result), roi, frame.shape, timestamp)
+        timer.add("postprocess", time.perf_counter() - t3)
+        return eye_data
+
+    def _build_eye_data(self, face, roi, frame_shape, timestamp: float) -> Optional[EyeData]:
+        """Turn an extract_primary_face() result into EyeData and update tracking state"""
+        if face is None:
+            self._roi = None
+            self.head_pose_estimator.reset()
+            return None
         
-        # --- Extract Data (same logic as before, just adapting object structure) ---
-        eye_data = EyeData(timestamp=timestamp)
-        h, w = frame.shape[:2]
+        face_points, blink_scores, face_count, transform = face
+        # (N, 3) array of x, y, z normalized to the full camera frame
+        landmarks = self._landmarks_to_frame(face_points, roi, frame_shape)
+        if self.inference_mode == "roi":
+            self._update_roi(landmarks, frame_shape)
         
-        # Helper to get normalized point
-        def get_point(idx):
-            lm = landmarks[idx]
-            return lm # Has x, y, z
+        eye_data = EyeData(timestamp=timestamp, faces_detected=face_count)
             
         def get_center_normalized(indices):
-            xs = [landmarks[i].x for i in indices]
-            ys = [landmarks[i].y for i in indices]
-            return (np.mean(xs), np.mean(ys))
+            cx, cy = landmarks[indices, :2].mean(axis=0)
+            return (float(cx), float(cy))
 
         eye_data.left_eye_center = get_center_normalized(self.LEFT_EYE_INDICES)
         eye_data.right_eye_center = get_center_normalized(self.RIGHT_EYE_INDICES)
@@ -188,61 +1023,52 @@ class EnhancedEyeTracker:
             left_iris_center = get_center_normalized(self.LEFT_IRIS_INDICES)
             right_iris_center = get_center_normalized(self.RIGHT_IRIS_INDICES)
             
-            eye_data.gaze_point = self._estimate_gaze(
+            eye_data.gaze_vector = self._compute_gaze_vector(
                 eye_data.left_eye_center, eye_data.right_eye_center,
                 left_iris_center, right_iris_center
             )
+            eye_data.raw_gaze_point = self._estimate_gaze(eye_data.gaze_vector)
+            eye_data.gaze_point = eye_data.raw_gaze_point
+            if self.gaze_filter and eye_data.raw_gaze_point:
+                eye_data.gaze_point = self.gaze_filter.filter(eye_data.raw_gaze_point, timestamp)
             
-            # Simple pupil size estimation
-            eye_data.left_pupil_size = self._estimate_pupil_size([landmarks[i] for i in self.LEFT_IRIS_INDICES])
-            eye_data.right_pupil_size = self._estimate_pupil_size([landmarks[i] for i in self.RIGHT_IRIS_INDICES])
+            # Iris diameters relative to the distance between the eyes
+            inter_ocular = self._frame_distance(eye_data.left_eye_center, eye_data.right_eye_center, frame_shape)
+            eye_data.left_pupil_size = self._estimate_pupil_size(
+                landmarks[self.LEFT_IRIS_INDICES], frame_shape, inter_ocular)
+            eye_data.right_pupil_size = self._estimate_pupil_size(
+                landmarks[self.RIGHT_IRIS_INDICES], frame_shape, inter_ocular)
 
         # Blink Detection using Blendshapes if available (more accurate!)
-        if result.face_blendshapes:
-            # Index for eye blink blendshapes usually:
-            # These are category_name="eyeBlinkLeft", etc.
-            # But let's stick to EAR for consistency or use blendshapes if better.
-            # Blendshapes are easier if we iterate them.
-            blendshapes = result.face_blendshapes[0]
-            # Search for blink scores
-            left_blink = next((c.score for c in blendshapes if c.category_name == 'eyeBlinkLeft'), 0)
-            right_blink = next((c.score for c in blendshapes if c.category_name == 'eyeBlinkRight'), 0)
+        if blink_scores:
+            left_blink, right_blink = blink_scores
             
-            if left_blink > 0.5 or right_blink > 0.5:
+            # One event per blink, reported on the frame the eyes reopen
+            if self.blink_detector.update(left_blink, right_blink, timestamp):
                 eye_data.blink_detected = True
-                self.total_blinks += 1
+            eye_data.eyes_closed = self.blink_detector.is_closed
+            self.total_blinks = self.blink_detector.total_blinks
+        eye_data.blink_count = self.total_blinks
+        self._update_pupil(eye_data)
+        
+        # Fixation / saccade classification
+        eye_data.is_fixating = self._detect_fixation(eye_data.gaze_point, timestamp)
+        eye_data.is_saccade = self.fixation_detector.in_saccade
         
-        # Fixation detection
-        eye_data.is_fixating = self._detect_fixation(eye_data.gaze_point)
+        # Head pose. The transformation matrix assumes the inference image
+        # is the whole camera view, which does not hold for ROI crops.
+        if self.inference_mode == "roi":
+            transform = None
+        pose = self.head_pose_estimator.estimate(landmarks, frame_shape, transform)
+        if pose:
+            eye_data.head_yaw, eye_data.head_pitch, eye_data.head_roll = pose
+            self.head_movement_detector.update(eye_data.head_yaw, eye_data.head_pitch, timestamp)
+        is_turning_head = self.head_movement_detector.is_moving
         
-        # Head turn detection using geometry (Nose tip: 1, Left ear: 234, Right ear: 454)
         nose = landmarks[1]
-        left_ear = landmarks[234] 
-        right_ear = landmarks[454]
-        
-        # Calculate horizontal distance ratio
-        # Ensure we don't divide by zero
-        d_left = abs(nose.x - left_ear.x)
-        d_right = abs(nose.x - right_ear.x)
-        
-        # head_turn_ratio: 1.0 is straight. 
-        # If turned right, d_left (mirror) or actual distance changes.
-        head_turn_ratio = d_left / (d_right + 1e-6)
-        
-        # Map ratio to a 'yaw score' roughly -1.0 to 1.0 for UI display
-        # Ratio around 1.0 -> 0.0
-        # Ratio > 2.0 or < 0.5 is significant
-        if head_turn_ratio > 1.0:
-            head_yaw_score = min(1.0, (head_turn_ratio - 1.0))
-        else:
-            head_yaw_score = max(-1.0, -(1.0 / (head_turn_ratio + 1e-6) - 1.0))
-        
-        significant_yaw_threshold = 0.3 # Adjusted threshold for geometric ratio
-        is_turning_head = abs(head_yaw_score) > significant_yaw_threshold
-        
-        eye_data.head_position = (nose.x, nose.y)
+        eye_data.head_position = (float(nose[0]), float(nose[1]))
         eye_data.head_turn_detected = is_turning_head
-        eye_data.head_yaw = head_yaw_score
+        eye_data.head_movement_count = self.head_movement_detector.total_movements
         
         # If head is turned significantly, mark as NOT fixating regardless of gaze
         if is_turning_head:
@@ -255,31 +1081,145 @@ class EnhancedEyeTracker:
             
         return eye_data
 
+    # --- Reduced-cost inference ---
+    def _prepare_inference_image(self, frame):
+        """Pick the image to run the landmarker on, returns (image, roi or None)"""
+        if (self.inference_mode == "roi" and self._roi is not None
+                and self._frames_since_full < self.roi_redetect_interval):
+            self._frames_since_full += 1
+            x0, y0, x1, y1 = self._roi
+            return frame[y0:y1, x0:x1], self._roi
+        
+        self._frames_since_full = 0
+        scale = self.inference_scale if self.inference_mode != "full" else 1.0
+        if self.governor:
+            scale *= self.governor.scale
+        if scale < 1.0:
+            # Landmarks are normalized, so a uniform downscale needs no remapping
+            h, w = frame.shape[:2]
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            small = self.frame_pool.get("small", (size[1], size[0], 3))
+            cv2.resize(frame, size, dst=small, interpolation=cv2.INTER_AREA)
+            return small, None
+        return frame, None
+    
+    def _landmarks_to_frame(self, points: np.ndarray, roi, frame_shape) -> np.ndarray:
+        """Map (N, 3) landmarks from the inference image to full-frame normalized coordinates"""
+        if roi is not None:
+            points = points.copy()
+            x0, y0, x1, y1 = roi
+            h, w = frame_shape[:2]
+            points[:, 0] = (x0 + points[:, 0] * (x1 - x0)) / w
+            points[:, 1] = (y0 + points[:, 1] * (y1 - y0)) / h
+            points[:, 2] *= (x1 - x0) / w
+        return points
+    
+    def _update_roi(self, landmarks: np.ndarray, frame_shape):
+        """Track the face bounding box (plus margin) for the next frame's crop"""
+        h, w = frame_shape[:2]
+        x_min, y_min = landmarks[:, :2].min(axis=0)
+        x_max, y_max = landmarks[:, :2].max(axis=0)
+        margin_x = (x_max - x_min) * w * self.roi_margin
+        margin_y = (y_max - y_min) * h * self.roi_margin
+        
+        x0, x1 = self._roi_span(x_min * w - margin_x, x_max * w + margin_x, w)
+        y0, y1 = self._roi_span(y_min * h - margin_y, y_max * h + margin_y, h)
+        
+        # Face too small or off-frame: fall back to full-frame detection
+        self._roi = (x0, y0, x1, y1) if (x1 - x0 >= 64 and y1 - y0 >= 64) else None
+
+    @staticmethod
+    def _roi_span(lo: float, hi: float, limit: int, step: int = 32) -> Tuple[int, int]:
+        """Clamp a crop span to the frame, rounding its length up to `step`
+        so consecutive crops mostly share a size (and a pooled buffer)"""
+        lo, hi = max(0, int(lo)), min(limit, int(math.ceil(hi)))
+        length = min(limit, -(-(hi - lo) // step) * step)
+        lo = max(0, min(lo, limit - length))
+        return lo, lo + length
+
     # --- Helper methods (Reused) ---
-    def _estimate_gaze(self, left_eye, right_eye, left_iris, right_iris):
+    def _compute_gaze_vector(self, left_eye, right_eye, left_iris, right_iris):
         if not all([left_eye, right_eye, left_iris, right_iris]): return None
-        # Same simple logic
         lx, ly = left_iris[0] - left_eye[0], left_iris[1] - left_eye[1]
         rx, ry = right_iris[0] - right_eye[0], right_iris[1] - right_eye[1]
-        avg_x, avg_y = (lx + rx)/2, (ly + ry)/2
+        return ((lx + rx)/2, (ly + ry)/2)
+
+    def _estimate_gaze(self, gaze_vector):
+        if not gaze_vector: return None
+        if self.calibration.is_calibrated:
+            return self.calibration.apply(gaze_vector)
+        # Uncalibrated fallback: fixed gains
+        avg_x, avg_y = gaze_vector
         gaze_x = 0.5 + avg_x * 5
         gaze_y = 0.5 + avg_y * 10 # Increase sensitivity
         return (max(0, min(1, gaze_x)), max(0, min(1, gaze_y)))
 
-    def _estimate_pupil_size(self, iris_points):
-        # Calculate diameter
-        # Normalized units
-        if len(iris_points) < 2: return 0
-        dx = iris_points[1].x - iris_points[3].x # Width approximation
-        dy = iris_points[2].y - iris_points[4].y # Height approximation
-        return math.sqrt(dx*dx + dy*dy)
-
-    def _detect_fixation(self, gaze_point):
-        if not gaze_point or len(self.gaze_history) < 5: return False
-        recent = list(self.gaze_history)[-5:]
-        x_var = np.var([p[0] for p in recent])
-        y_var = np.var([p[1] for p in recent])
-        return (x_var + y_var) < self.fixation_threshold
+    @staticmethod
+    def _frame_distance(a, b, frame_shape) -> float:
+        """Distance in pixels between two normalized points"""
+        h, w = frame_shape[:2]
+        return math.hypot((a[0] - b[0]) * w, (a[1] - b[1]) * h)
+
+    @staticmethod
+    def _estimate_pupil_size(iris_points: np.ndarray, frame_shape, inter_ocular: float) -> float:
+        """Iris diameter (mean of the four ring radii, in pixels) / inter-ocular distance"""
+        if len(iris_points) < 5 or inter_ocular <= 0:
+            return 0.0
+        h, w = frame_shape[:2]
+        radii = (iris_points[1:5, :2] - iris_points[0, :2]) * (w, h)
+        return float(2 * np.sqrt((radii * radii).sum(axis=1)).mean() / inter_ocular)
+
+    def _update_pupil(self, eye_data: EyeData):
+        self.pupil_processor.update(eye_data.left_pupil_size, eye_data.right_pupil_size,
+                                    eye_data.eyes_closed, eye_data.timestamp)
+        eye_data.pupil_change = self.pupil_processor.pupil_change
+        eye_data.cognitive_load = self.pupil_processor.cognitive_load
+
+    def _detect_fixation(self, gaze_point, timestamp):
+        if not gaze_point: return False
+        self.fixation_detector.dispersion_threshold = self.fixation_threshold
+        return self.fixation_detector.update(gaze_point, timestamp)
+
+    # --- Calibration persistence ---
+    def _calibration_path(self, patient_id: str) -> str:
+        return os.path.join(self.calibration_dir, f"calibration_{patient_id}.json")
+
+    def save_calibration(self, patient_id: str) -> Optional[str]:
+        """Save the fitted calibration for a patient"""
+        if not self.calibration.is_calibrated:
+            return None
+        path = self._calibration_path(patient_id)
+        try:
+            self.calibration.save(path)
+            print(f"✓ Calibration saved: {path}")
+            return path
+        except OSError as e:
+            print(f"✗ Could not save calibration: {e}")
+            return None
+
+    def load_calibration(self, patient_id: str) -> bool:
+        """Load a previously saved calibration for a patient, if any"""
+        path = self._calibration_path(patient_id)
+        if not os.path.exists(path):
+            return False
+        try:
+            self.calibration = GazeCalibration.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"✗ Could not load calibration {path}: {e}")
+            return False
+        print(f"✓ Calibration loaded for {patient_id}")
+        return self.calibration.is_calibrated
+
+    def enable_stage_timing(self, enabled: bool = True):
+        """Turn per-stage timing on or off at runtime"""
+        if enabled and self.stage_timer is None:
+            self.stage_timer = StageTimer()
+        elif not enabled:
+            self.stage_timer = None
+
+    def get_performance_stats(self) -> Optional[Dict[str, float]]:
+        """Effective FPS and processing-time percentiles (None without a governor)"""
+        return self.governor.stats() if self.governor else None
 
     def release(self):
         if self.cap: self.cap.release()
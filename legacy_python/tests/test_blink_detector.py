@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from tasks_eye_tracker import BlinkDetector
+from synthetic_tracker import SyntheticGazeModel
+
+RATE = 30.0
+
+
+def _feed(detector, scores, start=0.0):
+    """scores: (left, right) per frame; returns the completed events"""
+    events = []
+    for i, (left, right) in enumerate(scores):
+        event = detector.update(left, right, start + i / RATE)
+        if event:
+            events.append(event)
+    return events
+
+
+def test_one_blink_per_closure():
+    detector = BlinkDetector()
+    scores = [(0.05, 0.05)] * 3 + [(0.9, 0.9)] * 4 + [(0.05, 0.05)] * 3
+    events = _feed(detector, scores)
+    assert len(events) == 1
+    assert events[0].start == pytest.approx(3 / RATE)
+    assert events[0].duration == pytest.approx(4 / RATE)
+    assert events[0].left and events[0].right
+    assert detector.total_blinks == 1 and detector.blinks == events
+
+
+def test_hysteresis_between_thresholds():
+    # Scores wobbling between the open (0.35) and close (0.5) thresholds
+    # keep the eye closed instead of counting several blinks
+    detector = BlinkDetector(close_threshold=0.5, open_threshold=0.35)
+    scores = [(s, s) for s in (0.1, 0.6, 0.4, 0.55, 0.45, 0.38, 0.6, 0.2, 0.1)]
+    events = _feed(detector, scores)
+    assert len(events) == 1
+    assert events[0].duration == pytest.approx(6 / RATE)
+
+
+def test_scores_below_close_threshold_are_no_blink():
+    detector = BlinkDetector()
+    assert _feed(detector, [(0.45, 0.45), (0.3, 0.3)] * 10) == []
+    assert not detector.is_closed
+
+
+def test_both_eyes_must_reopen():
+    detector = BlinkDetector()
+    scores = [(0.9, 0.9), (0.1, 0.9), (0.1, 0.9), (0.1, 0.1)]
+    events = _feed(detector, scores)
+    assert len(events) == 1
+    assert events[0].duration == pytest.approx(3 / RATE)
+
+
+def test_one_eye_closure_is_flagged():
+    detector = BlinkDetector()
+    events = _feed(detector, [(0.05, 0.05), (0.05, 0.8), (0.05, 0.8), (0.05, 0.05)])
+    assert len(events) == 1
+    assert not events[0].left and events[0].right
+
+
+@pytest.mark.parametrize("frames", [1, 20])
+def test_closures_outside_blink_durations_are_not_counted(frames):
+    # 1 frame (33 ms) is below min_duration, 20 frames (667 ms) above max_duration
+    detector = BlinkDetector(min_duration=0.05, max_duration=0.5)
+    scores = [(0.05, 0.05)] + [(0.9, 0.9)] * frames + [(0.05, 0.05)] * 2
+    assert _feed(detector, scores) == []
+    assert detector.total_blinks == 0
+
+
+def test_counts_synthetic_blinks_under_noise():
+    model = SyntheticGazeModel(seed=2, blink_rate=30.0, head_turn_rate=0.0)
+    rng = random.Random(0)
+    detector = BlinkDetector()
+    true_blinks = 0
+    was_closed = False
+    for i in range(int(120 * RATE)):
+        score = model.sample(i / RATE)[1]
+        closed = score > 0.5
+        true_blinks += closed and not was_closed
+        was_closed = closed
+        detector.update(score + rng.uniform(-0.07, 0.07), score + rng.uniform(-0.07, 0.07), i / RATE)
+
+    assert true_blinks > 30
+    assert detector.total_blinks == true_blinks
@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+
+from tasks_eye_tracker import FixationDetector
+from synthetic_tracker import SyntheticGazeModel
+
+RATE = 60.0
+
+
+def _feed(detector, points, start=0.0):
+    return [detector.update(point, start + i / RATE) for i, point in enumerate(points)]
+
+
+def test_fixation_once_window_is_full():
+    detector = FixationDetector(window_size=5)
+    states = _feed(detector, [(0.5, 0.5)] * 8)
+    assert states == [False] * 4 + [True] * 4
+
+
+def test_dispersion_matches_window_variance():
+    rng = np.random.default_rng(0)
+    points = [tuple(p) for p in rng.uniform(0.4, 0.6, size=(40, 2))]
+    detector = FixationDetector(window_size=7)
+    for i, point in enumerate(points):
+        detector.update(point, i / RATE)
+        window = np.array(points[max(0, i - 6):i + 1])
+        assert detector.dispersion() == pytest.approx(window.var(axis=0).sum(), abs=1e-12)
+
+
+def test_dispersed_window_is_not_a_fixation():
+    detector = FixationDetector(window_size=5, dispersion_threshold=0.001,
+                                saccade_velocity_threshold=100.0)
+    states = _feed(detector, [(0.5, 0.5), (0.6, 0.5), (0.5, 0.6), (0.4, 0.5), (0.5, 0.4)])
+    assert states[-1] is False
+
+
+def test_saccade_onset_offset_and_amplitude():
+    detector = FixationDetector(window_size=5, dispersion_threshold=0.0001)
+    path = [(0.3, 0.5)] * 10 + [(0.4, 0.5), (0.55, 0.5), (0.65, 0.5)] + [(0.7, 0.5)] * 10
+    states = _feed(detector, path)
+
+    assert len(detector.saccades) == 1
+    saccade = detector.saccades[0]
+    # Onset at the last sample before the eye moved, offset at the first one on target
+    assert saccade.onset == pytest.approx(9 / RATE)
+    assert saccade.offset == pytest.approx(13 / RATE)
+    assert saccade.amplitude == pytest.approx(0.4)
+    assert saccade.peak_velocity == pytest.approx(0.15 * RATE)
+    assert saccade.start_point == (0.3, 0.5) and saccade.end_point == (0.7, 0.5)
+    # No fixation while the saccade runs or while the window still spans it
+    assert not any(states[10:17])
+    assert all(states[17:])
+
+
+def test_slow_drift_is_not_a_saccade():
+    detector = FixationDetector(window_size=5, saccade_velocity_threshold=1.0)
+    _feed(detector, [(0.3 + 0.01 * i, 0.5) for i in range(30)])  # 0.6 units/s
+    assert detector.saccades == []
+
+
+def test_saccades_of_synthetic_gaze():
+    model = SyntheticGazeModel(seed=4, gaze_noise=0.0, blink_rate=0.0, head_turn_rate=0.0)
+    detector = FixationDetector()
+    true_saccades = set()
+    for i in range(int(60 * 120)):
+        t = i / 120
+        gaze = model.sample(t)[0]
+        if model._saccade and math.dist(model._saccade[2], model._saccade[3]) > 0.1:
+            true_saccades.add(model._saccade[0])
+        detector.update(gaze, t)
+
+    # Every large saccade is detected once, within about a sample of its onset
+    assert len(true_saccades) > 20
+    for onset in true_saccades:
+        matches = [s for s in detector.saccades if abs(s.onset - onset) <= 1.5 / 120]
+        assert len(matches) == 1, onset
+    assert len([s for s in detector.saccades if s.amplitude > 0.15]) <= len(true_saccades)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from periquest_enhanced import RunningStats, StreamingQuantile
+
+
+def _reaction_times(n, seed=0):
+    return np.random.default_rng(seed).lognormal(np.log(550), 0.3, n)
+
+
+@pytest.mark.parametrize("q", [0.1, 0.5, 0.9])
+@pytest.mark.parametrize("n", [1, 5, 6, 10, 20])
+def test_quantile_exact_on_few_samples(n, q):
+    samples = _reaction_times(n, seed=n)
+    estimator = StreamingQuantile(q)
+    for x in samples:
+        estimator.add(float(x))
+    assert estimator.value() == np.quantile(samples, q, method="nearest")
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9])
+@pytest.mark.parametrize("seed", range(5))
+def test_quantile_estimate_on_many_samples(q, seed):
+    samples = _reaction_times(1000, seed)
+    estimator = StreamingQuantile(q)
+    for x in samples:
+        estimator.add(float(x))
+    spread = np.quantile(samples, 0.75) - np.quantile(samples, 0.25)
+    assert abs(estimator.value() - np.quantile(samples, q)) < 0.15 * spread
+
+
+def test_quantile_without_samples():
+    assert StreamingQuantile(0.5).value() == 0.0
+
+
+@pytest.mark.parametrize("n", [1, 5, 6, 10, 1000])
+def test_running_stats_match_numpy(n):
+    samples = _reaction_times(n, seed=n)
+    stats = RunningStats()
+    for x in samples:
+        stats.add(float(x))
+    assert stats.count == n
+    assert stats.mean == pytest.approx(np.mean(samples))
+    assert stats.std == pytest.approx(np.std(samples), abs=1e-6)
+    assert stats.minimum == samples.min()
+    assert stats.maximum == samples.max()
+    summary = stats.to_dict()
+    assert set(summary) == {"count", "mean", "std", "min", "max", "p50", "p90"}
@@ -0,0 +1,84 @@
+import math
+import random
+
+import pytest
+
+from periquest_enhanced import DEFAULT_LEVELS, LevelTable, StaircaseDifficulty
+from simulation import simulate_sessions
+
+
+def test_steps_weighted_and_halved_at_reversals():
+    staircase = StaircaseDifficulty(target=0.75, step=1.0, min_step=0.1, start=1.0)
+    expected = [
+        (True, 1.25, 1.0),     # Up by step * (1 - target)
+        (True, 1.5, 1.0),
+        (False, 1.125, 0.5),   # Reversal 1: step halves, down by step * target
+        (True, 1.1875, 0.25),  # Reversal 2
+        (False, 1.09375, 0.125),
+    ]
+    for hit, position, step in expected:
+        staircase.record_trial(hit)
+        assert staircase.position == pytest.approx(position)
+        assert staircase.step == pytest.approx(step)
+    assert staircase.reversals == 3
+    # Only reversals after the first two are averaged
+    assert staircase.threshold == pytest.approx(1.1875)
+
+
+def test_step_floor_and_bounds():
+    staircase = StaircaseDifficulty(step=1.0, min_step=0.1, start=1.0)
+    for i in range(20):
+        staircase.record_trial(i % 2 == 0)
+    assert staircase.step == pytest.approx(0.1)
+
+    staircase = StaircaseDifficulty(start=1.0)
+    for _ in range(5):
+        staircase.record_trial(False)
+    assert staircase.position == 1.0 and staircase.threshold is None
+
+    staircase = StaircaseDifficulty(start=1.0)
+    for _ in range(100):
+        staircase.record_trial(True)
+    assert staircase.position == staircase.levels.max_level
+
+
+def test_parameters_interpolated_between_levels():
+    levels = LevelTable(DEFAULT_LEVELS)
+    staircase = StaircaseDifficulty(levels, start=2.5)
+    assert staircase.get_spawn_interval() == pytest.approx(
+        (levels.spawn_intervals[1] + levels.spawn_intervals[2]) / 2)
+    assert staircase.get_duration_ms() == int((levels.durations_ms[1] + levels.durations_ms[2]) / 2)
+
+    staircase.position = float(levels.max_level)
+    assert staircase.get_spawn_interval() == levels.spawn_intervals[-1]
+
+
+def test_level_follows_position():
+    staircase = StaircaseDifficulty(start=1.0)
+    staircase.position = 3.7
+    assert staircase.update(None, 0) == 3
+
+
+@pytest.mark.parametrize("target", [0.5, 0.75, 0.9])
+def test_threshold_converges_on_target_detection(target):
+    # Observer whose detection falls off logistically with difficulty
+    midpoint, spread = 3.0, 0.4
+    truth = midpoint + spread * math.log((1 - target) / target)
+
+    estimates = []
+    for seed in range(20):
+        rng = random.Random(seed)
+        staircase = StaircaseDifficulty(target=target, start=1.0)
+        for _ in range(300):
+            p_hit = 1 / (1 + math.exp((staircase.position - midpoint) / spread))
+            staircase.record_trial(rng.random() < p_hit)
+        estimates.append(staircase.threshold)
+
+    assert sum(estimates) / len(estimates) == pytest.approx(truth, abs=0.2)
+
+
+def test_simulated_sessions_report_threshold():
+    results = simulate_sessions(2, seed=5, duration=180, difficulty="staircase")
+    for result in results:
+        assert result["simulation"]["threshold"] is not None
+        assert 1.0 <= result["simulation"]["threshold"] <= len(DEFAULT_LEVELS)
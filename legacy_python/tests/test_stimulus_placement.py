@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from periquest_enhanced import (GameConfig, LevelTable, DEFAULT_LEVELS, StimulusManager,
+                                VisualField, _subtract_rects)
+
+
+def _cells(rects):
+    return {(x, y) for x0, x1, y0, y1 in rects for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)}
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_subtract_rects_is_exact_and_disjoint(seed):
+    rng = random.Random(seed)
+
+    def rect():
+        x0, y0 = rng.randint(0, 30), rng.randint(0, 30)
+        return (x0, x0 + rng.randint(0, 15), y0, y0 + rng.randint(0, 15))
+
+    rects = [rect()]
+    cut = rect()
+    pieces = _subtract_rects(rects, cut)
+
+    assert _cells(pieces) == _cells(rects) - _cells([cut])
+    assert sum(len(_cells([p])) for p in pieces) == len(_cells(pieces))
+    assert all(x0 <= x1 and y0 <= y1 for x0, x1, y0, y1 in pieces)
+    assert len(pieces) <= 4
+
+
+def test_subtract_rects_keeps_disjoint_rects():
+    assert _subtract_rects([(0, 9, 0, 9)], (20, 30, 20, 30)) == [(0, 9, 0, 9)]
+    assert _subtract_rects([(0, 9, 0, 9)], (-5, 20, -5, 20)) == []
+
+
+def test_every_field_reachable_at_every_level_size():
+    config = GameConfig()
+    config.STIMULUS_SEED = 1
+    manager = StimulusManager(config)
+    for min_size, max_size in manager.levels.size_ranges:
+        for size in range(min_size, max_size + 1):
+            for field in VisualField:
+                regions = manager._placement_regions(field, size)
+                assert regions, (field, size)
+                for x0, x1, y0, y1 in regions:
+                    # The shape stays on screen, clear of the HUD
+                    assert x0 - size // 2 >= 0 and x1 + size // 2 <= config.SCREEN_WIDTH
+                    assert y0 - size // 2 >= 120 and y1 + size // 2 <= config.SCREEN_HEIGHT
+
+
+def test_every_field_drawn():
+    config = GameConfig()
+    config.STIMULUS_SEED = 3
+    manager = StimulusManager(config)
+    fields = set()
+    for level in range(1, 6):
+        for _ in range(200):
+            stimulus = manager.generate_stimulus(level)
+            fields.add(stimulus.field)
+            manager.stimuli.clear()
+    assert fields == set(VisualField)
+
+
+def test_unreachable_field_fails_loudly():
+    levels = [dict(DEFAULT_LEVELS[0], size=[300, 320])]
+    with pytest.raises(ValueError, match="No room"):
+        StimulusManager(GameConfig(), LevelTable(levels))
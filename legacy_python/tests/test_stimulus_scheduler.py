@@ -0,0 +1,97 @@
+import pytest
+
+from periquest_enhanced import GameConfig, StimulusManager, StimulusScheduler
+from simulation import VirtualClock, simulate_sessions
+
+
+def _run(scheduler, clock, fps, duration, interval=2.0, stall_at=None):
+    onsets = []
+    while clock() < duration:
+        step = 1.0 / fps
+        if stall_at is not None and stall_at <= clock() < stall_at + step:
+            step = 0.75  # One long frame
+        clock.advance(step)
+        onsets.extend(scheduler.due(interval))
+    return onsets
+
+
+@pytest.mark.parametrize("fps, stall_at", [(30, None), (60, None), (144, None), (60, 10.0)])
+def test_onsets_independent_of_frame_rate(fps, stall_at):
+    clock = VirtualClock()
+    scheduler = StimulusScheduler(seed=7, clock=clock)
+    onsets = _run(scheduler, clock, fps, 60.0, stall_at=stall_at)
+    expected = [t for t in scheduler.schedule(60.0, 2.0) if t <= onsets[-1]]
+    assert onsets == expected
+    assert len(onsets) >= 15
+
+
+def test_same_seed_same_schedule():
+    first = StimulusScheduler(seed=3, clock=VirtualClock()).schedule(120.0, 1.5)
+    again = StimulusScheduler(seed=3, clock=VirtualClock()).schedule(120.0, 1.5)
+    other = StimulusScheduler(seed=4, clock=VirtualClock()).schedule(120.0, 1.5)
+    assert first == again
+    assert first != other
+
+
+def test_gaps_are_interval_plus_jitter():
+    onsets = StimulusScheduler(seed=1, mean_jitter=0.8, clock=VirtualClock()).schedule(2000.0, 1.5)
+    gaps = [b - a for a, b in zip([0.0] + onsets, onsets)]
+    assert min(gaps) >= 1.5
+    assert sum(gaps) / len(gaps) == pytest.approx(1.5 + 0.8, abs=0.1)
+
+
+def test_pause_excludes_time():
+    clock = VirtualClock()
+    scheduler = StimulusScheduler(seed=5, clock=clock)
+    expected = scheduler.schedule(30.0, 2.0)
+
+    clock.advance(5.0)
+    before = scheduler.due(2.0)
+    scheduler.pause()
+    clock.advance(100.0)
+    assert scheduler.due(2.0) == []
+    scheduler.resume()
+    clock.advance(25.0)
+    assert before + scheduler.due(2.0) == expected
+    assert scheduler.elapsed() == pytest.approx(30.0)
+
+
+def test_restart_replays_schedule():
+    clock = VirtualClock()
+    scheduler = StimulusScheduler(seed=9, clock=clock)
+    clock.advance(20.0)
+    first = scheduler.due(2.0)
+    scheduler.start(2.0)
+    clock.advance(20.0)
+    assert scheduler.due(2.0) == first
+
+
+def test_seeded_stimuli_are_reproducible():
+    def stimuli(seed):
+        config = GameConfig()
+        config.STIMULUS_SEED = seed
+        manager = StimulusManager(config, clock=VirtualClock())
+        manager.start_schedule()
+        drawn = []
+        for level in (1, 3, 5):
+            for _ in range(20):
+                s = manager.generate_stimulus(level)
+                drawn.append((s.field, s.type, s.x, s.y, s.size, s.is_target))
+                manager.stimuli.clear()
+        return drawn
+
+    assert stimuli(11) == stimuli(11)
+    assert stimuli(11) != stimuli(12)
+
+
+def test_simulated_sessions_are_reproducible():
+    def run():
+        return simulate_sessions(2, seed=21, duration=40)
+
+    first, again = run(), run()
+    for a, b in zip(first, again):
+        assert a["stimulus_seed"] == b["stimulus_seed"]
+        assert a["stimulus_onsets"] == b["stimulus_onsets"]
+        assert a["total_stimuli"] == b["total_stimuli"]
+        assert a["reaction_times"] == b["reaction_times"]
+    assert first[0]["stimulus_onsets"] != first[1]["stimulus_onsets"]
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import math
+import socket
+
+import pytest
+
+from tasks_eye_tracker import EyeData
+from tracker_service import RECORD_SIZE, RemoteEyeTracker, pack_eye_data, unpack_eye_data
+
+
+def _eye_data(**overrides):
+    values = dict(timestamp=1718000000.123456, left_eye_center=(0.25, 0.5), right_eye_center=(0.75, 0.5),
+                  gaze_point=(0.5, 0.375), raw_gaze_point=(0.5, 0.4375), gaze_vector=(-0.125, 0.0625),
+                  head_position=(0.5, 0.625), left_pupil_size=0.1875, right_pupil_size=0.25,
+                  is_fixating=True, blink_detected=False, head_turn_detected=True,
+                  head_yaw=-12.5, head_pitch=4.25, head_roll=1.5, head_movement_count=3,
+                  is_saccade=False, eyes_closed=True, blink_count=17, faces_detected=2)
+    values.update(overrides)
+    return EyeData(**values)
+
+
+def test_round_trip():
+    eye_data = _eye_data()
+    record = pack_eye_data(eye_data, 42)
+    assert len(record) == RECORD_SIZE
+
+    sequence, decoded = unpack_eye_data(record)
+    assert sequence == 42
+    # Every value above is exact in float32; pupil change and load are
+    # recomputed by each client, so they are not sent
+    assert decoded == eye_data
+
+
+def test_round_trip_without_points():
+    eye_data = _eye_data(left_eye_center=None, right_eye_center=None, gaze_point=None,
+                         raw_gaze_point=None, gaze_vector=None, head_position=None,
+                         is_fixating=False, head_turn_detected=False, eyes_closed=False)
+    _, decoded = unpack_eye_data(pack_eye_data(eye_data, 0))
+    assert decoded == eye_data
+
+
+def test_float32_precision():
+    eye_data = _eye_data(gaze_point=(1 / 3, 2 / 3), head_yaw=math.pi)
+    _, decoded = unpack_eye_data(pack_eye_data(eye_data, 0))
+    assert decoded.gaze_point == pytest.approx((1 / 3, 2 / 3), abs=1e-7)
+    assert decoded.head_yaw == pytest.approx(math.pi, abs=1e-6)
+    # The timestamp is a double
+    assert decoded.timestamp == eye_data.timestamp
+
+
+def test_faces_detected_saturates():
+    _, decoded = unpack_eye_data(pack_eye_data(_eye_data(faces_detected=300), 0))
+    assert decoded.faces_detected == 255
+
+
+@pytest.mark.parametrize("sequence, wire", [(2 ** 32, 0), (2 ** 32 + 7, 7), (2 ** 32 - 1, 2 ** 32 - 1)])
+def test_sequence_wraps(sequence, wire):
+    assert unpack_eye_data(pack_eye_data(_eye_data(), sequence))[0] == wire
+
+
+def test_missed_records_counted_across_wrap():
+    with contextlib.redirect_stdout(io.StringIO()):
+        client = RemoteEyeTracker()
+    client.sock, service = socket.socketpair()
+    client.sock.setblocking(False)
+    try:
+        for sequence in (2 ** 32 - 2, 2 ** 32 - 1, 2 ** 32, 2 ** 32 + 2):
+            service.sendall(pack_eye_data(_eye_data(timestamp=float(sequence)), sequence))
+        records = client.read_records()
+    finally:
+        service.close()
+        client.sock.close()
+
+    assert [r.timestamp for r in records] == [2.0 ** 32 - 2, 2.0 ** 32 - 1, 2.0 ** 32, 2.0 ** 32 + 2]
+    assert client.records_received == 4
+    assert client.records_missed == 1
+
+
+def test_partial_records_wait_for_the_rest():
+    with contextlib.redirect_stdout(io.StringIO()):
+        client = RemoteEyeTracker()
+    client.sock, service = socket.socketpair()
+    client.sock.setblocking(False)
+    try:
+        record = pack_eye_data(_eye_data(), 5)
+        service.sendall(record[:10])
+        assert client.read_records() == []
+        service.sendall(record[10:])
+        assert len(client.read_records()) == 1
+    finally:
+        service.close()
+        client.sock.close()
@@ -0,0 +1,317 @@
+"""
+Multi-Camera Eye Tracking for PeriQuest
+Runs several EnhancedEyeTracker stations from one machine: every camera has
+its own capture thread, and face landmark inference for all of them is
+shared across a process pool.
+
+    python tracker_pool.py 0 1 2      # track cameras 0-2 and print stats
+"""
+
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any
+
+import cv2
+
+from tasks_eye_tracker import (EnhancedEyeTracker, EyeData, MODEL_PATH, create_face_landmarker,
+                               extract_primary_face, load_mediapipe)
+
+# ==================== INFERENCE WORKERS ====================
+# One landmarker per worker process. IMAGE mode keeps workers stateless,
+# so any worker can serve any camera.
+_worker_landmarker = None
+
+def _init_worker(model_path: str, num_faces: int):
+    global _worker_landmarker
+    _worker_landmarker = create_face_landmarker("IMAGE", num_faces, model_path)
+
+def _detect_face(image_bgr):
+    rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+    mp = load_mediapipe()[0]
+    result = _worker_landmarker.detect(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb))
+    return extract_primary_face(result)
+
+# ==================== STREAMS ====================
+@dataclass
+class StreamStats:
+    """Per-camera counters"""
+    frames_captured: int = 0
+    frames_processed: int = 0
+    frames_dropped: int = 0     # Replaced by a newer frame before inference
+    faces_found: int = 0
+    errors: int = 0
+    inference_time: float = 0.0  # Summed submit -> result time (s)
+    latency: float = 0.0         # Summed capture -> result time (s)
+    started_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = max(1e-6, time.time() - self.started_at)
+        processed = max(1, self.frames_processed)
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+            "faces_found": self.faces_found,
+            "errors": self.errors,
+            "capture_fps": self.frames_captured / elapsed,
+            "processed_fps": self.frames_processed / elapsed,
+            "avg_inference_ms": self.inference_time / processed * 1000,
+            "avg_latency_ms": self.latency / processed * 1000,
+        }
+
+class CameraStream:
+    """One camera with its own capture thread
+
+    Only the newest frame is kept for inference, so a slow pool drops
+    frames instead of building up lag. Offers the tracker interface the
+    game uses (initialize_camera, get_eye_data, get_current_frame, release,
+    calibration, pupil size, frame counts and performance stats) so a
+    stream can stand in for an EnhancedEyeTracker.
+    """
+
+    def __init__(self, tracker: EnhancedEyeTracker, name: Optional[str] = None):
+        self.tracker = tracker
+        self.name = name or f"camera_{tracker.camera_id}"
+        self.stats = StreamStats()
+        self.current_frame_rgb = None  # No shared RGB buffer: inference happens off-process
+
+        self._lock = threading.Lock()
+        self._pending = None       # (frame, captured_at) waiting for inference
+        self._latest = None        # Newest EyeData not yet handed out
+        self._thread = None
+        self._running = False
+
+    def initialize_camera(self) -> bool:
+        if not self.tracker.initialize_camera(probe_fallback=False):
+            return False
+        self.stats = StreamStats(started_at=time.time())
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name=f"{self.name}-capture", daemon=True)
+        self._thread.start()
+        return True
+
+    def _capture_loop(self):
+        cap = self.tracker.cap
+        while self._running:
+            # No buffer reuse here: frames are handed to another thread
+            ret, frame = cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            with self._lock:
+                self.stats.frames_captured += 1
+                if self._pending is not None:
+                    self.stats.frames_dropped += 1
+                self._pending = (frame, time.time())
+                self.tracker.current_frame = frame
+
+    def _take_frame(self):
+        with self._lock:
+            pending, self._pending = self._pending, None
+        return pending
+
+    def _complete(self, face, roi, frame_shape, captured_at: float, submitted_at: float):
+        # Only the scheduler thread calls this, so tracker state needs no lock
+        eye_data = self.tracker._build_eye_data(face, roi, frame_shape, captured_at)
+        now = time.time()
+        with self._lock:
+            self.stats.frames_processed += 1
+            self.stats.inference_time += now - submitted_at
+            self.stats.latency += now - captured_at
+            if eye_data:
+                self.stats.faces_found += 1
+                self._latest = eye_data
+
+    def get_eye_data(self) -> Optional[EyeData]:
+        """Newest eye data since the last call (None if nothing new)"""
+        with self._lock:
+            eye_data, self._latest = self._latest, None
+        return eye_data
+
+    def get_current_frame(self):
+        return self.tracker.current_frame
+
+    # Tracker state, kept by the wrapped tracker as _complete() builds eye data
+    @property
+    def calibration(self):
+        return self.tracker.calibration
+
+    @property
+    def pupil_processor(self):
+        return self.tracker.pupil_processor
+
+    @property
+    def frame_pool(self):
+        return self.tracker.frame_pool
+
+    @property
+    def frames_captured(self) -> int:
+        return self.stats.frames_captured
+
+    def load_calibration(self, patient_id: str) -> bool:
+        return self.tracker.load_calibration(patient_id)
+
+    def save_calibration(self, patient_id: str) -> Optional[str]:
+        return self.tracker.save_calibration(patient_id)
+
+    def get_performance_stats(self) -> Optional[Dict[str, float]]:
+        return self.tracker.get_performance_stats()
+
+    def release(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        if self.tracker.cap:
+            self.tracker.cap.release()
+
+# ==================== SCHEDULER ====================
+class MultiCameraTracker:
+    """Tracks several cameras with inference shared across a process pool
+
+    The scheduler keeps at most one inference job in flight per camera and
+    hands free worker slots to cameras in round-robin order, so every
+    station gets an equal share of the cores however fast its camera runs.
+    """
+
+    def __init__(self, camera_ids: List[int], workers: Optional[int] = None,
+                 num_faces: int = 1, model_path: str = MODEL_PATH, **tracker_kwargs):
+        self.streams = [
+            CameraStream(EnhancedEyeTracker(camera_id=camera_id, num_faces=num_faces,
+                                            initialize_landmarker=False, **tracker_kwargs))
+            for camera_id in camera_ids
+        ]
+        # Leave a core for capture threads and the scheduler
+        self.workers = workers or max(1, min(len(camera_ids), (os.cpu_count() or 2) - 1))
+        self.num_faces = num_faces
+        self.model_path = model_path
+
+        self._executor = None
+        self._scheduler = None
+        self._running = False
+        self._in_flight = {}  # stream -> (future, roi, frame_shape, captured_at, submitted_at)
+        self._next_stream = 0
+
+    def start(self) -> int:
+        """Open cameras and start tracking, returns the number of active streams"""
+        if not os.path.exists(self.model_path):
+            print(f"✗ Model file {self.model_path} not found.")
+            return 0
+
+        self.streams = [s for s in self.streams if s.initialize_camera()]
+        if not self.streams:
+            print("✗ No cameras could be opened")
+            return 0
+
+        # spawn: forking a process that already runs capture threads is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_path, self.num_faces))
+        self._running = True
+        self._scheduler = threading.Thread(target=self._schedule_loop, name="tracker-scheduler", daemon=True)
+        self._scheduler.start()
+        print(f"✓ Tracking {len(self.streams)} camera(s) with {self.workers} inference worker(s)")
+        return len(self.streams)
+
+    def _schedule_loop(self):
+        while self._running:
+            self._collect_results()
+            try:
+                self._submit_frames()
+            except BrokenProcessPool as e:
+                print(f"✗ Inference pool failed: {e}")
+                self._running = False
+                return
+
+            if self._in_flight:
+                futures = [job[0] for job in self._in_flight.values()]
+                wait(futures, timeout=0.005, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(0.002)
+
+    def _collect_results(self):
+        for stream, (future, roi, frame_shape, captured_at, submitted_at) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+            del self._in_flight[stream]
+            try:
+                face = future.result()
+            except Exception:
+                stream.stats.errors += 1
+                face = None
+            stream._complete(face, roi, frame_shape, captured_at, submitted_at)
+
+    def _submit_frames(self):
+        count = len(self.streams)
+        start = self._next_stream
+        for offset in range(count):
+            if len(self._in_flight) >= self.workers:
+                return
+            index = (start + offset) % count
+            stream = self.streams[index]
+            if stream in self._in_flight:
+                continue
+            pending = stream._take_frame()
+            if pending is None:
+                continue
+
+            frame, captured_at = pending
+            # Downsampling / ROI cropping happens before the frame is pickled
+            image, roi = stream.tracker._prepare_inference_image(frame)
+            future = self._executor.submit(_detect_face, image)
+            self._in_flight[stream] = (future, roi, frame.shape, captured_at, time.time())
+            self._next_stream = (index + 1) % count
+
+    def get_eye_data(self, index: int) -> Optional[EyeData]:
+        return self.streams[index].get_eye_data()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stream stats plus an aggregate entry"""
+        stats = {stream.name: stream.stats.to_dict() for stream in self.streams}
+        if stats:
+            stats["total"] = {
+                key: sum(s[key] for s in stats.values())
+                for key in ("frames_captured", "frames_processed", "frames_dropped",
+                            "faces_found", "errors", "capture_fps", "processed_fps")
+            }
+        return stats
+
+    def print_stats(self):
+        for name, s in self.get_stats().items():
+            print(f"  {name:12s} captured {s['frames_captured']:6d}  processed {s['frames_processed']:6d} "
+                  f"({s['processed_fps']:5.1f} fps)  dropped {s['frames_dropped']:6d}"
+                  + (f"  latency {s['avg_latency_ms']:.0f}ms" if 'avg_latency_ms' in s else ""))
+
+    def stop(self):
+        self._running = False
+        if self._scheduler:
+            self._scheduler.join(timeout=1.0)
+        for stream in self.streams:
+            stream.release()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    import sys
+
+    camera_ids = [int(arg) for arg in sys.argv[1:]] or [0]
+    with MultiCameraTracker(camera_ids) as pool:
+        try:
+            while pool.streams:
+                time.sleep(5)
+                pool.print_stats()
+        except KeyboardInterrupt:
+            pass
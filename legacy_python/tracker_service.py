@@ -0,0 +1,303 @@
+"""
+Headless Eye Tracker Service for PeriQuest
+Runs one EnhancedEyeTracker in its own process and publishes every EyeData
+as a fixed-size binary record over a local TCP or Unix socket, so several
+consumers (the game, a recorder, a live dashboard) can share one camera.
+
+    python tracker_service.py --address tcp:127.0.0.1:5577 --camera 0
+    python tracker_service.py --address unix:/tmp/periquest_eye.sock
+
+Consumers connect with RemoteEyeTracker, which offers the same interface
+as EnhancedEyeTracker.
+"""
+
+import math
+import time
+import socket
+import struct
+import threading
+from typing import Optional, List, Tuple
+
+from tasks_eye_tracker import EnhancedEyeTracker, EyeData, FrameRateGovernor
+
+DEFAULT_ADDRESS = "tcp:127.0.0.1:5577"
+
+# ==================== WIRE FORMAT ====================
+# Sent once per connection: magic, format version, record size
+HEADER_FORMAT = "<4sHH"
+HEADER_MAGIC = b"PQEY"
+PROTOCOL_VERSION = 2
+
+# One record per frame, little endian:
+#   sequence, timestamp,
+#   gaze_point, raw_gaze_point, gaze_vector, left_eye_center,
+#   right_eye_center, head_position (x, y pairs, NaN when missing),
+#   left_pupil_size, right_pupil_size, head_yaw, head_pitch, head_roll,
+#   blink_count, head_movement_count, faces_detected, flags
+RECORD_FORMAT = "<Id17fIIBB"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+_FLAGS = ("is_fixating", "blink_detected", "head_turn_detected", "is_saccade", "eyes_closed")
+_POINTS = ("gaze_point", "raw_gaze_point", "gaze_vector", "left_eye_center",
+           "right_eye_center", "head_position")
+_NAN = float("nan")
+
+def pack_eye_data(eye_data: EyeData, sequence: int) -> bytes:
+    """Encode EyeData as one RECORD_FORMAT record"""
+    coords = []
+    for name in _POINTS:
+        point = getattr(eye_data, name)
+        coords.extend(point if point is not None else (_NAN, _NAN))
+    flags = 0
+    for bit, name in enumerate(_FLAGS):
+        if getattr(eye_data, name):
+            flags |= 1 << bit
+    return struct.pack(RECORD_FORMAT, sequence & 0xFFFFFFFF, eye_data.timestamp, *coords,
+                       eye_data.left_pupil_size, eye_data.right_pupil_size,
+                       eye_data.head_yaw, eye_data.head_pitch, eye_data.head_roll,
+                       eye_data.blink_count, eye_data.head_movement_count,
+                       min(255, eye_data.faces_detected), flags)
+
+def unpack_eye_data(record: bytes) -> Tuple[int, EyeData]:
+    """Decode one record, returns (sequence, EyeData)"""
+    values = struct.unpack(RECORD_FORMAT, record)
+    sequence, timestamp = values[0], values[1]
+    coords = values[2:14]
+    (left_pupil, right_pupil, head_yaw, head_pitch, head_roll,
+     blink_count, head_movements, faces, flags) = values[14:]
+
+    eye_data = EyeData(timestamp=timestamp, left_pupil_size=left_pupil, right_pupil_size=right_pupil,
+                       head_yaw=head_yaw, head_pitch=head_pitch, head_roll=head_roll,
+                       blink_count=blink_count, head_movement_count=head_movements,
+                       faces_detected=faces)
+    for i, name in enumerate(_POINTS):
+        x, y = coords[2 * i], coords[2 * i + 1]
+        setattr(eye_data, name, None if math.isnan(x) else (x, y))
+    for bit, name in enumerate(_FLAGS):
+        setattr(eye_data, name, bool(flags & (1 << bit)))
+    return sequence, eye_data
+
+def parse_address(address: str):
+    """'tcp:host:port', 'host:port' or 'unix:/path' -> (family, sockaddr)"""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    if address.startswith("tcp:"):
+        address = address[len("tcp:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+# ==================== SERVICE ====================
+class TrackerService:
+    """Publishes a tracker's EyeData stream to every connected client
+
+    Clients that fall behind far enough to fill their socket buffer are
+    disconnected rather than allowed to stall the capture loop.
+    """
+
+    def __init__(self, tracker, address: str = DEFAULT_ADDRESS):
+        self.tracker = tracker
+        self.address = address
+        self.clients: List[socket.socket] = []
+        self.records_sent = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._running = False
+        self._sequence = 0
+
+    def start(self) -> bool:
+        family, sockaddr = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            import os
+            if os.path.exists(sockaddr):
+                os.unlink(sockaddr)
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(sockaddr)
+        self._server.listen()
+        self._running = True
+        threading.Thread(target=self._accept_loop, name="tracker-service-accept", daemon=True).start()
+        print(f"✓ Tracker service listening on {self.address}")
+        return True
+
+    def _accept_loop(self):
+        header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, PROTOCOL_VERSION, RECORD_SIZE)
+        while self._running:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                break
+            try:
+                client.sendall(header)
+                client.setblocking(False)
+            except OSError:
+                client.close()
+                continue
+            with self._lock:
+                self.clients.append(client)
+            print(f"✓ Client connected ({len(self.clients)} total)")
+
+    def publish(self, eye_data: EyeData):
+        record = pack_eye_data(eye_data, self._sequence)
+        self._sequence += 1
+        with self._lock:
+            for client in list(self.clients):
+                try:
+                    sent = client.send(record)
+                except (BlockingIOError, OSError):
+                    sent = 0
+                if sent != len(record):
+                    # A partial record would desync the stream, so drop the client
+                    self.clients.remove(client)
+                    client.close()
+                    print(f"⚠ Client dropped ({len(self.clients)} remaining)")
+        self.records_sent += 1
+
+    def serve_forever(self):
+        """Run the tracker and publish until interrupted"""
+        try:
+            while self._running:
+                eye_data = self.tracker.get_eye_data()
+                if eye_data:
+                    self.publish(eye_data)
+                else:
+                    time.sleep(0.001)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._running = False
+        if self._server:
+            self._server.close()
+        with self._lock:
+            for client in self.clients:
+                client.close()
+            self.clients.clear()
+        self.tracker.release()
+
+# ==================== CLIENT ====================
+class RemoteEyeTracker(EnhancedEyeTracker):
+    """EyeData consumer for a running TrackerService
+
+    Drop-in for EnhancedEyeTracker in the game. Calibration works as usual:
+    when this client has its own calibration, gaze is remapped from the
+    received gaze_vector and fixation is re-evaluated locally.
+    No camera frames are sent, so get_current_frame() returns None.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, **tracker_kwargs):
+        super().__init__(initialize_landmarker=False, **tracker_kwargs)
+        self.address = address
+        self.sock = None
+        self.records_received = 0
+        self.records_missed = 0
+        self._buffer = bytearray()
+        self._last_sequence = None
+
+    def initialize_camera(self, probe_fallback: bool = True) -> bool:
+        """Connect to the service (the name keeps the tracker interface)"""
+        family, sockaddr = parse_address(self.address)
+        try:
+            self.sock = socket.socket(family, socket.SOCK_STREAM)
+            self.sock.settimeout(2.0)
+            self.sock.connect(sockaddr)
+            header = self._recv_exact(struct.calcsize(HEADER_FORMAT))
+            magic, version, record_size = struct.unpack(HEADER_FORMAT, header)
+            if magic != HEADER_MAGIC or version != PROTOCOL_VERSION or record_size != RECORD_SIZE:
+                raise ValueError(f"incompatible tracker service (version {version})")
+            self.sock.setblocking(False)
+        except (OSError, ValueError) as e:
+            print(f"✗ Tracker service {self.address} unavailable: {e}")
+            self.sock = None
+            return False
+        print(f"✓ Connected to tracker service {self.address}")
+        return True
+
+    def _recv_exact(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                raise OSError("connection closed")
+            data += chunk
+        return data
+
+    def read_records(self) -> List[EyeData]:
+        """Every record received since the last call, oldest first"""
+        if not self.sock:
+            return []
+        try:
+            while True:
+                chunk = self.sock.recv(65536)
+                if not chunk:
+                    print("✗ Tracker service disconnected")
+                    self.release()
+                    break
+                self._buffer.extend(chunk)
+        except BlockingIOError:
+            pass
+
+        records = []
+        usable = len(self._buffer) - len(self._buffer) % RECORD_SIZE
+        for offset in range(0, usable, RECORD_SIZE):
+            sequence, eye_data = unpack_eye_data(bytes(self._buffer[offset:offset + RECORD_SIZE]))
+            if self._last_sequence is not None:
+                self.records_missed += max(0, (sequence - self._last_sequence - 1) & 0xFFFFFFFF)
+            self._last_sequence = sequence
+            records.append(self._apply_local_calibration(eye_data))
+        del self._buffer[:usable]
+        self.records_received += len(records)
+        return records
+
+    def _apply_local_calibration(self, eye_data: EyeData) -> EyeData:
+        if self.calibration.is_calibrated and eye_data.gaze_vector:
+            eye_data.raw_gaze_point = self._estimate_gaze(eye_data.gaze_vector)
+            eye_data.gaze_point = eye_data.raw_gaze_point
+            if self.gaze_filter:
+                eye_data.gaze_point = self.gaze_filter.filter(eye_data.raw_gaze_point, eye_data.timestamp)
+            eye_data.is_fixating = (self._detect_fixation(eye_data.gaze_point, eye_data.timestamp)
+                                    and not eye_data.head_turn_detected)
+            eye_data.is_saccade = self.fixation_detector.in_saccade
+        # Pupil baseline and load index are per consumer session
+        self._update_pupil(eye_data)
+        self.eye_data_history.append(eye_data)
+        return eye_data
+
+    def get_eye_data(self) -> Optional[EyeData]:
+        """Newest record since the last call (None if nothing new)"""
+        records = self.read_records()
+        return records[-1] if records else None
+
+    def get_current_frame(self):
+        return None
+
+    def release(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+if __name__ == "__main__":
+    import argparse
+    from gaze_filters import create_gaze_filter
+
+    parser = argparse.ArgumentParser(description="Publish eye tracking data over a local socket")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="tcp:host:port or unix:/path")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--patient", help="Load this patient's saved gaze calibration")
+    parser.add_argument("--filter", default="one_euro", help="Gaze filter: one_euro, kalman or none")
+    parser.add_argument("--inference-mode", default="full", choices=EnhancedEyeTracker.INFERENCE_MODES)
+    parser.add_argument("--budget-ms", type=float, default=0,
+                        help="Per-frame processing budget for the frame-rate governor (0 disables it)")
+    args = parser.parse_args()
+
+    governor = FrameRateGovernor(budget_ms=args.budget_ms) if args.budget_ms > 0 else None
+    tracker = EnhancedEyeTracker(camera_id=args.camera, gaze_filter=create_gaze_filter(args.filter),
+                                 inference_mode=args.inference_mode, governor=governor)
+    if args.patient:
+        tracker.load_calibration(args.patient)
+    if tracker.initialize_camera():
+        service = TrackerService(tracker, args.address)
+        service.start()
+        service.serve_forever()